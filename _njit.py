@@ -0,0 +1,27 @@
+# -*- coding: utf-8 -*-
+"""
+Numba 선택적 의존성 shim
+
+numba가 설치되어 있으면 numba.njit을 그대로 사용하고,
+없으면 원본 파이썬 함수를 반환 (동작 동일, 속도만 차이).
+"""
+
+try:
+    from numba import njit as _numba_njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    _numba_njit = None
+    NUMBA_AVAILABLE = False
+
+
+def njit(*args, **kwargs):
+    """numba.njit 대체 데코레이터 (@njit / @njit(cache=True) 모두 지원)"""
+    if NUMBA_AVAILABLE:
+        return _numba_njit(*args, **kwargs)
+
+    # @njit 형태 (인자 없이 함수 직접 전달)
+    if len(args) == 1 and callable(args[0]) and not kwargs:
+        return args[0]
+
+    # @njit(...) 형태
+    return lambda func: func
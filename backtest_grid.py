@@ -8,15 +8,21 @@ RR(손익비) × SL(타임프레임) × Compositor(on/off) 조합을 자동 실
 사용법:
     python backtest_grid.py --symbol EURUSD --source db --start 2015-01-01 --end 2025-12-31
     python backtest_grid.py --symbol EURUSD --source csv
+    python backtest_grid.py --symbol EURUSD --source csv --jobs 4   # 병렬 워커 수 지정
 """
 
+import os
 import sys
 import argparse
+import tempfile
 import time
+import numpy as np
 import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from itertools import product
+from typing import Dict, Optional
 
 if sys.platform == 'win32':
     sys.stdout.reconfigure(encoding='utf-8')
@@ -44,14 +50,117 @@ def load_data(symbol: str, source: str, start: str = None, end: str = None) -> p
         df = db.query_ohlcv(symbol, start=s, end=e)
     else:
         csv_path = Path(BACKTEST_CONFIG["data_dir"]) / f"{symbol}_M1_data.csv"
-        df = pd.read_csv(csv_path, parse_dates=['time'])
-        df = df.sort_values('time').reset_index(drop=True)
+        df = BacktestEngine.load_data(str(csv_path))  # parquet 캐시 사용
     return df
 
 
-def run_grid(symbol: str, m1_df: pd.DataFrame) -> pd.DataFrame:
-    """파라미터 그리드 실행"""
-    results = []
+# 워커 프로세스 공유 데이터/엔진 (_init_worker에서 1회 설정)
+_WORKER_M1_DF: Optional[pd.DataFrame] = None
+_WORKER_M15_DF: Optional[pd.DataFrame] = None
+_WORKER_ENGINE: Optional[BacktestEngine] = None
+
+
+def _share_frame(df: pd.DataFrame, directory: str, name: str) -> Dict[str, str]:
+    """
+    DataFrame 컬럼을 .npy 파일로 저장 (워커 간 memmap 공유용)
+
+    Returns: 컬럼명 → .npy 경로
+    """
+    paths = {}
+    for col in df.columns:
+        path = Path(directory) / f"{name}_{col}.npy"
+        np.save(path, df[col].to_numpy())
+        paths[col] = str(path)
+    return paths
+
+
+def _load_shared_frame(paths: Dict[str, str]) -> pd.DataFrame:
+    """.npy 파일을 read-only memmap으로 열어 DataFrame 구성 (복사 없음)"""
+    return pd.DataFrame(
+        {col: np.load(path, mmap_mode='r') for col, path in paths.items()},
+        copy=False,
+    )
+
+
+def _init_worker(m1_paths: Dict[str, str], m15_paths: Dict[str, str]):
+    """
+    워커 초기화: M1/M15 데이터를 memmap으로 연결
+
+    모든 워커가 같은 물리 페이지를 공유하므로 워커 수가 늘어도 메모리는 1벌
+    """
+    global _WORKER_M1_DF, _WORKER_M15_DF, _WORKER_ENGINE
+    _WORKER_M1_DF = _load_shared_frame(m1_paths)
+    _WORKER_M15_DF = _load_shared_frame(m15_paths)
+    _WORKER_ENGINE = BacktestEngine(verbose=False)  # 워커 내 조합 간 전처리 캐시 공유
+
+
+def _run_combo(
+    engine: BacktestEngine,
+    symbol: str,
+    rr: float,
+    sl_tf: str,
+    use_comp: bool,
+    m1_df: pd.DataFrame,
+    m15_df: pd.DataFrame,
+) -> Dict:
+    """단일 조합 백테스트 (엔진은 재사용, 전략만 교체)"""
+    t0 = time.time()
+
+    if use_comp:
+        strategy = SignalCompositor(
+            symbol=symbol,
+            risk_reward_ratio=rr,
+            sl_timeframe=sl_tf,
+        )
+    else:
+        strategy = OrderBlockFVGStrategy(
+            symbol=symbol,
+            risk_reward_ratio=rr,
+            sl_timeframe=sl_tf,
+        )
+
+    engine.set_strategy(strategy)
+    perf = engine.run_backtest(m1_df, m15_df=m15_df)
+    elapsed = time.time() - t0
+
+    row = {
+        'symbol': symbol,
+        'rr': rr,
+        'sl_timeframe': sl_tf,
+        'compositor': use_comp,
+        'elapsed_sec': round(elapsed, 1),
+    }
+    row.update(perf)
+    return row
+
+
+def _run_one(symbol: str, rr: float, sl_tf: str, use_comp: bool) -> Dict:
+    """프로세스 풀 작업 단위 (pickle 가능한 최상위 함수, 워커 전역 엔진/데이터 사용)"""
+    return _run_combo(_WORKER_ENGINE, symbol, rr, sl_tf, use_comp, _WORKER_M1_DF, _WORKER_M15_DF)
+
+
+def _print_combo_result(row: Dict):
+    """조합 결과 한 줄 요약"""
+    elapsed = row['elapsed_sec']
+    if 'total_trades' in row:
+        print(f"  -> {row.get('total_trades', 0)} trades | "
+              f"WR {row.get('win_rate_%', 0):.1f}% | "
+              f"Net {row.get('total_net_pips', 0):+.1f}p | "
+              f"DD {row.get('max_drawdown_pips', 0):.1f}p | "
+              f"{elapsed:.1f}s")
+    else:
+        print(f"  -> No trades | {elapsed:.1f}s")
+
+
+def run_grid(symbol: str, m1_df: pd.DataFrame, n_jobs: int = 1) -> pd.DataFrame:
+    """
+    파라미터 그리드 실행
+
+    Args:
+        symbol: 거래 심볼
+        m1_df: M1 OHLC DataFrame
+        n_jobs: 병렬 워커 수 (1: 순차 실행, -1 이하: 전체 CPU 코어)
+    """
     combos = list(product(
         PARAM_GRID["risk_reward_ratio"],
         PARAM_GRID["sl_timeframe"],
@@ -59,50 +168,49 @@ def run_grid(symbol: str, m1_df: pd.DataFrame) -> pd.DataFrame:
     ))
 
     total = len(combos)
-    print(f"\nGrid search: {total} combinations")
+    if n_jobs <= 0:
+        n_jobs = os.cpu_count() or 1
+    n_jobs = min(n_jobs, total)
+
+    # M15 집계는 모든 조합에서 동일 → 1회만 계산
+    m1_df = m1_df.sort_values('time').reset_index(drop=True)
+    m15_df = BacktestEngine.aggregate_to_m15(m1_df)
+
+    print(f"\nGrid search: {total} combinations | workers: {n_jobs}")
+    print(f"M15 bars (shared): {len(m15_df):,}")
     print("=" * 80)
 
-    for idx, (rr, sl_tf, use_comp) in enumerate(combos, 1):
-        label = f"RR={rr} SL={sl_tf} Comp={'ON' if use_comp else 'OFF'}"
-        print(f"\n[{idx}/{total}] {label}")
-
-        t0 = time.time()
-
-        if use_comp:
-            strategy = SignalCompositor(
-                symbol=symbol,
-                risk_reward_ratio=rr,
-                sl_timeframe=sl_tf,
-            )
-        else:
-            strategy = OrderBlockFVGStrategy(
-                symbol=symbol,
-                risk_reward_ratio=rr,
-                sl_timeframe=sl_tf,
-            )
-
-        engine = BacktestEngine(strategy)
-        perf = engine.run_backtest(m1_df)
-        elapsed = time.time() - t0
-
-        row = {
-            'symbol': symbol,
-            'rr': rr,
-            'sl_timeframe': sl_tf,
-            'compositor': use_comp,
-            'elapsed_sec': round(elapsed, 1),
-        }
-        row.update(perf)
-        results.append(row)
-
-        if perf:
-            print(f"  -> {perf.get('total_trades', 0)} trades | "
-                  f"WR {perf.get('win_rate_%', 0):.1f}% | "
-                  f"Net {perf.get('total_net_pips', 0):+.1f}p | "
-                  f"DD {perf.get('max_drawdown_pips', 0):.1f}p | "
-                  f"{elapsed:.1f}s")
-        else:
-            print(f"  -> No trades | {elapsed:.1f}s")
+    results = []
+
+    if n_jobs == 1:
+        engine = BacktestEngine(verbose=False)  # 조합별 요약만 출력, 전처리는 1회
+        for idx, (rr, sl_tf, use_comp) in enumerate(combos, 1):
+            label = f"RR={rr} SL={sl_tf} Comp={'ON' if use_comp else 'OFF'}"
+            print(f"\n[{idx}/{total}] {label}")
+            row = _run_combo(engine, symbol, rr, sl_tf, use_comp, m1_df, m15_df)
+            _print_combo_result(row)
+            results.append(row)
+        return pd.DataFrame(results)
+
+    # 조합 간 완전 독립 → 프로세스 병렬 (CPU bound)
+    # M1/M15 배열은 임시 .npy 파일로 1회 기록 후 워커에서 memmap 공유
+    rrs, sl_tfs, comps = zip(*combos)
+    with tempfile.TemporaryDirectory(prefix="ict_grid_") as shared_dir:
+        m1_paths = _share_frame(m1_df, shared_dir, "m1")
+        m15_paths = _share_frame(m15_df, shared_dir, "m15")
+
+        with ProcessPoolExecutor(
+            max_workers=n_jobs,
+            initializer=_init_worker,
+            initargs=(m1_paths, m15_paths),
+        ) as executor:
+            rows = executor.map(_run_one, [symbol] * total, rrs, sl_tfs, comps)
+            for idx, row in enumerate(rows, 1):
+                label = (f"RR={row['rr']} SL={row['sl_timeframe']} "
+                         f"Comp={'ON' if row['compositor'] else 'OFF'}")
+                print(f"\n[{idx}/{total}] {label}")
+                _print_combo_result(row)
+                results.append(row)
 
     return pd.DataFrame(results)
 
@@ -114,6 +222,8 @@ def main():
     parser.add_argument("--source", type=str, default="db", choices=["csv", "db"])
     parser.add_argument("--start", type=str, default=None)
     parser.add_argument("--end", type=str, default=None)
+    parser.add_argument("--jobs", type=int, default=-1,
+                        help="병렬 워커 수 (기본: -1 = 전체 CPU 코어, 1 = 순차)")
     args = parser.parse_args()
 
     print("=" * 80)
@@ -131,7 +241,7 @@ def main():
         return
 
     # 그리드 실행
-    results_df = run_grid(args.symbol, m1_df)
+    results_df = run_grid(args.symbol, m1_df, n_jobs=args.jobs)
 
     # 결과 저장
     output_dir = Path(BACKTEST_CONFIG["output_dir"])
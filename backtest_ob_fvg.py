@@ -8,236 +8,728 @@ M15 + M1 데이터를 사용한 완전 백테스팅:
 - 성과 분석
 """
 
+import os
 import sys
 import argparse
 import pandas as pd
 import numpy as np
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, List, Tuple, Optional
-import warnings
 
 # Windows 콘솔 UTF-8 출력 설정
 if sys.platform == 'win32':
     sys.stdout.reconfigure(encoding='utf-8')
 
 from ob_fvg_strategy import OrderBlockFVGStrategy
+from bar_window import BarWindow, IncrementalSignalCache, cache_lookup, frame_columns
 from config import BACKTEST_CONFIG, STRATEGY_DEFAULTS
+from trade_log import TradeLog
+from _njit import njit, NUMBA_AVAILABLE
 
-warnings.filterwarnings('ignore')
 
 # 디렉토리 자동 생성
 Path(BACKTEST_CONFIG["data_dir"]).mkdir(parents=True, exist_ok=True)
 Path(BACKTEST_CONFIG["output_dir"]).mkdir(parents=True, exist_ok=True)
 
+# M15 버킷 크기 (나노초)
+M15_NS = 15 * 60 * 10**9
+
+# M1 CSV 컬럼 타입 (time은 parse_dates로 파싱)
+CSV_DTYPES = {
+    'open': 'float64',
+    'high': 'float64',
+    'low': 'float64',
+    'close': 'float64',
+    'tick_volume': 'int64',
+}
+
+# 청산 사유 코드 (njit 커널 → 문자열 매핑)
+EXIT_SL = 0
+EXIT_TP = 1
+EXIT_TIMEOUT = 2
+EXIT_REASONS = ('SL', 'TP', 'TIMEOUT')
+
+# 거래별 ENTRY/EXIT 출력 버퍼 크기 (이 건수마다 한 번에 출력)
+TRADE_PRINT_BATCH = 1000
+
+
+# 명시적 시그니처 → import 시 즉시(eager) 컴파일 + 디스크 캐시
+# (그리드 워커마다 첫 호출에서 JIT 지연이 발생하지 않음)
+# readonly 배열 타입: pandas Copy-on-Write / read-only memmap 배열도 그대로 수용
+_F8_RO = 'Array(float64, 1, "A", readonly=True)'
+
+
+@njit(f'Tuple((i8, f8, i8))({_F8_RO}, {_F8_RO}, {_F8_RO}, i8, f8, f8, i8, i8)', cache=True)
+def _scan_exit(high, low, close, entry_i, sl, tp, sig, max_bars):
+    """
+    진입 바부터 청산 바까지 고속 스캔
+
+    우선순위: SL → TP → TIMEOUT (진입 바 포함)
+
+    Returns:
+        (exit_i, exit_price, reason_code), 데이터 끝까지 청산 없으면 exit_i = -1
+    """
+    for i in range(entry_i, len(close)):
+        if sig == 1:  # BUY
+            if low[i] <= sl:
+                return i, sl, EXIT_SL
+            if high[i] >= tp:
+                return i, tp, EXIT_TP
+        else:  # SELL
+            if high[i] >= sl:
+                return i, sl, EXIT_SL
+            if low[i] <= tp:
+                return i, tp, EXIT_TP
+
+        if i - entry_i >= max_bars:
+            return i, close[i], EXIT_TIMEOUT
+
+    return -1, 0.0, -1
+
+
+def _scan_exit_vectorized(high, low, close, entry_i, sl, tp, sig, max_bars):
+    """
+    _scan_exit의 numpy 벡터 버전 (numba 미설치 시 사용)
+
+    보유 구간 [entry_i, entry_i + max_bars]에서 SL/TP 히트 마스크를 한 번에 만들고
+    argmax로 첫 히트 바를 찾음 (같은 바에서 둘 다 히트하면 SL 우선)
+    """
+    timeout_i = entry_i + max_bars
+    stop = min(timeout_i + 1, len(close))
+
+    if sig == 1:  # BUY
+        hit_sl = low[entry_i:stop] <= sl
+        hit_tp = high[entry_i:stop] >= tp
+    else:  # SELL
+        hit_sl = high[entry_i:stop] >= sl
+        hit_tp = low[entry_i:stop] <= tp
+
+    hits = hit_sl | hit_tp
+    if hits.any():
+        k = int(np.argmax(hits))
+        if hit_sl[k]:
+            return entry_i + k, sl, EXIT_SL
+        return entry_i + k, tp, EXIT_TP
+
+    if timeout_i < len(close):
+        return timeout_i, float(close[timeout_i]), EXIT_TIMEOUT
+
+    return -1, 0.0, -1
+
+
+# 청산 스캐너 선택: numba 컴파일 루프 또는 numpy 벡터 검색
+scan_exit = _scan_exit if NUMBA_AVAILABLE else _scan_exit_vectorized
+
+_I8_RO = 'Array(int64, 1, "A", readonly=True)'
+
+
+@njit(
+    f'Tuple((i8[:], i8[:], f8[:], i1[:], f8[:], f8[:]))({_F8_RO}, {_F8_RO}, {_F8_RO}, '
+    f'{_I8_RO}, {_I8_RO}, {_F8_RO}, {_F8_RO}, {_F8_RO}, i8, f8, f8)',
+    cache=True,
+)
+def _run_backtest_core(high, low, close, cand_idx, cand_sig, cand_entry, cand_sl, cand_tp,
+                       max_bars, pip_size, cost_pips):
+    """
+    사전 계산된 진입 후보 배열로 전체 포지션 루프 실행 (단일 포지션, 청산 바 다음부터 재진입)
+
+    청산 직후 손익(pips)도 같은 루프에서 계산 (strategy.calculate_pnl과 같은 식)
+
+    Args:
+        cand_idx: 진입 후보 M1 바 인덱스 (오름차순)
+        cand_sig / cand_entry / cand_sl / cand_tp: 후보별 방향(1/-1), 진입가, 손절가, 익절가
+        pip_size: 심볼 pip 크기
+        cost_pips: 거래 비용 (스프레드 + 커미션, pips)
+
+    Returns:
+        (후보 위치, 청산 바 인덱스, 청산가, 청산 사유 코드, gross pips, net pips) 배열,
+        미청산 마지막 포지션은 제외
+    """
+    n = len(cand_idx)
+    taken = np.empty(n, np.int64)
+    exit_idx = np.empty(n, np.int64)
+    exit_price = np.empty(n, np.float64)
+    reason = np.empty(n, np.int8)  # 청산 사유 코드 (EXIT_SL / EXIT_TP / EXIT_TIMEOUT)
+    gross = np.empty(n, np.float64)
+    net = np.empty(n, np.float64)
+
+    k = 0
+    next_free = 0
+    for j in range(n):
+        i = cand_idx[j]
+        if i < next_free:  # 포지션 보유 구간의 후보는 무시
+            continue
+
+        ei, ep, rc = scan_exit(high, low, close, i, cand_sl[j], cand_tp[j], cand_sig[j], max_bars)
+        if ei < 0:  # 데이터 끝까지 미청산
+            break
+
+        taken[k] = j
+        exit_idx[k] = ei
+        exit_price[k] = ep
+        reason[k] = rc
+        gross[k] = (ep - cand_entry[j]) * cand_sig[j] / pip_size
+        net[k] = gross[k] - cost_pips
+        k += 1
+        next_free = ei + 1
+
+    return taken[:k], exit_idx[:k], exit_price[:k], reason[:k], gross[:k], net[:k]
+
 
 class BacktestEngine:
     """Order Block + FVG 백테스팅 엔진"""
 
     def __init__(
         self,
-        strategy: OrderBlockFVGStrategy,
+        strategy: OrderBlockFVGStrategy = None,
         max_bars_per_trade: int = None,
         m15_lookback: int = None,
         m1_lookback: int = None,
+        verbose: bool = True,
+        print_trades: bool = None,
     ):
         """
         Args:
-            strategy: OrderBlockFVGStrategy 인스턴스
+            strategy: OrderBlockFVGStrategy 인스턴스 (생략 시 set_strategy로 지정)
             max_bars_per_trade: 최대 홀딩 바 수 (기본: config.py의 STRATEGY_DEFAULTS)
             m15_lookback: M15 윈도우 크기 (기본: config.py)
             m1_lookback: M1 윈도우 크기 (기본: config.py)
+            verbose: 진행률/성과 요약 출력 여부 (그리드 탐색 시 False)
+            print_trades: 거래별 ENTRY/EXIT 출력 여부 (기본: verbose와 동일,
+                          TRADE_PRINT_BATCH건씩 모아서 출력)
         """
         self.strategy = strategy
         self.max_bars_per_trade = max_bars_per_trade if max_bars_per_trade is not None else STRATEGY_DEFAULTS["max_bars_per_trade"]
         self.m15_lookback = m15_lookback if m15_lookback is not None else STRATEGY_DEFAULTS.get("m15_lookback", 50)
         self.m1_lookback = m1_lookback if m1_lookback is not None else STRATEGY_DEFAULTS.get("m1_lookback", 3)
-        self.trades: List[Dict] = []
-        self.pip_size = strategy.pip_size  # 심볼별 pip_size 사용
+        self.verbose = verbose
+        self.print_trades = verbose if print_trades is None else print_trades
+        self.trade_log = TradeLog(EXIT_REASONS)  # 거래 기록 (필드별 numpy 배열)
+        self._trade_lines: List[str] = []  # 거래별 출력 버퍼
+        self.pip_size = strategy.pip_size if strategy is not None else None  # 심볼별 pip_size 사용
+        self.m15_times: Optional[np.ndarray] = None
+        self._prepared: Optional[Dict] = None  # 전처리 캐시 (_prepare_data)
+        self.hourly_stats: Optional[pd.DataFrame] = None  # 진입 시간대별 성과 (analyze_performance)
+
+    def set_strategy(self, strategy: OrderBlockFVGStrategy):
+        """
+        전략 교체 (그리드 탐색용)
+
+        거래 기록만 초기화하고 전처리된 M1/M15 배열 캐시는 유지하여
+        같은 데이터로 여러 전략을 실행할 때 전처리 비용을 1회로 줄임
+        """
+        self.strategy = strategy
+        self.pip_size = strategy.pip_size
+        self.trade_log = TradeLog(EXIT_REASONS)
+
+    @property
+    def trades(self) -> List[Dict]:
+        """거래 dict 리스트 (하위 호환, 호출 시 trade_log에서 생성)"""
+        return self.trade_log.to_records()
     
-    def load_data(self, csv_file: str, timeframe: str = "M1") -> pd.DataFrame:
+    @staticmethod
+    def load_data(csv_file: str, timeframe: str = "M1") -> pd.DataFrame:
         """
         CSV 데이터 로드
         
         예상 컬럼: time, open, high, low, close, tick_volume
+
+        파싱 결과를 같은 경로의 .parquet으로 캐시하여, CSV가 더 최신이 아니면
+        다음 실행부터 CSV 재파싱 없이 parquet을 로드 (pyarrow 없음 / 캐시 읽기·쓰기 실패 시 CSV만 사용).
+        CSV는 pyarrow 멀티스레드 파서 + 명시적 dtype으로 파싱 (없으면 C 엔진,
+        두 경로 모두 정확한 float 파싱으로 같은 값)
         """
-        df = pd.read_csv(csv_file, parse_dates=['time'])
-        df['time'] = pd.to_datetime(df['time'])
-        df = df.sort_values('time').reset_index(drop=True)
+        cache_file = Path(csv_file).with_suffix('.parquet')
+
+        if cache_file.exists() and cache_file.stat().st_mtime >= Path(csv_file).stat().st_mtime:
+            try:
+                return pd.read_parquet(cache_file)
+            except Exception:
+                pass  # parquet 엔진 없음 / 손상된 캐시 → CSV 재파싱 (아래에서 캐시 재생성)
+
+        try:
+            df = pd.read_csv(csv_file, engine='pyarrow', dtype=CSV_DTYPES, parse_dates=['time'])
+        except ImportError:
+            df = pd.read_csv(csv_file, dtype=CSV_DTYPES, parse_dates=['time'], float_precision='round_trip')
+
+        if not pd.api.types.is_datetime64_any_dtype(df['time']):  # 비표준 시간 포맷
+            df['time'] = pd.to_datetime(df['time'])
+        if not df['time'].is_monotonic_increasing:
+            df = df.sort_values('time').reset_index(drop=True)
+
+        # 같은 디렉토리 임시 파일에 쓴 뒤 교체 (쓰기 중단 시 불완전한 캐시가 남지 않음)
+        tmp_file = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.tmp")
+        try:
+            df.to_parquet(tmp_file, index=False)
+            os.replace(tmp_file, cache_file)
+        except (ImportError, OSError):
+            # parquet 캐시는 선택 사항 (엔진 없음 / 쓰기 권한 없음 등)
+            try:
+                tmp_file.unlink()
+            except OSError:
+                pass
+
         return df
     
-    def aggregate_to_m15(self, m1_df: pd.DataFrame) -> pd.DataFrame:
-        """M1 데이터를 M15로 변환"""
-        m1_df = m1_df.copy()
-        
-        # 15분 단위로 그룹화
-        m1_df['m15_time'] = m1_df['time'].dt.floor('15min')
-        
-        m15_df = m1_df.groupby('m15_time').agg({
-            'open': 'first',
-            'high': 'max',
-            'low': 'min',
-            'close': 'last',
-            'tick_volume': 'sum'
-        }).reset_index()
-        
-        m15_df.rename(columns={'m15_time': 'time'}, inplace=True)
-        m15_df['time'] = pd.to_datetime(m15_df['time'])
-        
+    @staticmethod
+    def aggregate_to_m15(m1_df: pd.DataFrame) -> pd.DataFrame:
+        """
+        M1 데이터를 M15로 변환
+
+        시간순 정렬된 M1 바를 15분 버킷 경계에서 끊어 reduceat으로 집계
+        (groupby 해싱 없이 컬럼별 단일 패스).
+        Polars group_by_dynamic도 비교했으나 pandas ↔ Polars 변환 포함 시
+        이 방식이 더 빠름 (M1 200만 바: 0.05s vs 0.18s)
+        """
+        if not m1_df['time'].is_monotonic_increasing:
+            m1_df = m1_df.sort_values('time')
+
+        if len(m1_df) == 0:
+            return pd.DataFrame(columns=['time', 'open', 'high', 'low', 'close', 'tick_volume'])
+
+        # 15분 버킷 번호 (epoch 기준 정수 나눗셈 = floor('15min'))
+        time_ns = m1_df['time'].to_numpy(dtype='datetime64[ns]').view(np.int64)
+        bucket = time_ns // M15_NS
+
+        # 버킷이 바뀌는 위치 = 각 M15 바의 시작 인덱스
+        edges = np.flatnonzero(np.diff(bucket, prepend=bucket[0] - 1))
+        last = np.r_[edges[1:] - 1, len(bucket) - 1]
+
+        m15_df = pd.DataFrame({
+            'time': (bucket[edges] * M15_NS).astype('datetime64[ns]'),
+            'open': m1_df['open'].to_numpy()[edges],
+            'high': np.fmax.reduceat(m1_df['high'].to_numpy(), edges),
+            'low': np.fmin.reduceat(m1_df['low'].to_numpy(), edges),
+            'close': m1_df['close'].to_numpy()[last],
+            'tick_volume': np.add.reduceat(m1_df['tick_volume'].to_numpy(), edges),
+        })
+
         return m15_df
     
-    def run_backtest(self, m1_data) -> Dict:
+    def _prepare_data(self, m1_data, m15_df: pd.DataFrame = None) -> Dict:
         """
-        백테스팅 실행
-
-        Args:
-            m1_data: M1 데이터 CSV 파일 경로 (str) 또는 DataFrame
+        백테스트 입력 전처리 (M1 정렬, M15 집계, 컬럼 배열 추출, M15 인덱스 맵)
 
-        Returns:
-            성과 분석 결과
+        같은 입력 객체로 다시 호출되면 캐시를 그대로 반환 (set_strategy와 함께 사용)
         """
+        cached = self._prepared
+        if cached is not None and cached['m15_source'] is m15_df and (
+            cached['m1_source'] is m1_data
+            or (isinstance(m1_data, str) and cached['m1_source'] == m1_data)
+        ):
+            return cached
+
+        m15_source = m15_df
+
         if isinstance(m1_data, pd.DataFrame):
-            m1_df = m1_data.copy()
-            m1_df['time'] = pd.to_datetime(m1_df['time'])
-            m1_df = m1_df.sort_values('time').reset_index(drop=True)
-            print(f"✓ Loaded {len(m1_df):,} M1 bars (DataFrame)")
+            # 이미 datetime + 시간순이면 원본 그대로 사용 (memmap 공유 데이터 복사 방지)
+            m1_df = m1_data
+            if not pd.api.types.is_datetime64_any_dtype(m1_df['time']):
+                m1_df = m1_df.assign(time=pd.to_datetime(m1_df['time']))
+            if not m1_df['time'].is_monotonic_increasing:
+                m1_df = m1_df.sort_values('time').reset_index(drop=True)
+            if self.verbose:
+                print(f"✓ Loaded {len(m1_df):,} M1 bars (DataFrame)")
         else:
-            print(f"Loading data from {m1_data}...")
+            if self.verbose:
+                print(f"Loading data from {m1_data}...")
             m1_df = self.load_data(m1_data)
-            print(f"✓ Loaded {len(m1_df):,} M1 bars")
-
-        # M15 생성
-        m15_df = self.aggregate_to_m15(m1_df)
-        print(f"✓ Generated {len(m15_df):,} M15 bars")
+            if self.verbose:
+                print(f"✓ Loaded {len(m1_df):,} M1 bars")
 
-        self.trades = []
-        active_trade = None
+        # M15 생성 (외부에서 전달되면 재사용)
+        if m15_df is None:
+            m15_df = self.aggregate_to_m15(m1_df)
+            if self.verbose:
+                print(f"✓ Generated {len(m15_df):,} M15 bars")
+        elif self.verbose:
+            print(f"✓ Using {len(m15_df):,} pre-aggregated M15 bars")
 
         # M15 시간 인덱스 (searchsorted용 numpy 배열)
         m15_times = m15_df['time'].values  # numpy datetime64 배열
 
-        total_bars = len(m1_df)
-        progress_step = max(1, total_bars // 20)  # 5% 단위 진행률
+        # OHLC 연속 배열 (루프 전 1회 추출, 루프 내 iloc 제거)
+        m1_cols = frame_columns(m1_df)
+        m15_cols = frame_columns(m15_df)
+        times = m1_cols['time']
+        high = m1_df['high'].to_numpy(dtype=np.float64)
+        low = m1_df['low'].to_numpy(dtype=np.float64)
+        close = m1_df['close'].to_numpy(dtype=np.float64)
+
+        # M1 바별 소속 M15 인덱스 (int64 ns 버킷 산술 + 단일 벡터 searchsorted)
+        m1_bucket = times.astype('datetime64[ns]', copy=False).view(np.int64) // M15_NS
+        m15_bucket = m15_times.astype('datetime64[ns]', copy=False).view(np.int64) // M15_NS
+        m15_idx_per_m1 = np.searchsorted(m15_bucket, m1_bucket, side='right') - 1
+
+        self._prepared = {
+            'm1_source': m1_data,
+            'm15_source': m15_source,
+            'm1_df': m1_df,
+            'm15_df': m15_df,
+            'm15_times': m15_times,
+            'm1_cols': m1_cols,
+            'm15_cols': m15_cols,
+            'high': high,
+            'low': low,
+            'close': close,
+            'm15_idx_per_m1': m15_idx_per_m1,
+        }
+        return self._prepared
+
+    def _m15_window(self, data: Dict, m15_idx: int, signal_cache: IncrementalSignalCache) -> BarWindow:
+        """
+        m15_idx까지의 M15 고정 윈도우 (m15_lookback개)
 
-        print(f"\nStarting backtest ({total_bars:,} bars)...")
-        print("=" * 80)
+        M15 윈도우는 M15 바가 바뀔 때만 달라지므로 signal_cache의 'm15_bars'에 1회 생성 후
+        같은 M15 바의 M1 바들이 그대로 재사용
+        """
+        def build() -> BarWindow:
+            m15_start = max(0, m15_idx - self.m15_lookback + 1)
+            return BarWindow(data['m15_cols'], m15_start, m15_idx + 1)
+
+        return cache_lookup(signal_cache.get(m15_idx), 'm15_bars', build)
+
+    def _candidate_finder(self, data: Dict, signal_cache: IncrementalSignalCache):
+        """
+        진입 후보 바 탐색 함수 생성
+
+        반환 함수 next_candidate(i)는 i 이후 첫 평가 대상 M1 바 인덱스를 반환
+        (M15 바 2개 미만 구간, get_m15_setup 불충족 M15 바 구간은 통째로 건너뜀).
+        get_m15_setup 결과는 signal_cache의 'm15_setup'에 저장되어 신호 계산에서 재사용
+        """
+        m15_idx_per_m1 = data['m15_idx_per_m1']
+        total_bars = len(m15_idx_per_m1)
+        first_valid = int(np.searchsorted(m15_idx_per_m1, 1, side='left'))  # 최소 2개 M15 바 필요
+
+        has_m15_setup = hasattr(self.strategy, 'get_m15_setup')
+
+        # 거래 허용 시간 외 M15 바는 get_m15_setup 호출 없이 건너뜀 (벡터 사전 필터)
+        in_session = None
+        if hasattr(self.strategy, 'trading_hour_mask'):
+            in_session = self.strategy.trading_hour_mask(data['m15_cols']['time'])
+
+        def next_candidate(i: int) -> int:
+            i = max(i, first_valid)
+            while i < total_bars:
+                if not has_m15_setup:
+                    return i
+
+                # M15 단계 조건 (M15 바가 바뀔 때만 재평가)
+                m15_idx = m15_idx_per_m1[i]
+                if in_session is not None and not in_session[m15_idx]:
+                    i = int(np.searchsorted(m15_idx_per_m1, m15_idx, side='right'))
+                    continue
+
+                context = signal_cache.get(m15_idx)
+                if 'm15_setup' not in context:
+                    context['m15_setup'] = self.strategy.get_m15_setup(self._m15_window(data, m15_idx, signal_cache))
+                if context['m15_setup'] is not None:
+                    return i
+
+                # M15 조건 불충족 → 같은 M15 바의 나머지 M1 바는 신호 불가, 다음 M15 바로 이동
+                i = int(np.searchsorted(m15_idx_per_m1, m15_idx, side='right'))
 
-        # 각 M1 봉마다 실행 (고정 윈도우, O(1) per iteration)
-        for i in range(self.m1_lookback, total_bars):
-            m1_current = m1_df.iloc[i]
-            m1_time = m1_current['time']
+            return total_bars
 
-            # 진행률 표시 (5% 단위)
-            if i % progress_step == 0:
-                pct = i / total_bars * 100
-                print(f"  [{pct:5.1f}%] {m1_time.strftime('%Y-%m-%d')} | trades: {len(self.trades)}")
+        return next_candidate
 
-            # M15 인덱스 탐색: O(log m) binary search
-            m15_floor = np.datetime64(m1_time.floor('15min'))
-            m15_idx = np.searchsorted(m15_times, m15_floor, side='right') - 1
+    def _signal_at(self, data: Dict, i: int, signal_cache: IncrementalSignalCache) -> Optional[Dict]:
+        """
+        M1 바 i 시점의 진입 신호 (compositor가 있으면 get_composite_signal, 없으면 get_entry_signal)
+
+        get_m15_setup을 제공하는 전략에는 M15 바 단위 계산 캐시(m15_context)를 함께 전달
+        """
+        m15_idx = data['m15_idx_per_m1'][i]
+
+        # M15/M1 고정 윈도우 (배열 뷰, DataFrame 슬라이스 생성 없음, M15는 M15 바당 1회 생성)
+        m15_bars = self._m15_window(data, m15_idx, signal_cache)
+        m1_start = max(0, i - self.m1_lookback + 1)
+        m1_bars = BarWindow(data['m1_cols'], m1_start, i + 1)
+
+        if hasattr(self.strategy, 'get_composite_signal'):
+            get_signal = self.strategy.get_composite_signal
+        else:
+            get_signal = self.strategy.get_entry_signal
+
+        if hasattr(self.strategy, 'get_m15_setup'):
+            return get_signal(m15_bars, m1_bars, m15_context=signal_cache.get(m15_idx))
+        return get_signal(m15_bars, m1_bars)
+
+    def _print_progress(self, i: int, times: np.ndarray, next_progress: int, label: str, count: int) -> int:
+        """진행률 표시 (5% 단위), 다음 표시 기준 인덱스 반환"""
+        if i < next_progress:
+            return next_progress
+
+        total_bars = len(times)
+        progress_step = max(1, total_bars // 20)
+        pct = i / total_bars * 100
+        print(f"  [{pct:5.1f}%] {pd.Timestamp(times[i]).strftime('%Y-%m-%d')} | {label}: {count}")
+        return (i // progress_step + 1) * progress_step
+
+    def _record_trade(self, data: Dict, signal: Dict, entry_i: int, exit_i: int,
+                      exit_price: float, reason_code: int, pnl: Tuple[float, float] = None):
+        """청산 결과 → 거래 기록 1건 추가 (pnl: 커널에서 계산한 (gross, net), 생략 시 calculate_pnl)"""
+        times = data['m1_cols']['time']
+
+        # 포지션 상태는 스칼라로 1회 언팩 (dict 조회 반복 없음)
+        at_signal = int(signal['signal'])
+        at_entry_price = float(signal['entry_price'])
+        at_risk_pips = float(signal['risk_pips'])
+
+        if pnl is None:
+            gross_pips, net_pips, _ = self.strategy.calculate_pnl(
+                at_entry_price, exit_price, at_signal, at_risk_pips
+            )
+        else:
+            gross_pips, net_pips = pnl
+
+        self.trade_log.append(
+            entry_time=pd.Timestamp(signal['entry_time']).to_datetime64(),
+            exit_time=times[exit_i],
+            signal=at_signal,
+            entry_price=at_entry_price,
+            exit_price=exit_price,
+            stop_loss=float(signal['stop_loss']),
+            take_profit=float(signal['take_profit']),
+            risk_pips=at_risk_pips,
+            gross_pips=gross_pips,
+            net_pips=net_pips,
+            bars_held=exit_i - entry_i,
+            reason_code=reason_code,
+        )
+
+        if self.print_trades:
+            self._queue_trade_line(self._format_trade(len(self.trade_log) - 1, signal))
+
+    def _record_trades(self, data: Dict, candidates: Dict[str, np.ndarray], taken: np.ndarray,
+                       exit_idx: np.ndarray, exit_price: np.ndarray, reason: np.ndarray,
+                       gross_pips: np.ndarray, net_pips: np.ndarray):
+        """청산 결과 배열 → 거래 기록 일괄 추가 (배치 API 경로, 거래별 dict 생성 없음)"""
+        times = data['m1_cols']['time']
+        entry_idx = candidates['idx'][taken]
+        signal = candidates['signal'][taken]
+        entry_price = candidates['entry_price'][taken].astype(np.float64)
+        risk_pips = candidates['risk_pips'][taken].astype(np.float64)
+
+        start = len(self.trade_log)
+        self.trade_log.extend(
+            entry_time=times[entry_idx],
+            exit_time=times[exit_idx],
+            signal=signal,
+            entry_price=entry_price,
+            exit_price=exit_price,
+            stop_loss=candidates['stop_loss'][taken],
+            take_profit=candidates['take_profit'][taken],
+            risk_pips=risk_pips,
+            gross_pips=gross_pips,
+            net_pips=net_pips,
+            bars_held=exit_idx - entry_idx,
+            reason_code=reason,
+        )
+
+        if self.print_trades:
+            scores = candidates['composite_score'][taken] if 'composite_score' in candidates else None
+            for j, k in enumerate(range(start, len(self.trade_log))):
+                extra = None if scores is None else {'composite_score': scores[j]}
+                self._queue_trade_line(self._format_trade(k, extra=extra))
+
+    def _format_trade(self, k: int, signal: Dict = None, extra: Dict = None) -> str:
+        """k번째 거래 ENTRY/EXIT 문자열 (signal 생략 시 기록된 값 + extra로 포맷)"""
+        log = self.trade_log
+        if signal is None:
+            signal = {name: log[name][k] for name in ('signal', 'entry_price', 'stop_loss',
+                                                      'take_profit', 'risk_pips')}
+            if extra:
+                signal.update(extra)
+        return (
+            f"\n  ENTRY @ {pd.Timestamp(log['entry_time'][k]).strftime('%Y-%m-%d %H:%M')} | "
+            f"{self.strategy.format_signal(signal)}\n"
+            f"  EXIT  @ {pd.Timestamp(log['exit_time'][k]).strftime('%Y-%m-%d %H:%M')} | "
+            f"{EXIT_REASONS[log['reason_code'][k]]} @ {log['exit_price'][k]:.5f} | "
+            f"P&L: {log['net_pips'][k]:+.2f}p (gross {log['gross_pips'][k]:+.2f}p)"
+        )
+
+    def _queue_trade_line(self, line: str):
+        """거래 출력 버퍼에 추가, TRADE_PRINT_BATCH건마다 한 번에 출력"""
+        self._trade_lines.append(line)
+        if len(self._trade_lines) >= TRADE_PRINT_BATCH:
+            self._flush_trade_lines()
+
+    def _flush_trade_lines(self):
+        if self._trade_lines:
+            print("\n".join(self._trade_lines))
+            self._trade_lines = []
+
+    def _prescan_entries(self, data: Dict) -> Tuple[Dict[str, np.ndarray], List[Dict]]:
+        """
+        진입 후보 사전 스캔 (get_entry_signals 배치 API가 없는 전략용)
+
+        Returns:
+            (후보 배열 dict: idx/signal/entry_price/stop_loss/take_profit, 후보별 신호 dict 리스트)
+        """
+        times = data['m1_cols']['time']
+        total_bars = len(times)
+        signal_cache = IncrementalSignalCache()
+        next_candidate = self._candidate_finder(data, signal_cache)
+        next_progress = 0 if self.verbose else total_bars  # 비활성 시 진행률 생략
+
+        signals = []
+        cand_idx = []
+        i = self.m1_lookback
+        while True:
+            i = next_candidate(i)
+            if i >= total_bars:
+                break
+            next_progress = self._print_progress(i, times, next_progress, 'signals', len(signals))
+
+            signal = self._signal_at(data, i, signal_cache)
+            if signal is not None:
+                signals.append(signal)
+                cand_idx.append(i)
+            i += 1
+
+        candidates = {
+            'idx': np.asarray(cand_idx, dtype=np.int64),
+            'signal': np.array([s['signal'] for s in signals], dtype=np.int64),
+            'entry_price': np.array([s['entry_price'] for s in signals], dtype=np.float64),
+            'stop_loss': np.array([s['stop_loss'] for s in signals], dtype=np.float64),
+            'take_profit': np.array([s['take_profit'] for s in signals], dtype=np.float64),
+        }
+        return candidates, signals
+
+    def _batch_entries(self, data: Dict) -> Dict[str, np.ndarray]:
+        """진입 후보 배열 (전략의 get_entry_signals 배치 API, 바별 Python 호출 없음)"""
+        entries = self.strategy.get_entry_signals(
+            data['m1_cols'], data['m15_cols'], data['m15_idx_per_m1'],
+            self.m1_lookback, self.m15_lookback,
+        )
+
+        # 루프 시작 바(m1_lookback) 이전은 진입 대상 아님
+        cand_idx = np.flatnonzero(entries['signal'])
+        cand_idx = cand_idx[cand_idx >= self.m1_lookback]
+
+        candidates = {key: arr[cand_idx] for key, arr in entries.items()}
+        candidates['idx'] = cand_idx.astype(np.int64)
+        return candidates
+
+    def _run_batch(self, data: Dict):
+        """
+        2단계 실행: 진입 후보 계산 → 포지션 루프 (_run_backtest_core)
 
-            if m15_idx < 1:  # 최소 2개 M15 바 필요
+        신호가 포지션 상태와 무관하므로 후보 바 전체를 먼저 계산하고,
+        진입/청산/재진입 루프는 컴파일된 커널 한 번의 호출로 처리
+        """
+        # 1단계: 진입 후보 (배치 API 또는 바별 사전 스캔)
+        if hasattr(self.strategy, 'get_entry_signals'):
+            candidates = self._batch_entries(data)
+            signals = None
+        else:
+            candidates, signals = self._prescan_entries(data)
+
+        # 2단계: 포지션 루프 + 손익 (컴파일 커널)
+        taken, exit_idx, exit_price, reason, gross_pips, net_pips = _run_backtest_core(
+            data['high'], data['low'], data['close'],
+            candidates['idx'],
+            candidates['signal'].astype(np.int64, copy=False),
+            candidates['entry_price'].astype(np.float64, copy=False),
+            candidates['stop_loss'].astype(np.float64, copy=False),
+            candidates['take_profit'].astype(np.float64, copy=False),
+            self.max_bars_per_trade,
+            float(self.strategy.pip_size),
+            float(self.strategy.total_cost_pips),
+        )
+
+        if signals is None:
+            self._record_trades(data, candidates, taken, exit_idx, exit_price, reason,
+                                gross_pips, net_pips)
+            return
+
+        for j, exit_i, price, reason_code, gross, net in zip(
+            taken.tolist(), exit_idx.tolist(), exit_price.tolist(), reason.tolist(),
+            gross_pips.tolist(), net_pips.tolist(),
+        ):
+            self._record_trade(data, signals[j], int(candidates['idx'][j]), exit_i, price,
+                               reason_code, pnl=(gross, net))
+
+    def _run_lazy(self, data: Dict):
+        """
+        지연 평가 실행: 포지션이 없을 때만 신호 계산, 보유 구간은 scan_exit로 건너뜀
+
+        compositor처럼 신호 계산 비용이 큰 전략용 (보유 구간 바의 신호 평가 생략)
+        """
+        times = data['m1_cols']['time']
+        high = data['high']
+        low = data['low']
+        close = data['close']
+        total_bars = len(times)
+        signal_cache = IncrementalSignalCache()
+        next_candidate = self._candidate_finder(data, signal_cache)
+        next_progress = 0 if self.verbose else total_bars  # 비활성 시 진행률 생략
+
+        i = self.m1_lookback
+        while True:
+            i = next_candidate(i)
+            if i >= total_bars:
+                break
+            next_progress = self._print_progress(i, times, next_progress, 'trades', len(self.trade_log))
+
+            signal = self._signal_at(data, i, signal_cache)
+            if signal is None:
+                i += 1
                 continue
 
-            # M15 고정 윈도우 슬라이스 (복사 없음, O(1))
-            m15_start = max(0, m15_idx - self.m15_lookback + 1)
-            m15_bars = m15_df.iloc[m15_start:m15_idx + 1]
-
-            # M1 고정 윈도우 슬라이스 (복사 없음, O(1))
-            m1_start = max(0, i - self.m1_lookback + 1)
-            m1_bars = m1_df.iloc[m1_start:i + 1]
-
-            # 1. 활성 포지션이 없으면 신호 탐지
-            if active_trade is None:
-                # compositor가 있으면 get_composite_signal, 없으면 get_entry_signal
-                if hasattr(self.strategy, 'get_composite_signal'):
-                    signal = self.strategy.get_composite_signal(m15_bars, m1_bars)
-                else:
-                    signal = self.strategy.get_entry_signal(m15_bars, m1_bars)
-
-                if signal is not None:
-                    active_trade = {
-                        'entry_time': signal['entry_time'],
-                        'entry_price': signal['entry_price'],
-                        'signal': signal['signal'],
-                        'stop_loss': signal['stop_loss'],
-                        'take_profit': signal['take_profit'],
-                        'risk_pips': signal['risk_pips'],
-                        'entry_bar_idx': i,
-                        'bars_held': 0
-                    }
-                    print(f"\n  ENTRY @ {m1_time.strftime('%Y-%m-%d %H:%M')} | "
-                          f"{self.strategy.format_signal(signal)}")
-
-            # 2. 활성 포지션이 있으면 청산 규칙 확인
-            if active_trade is not None:
-                active_trade['bars_held'] = i - active_trade['entry_bar_idx']
-                exit_price = m1_current['close']
-                high = m1_current['high']
-                low = m1_current['low']
-
-                exit_signal = None
-
-                # SL 확인 (우선순위 1)
-                if active_trade['signal'] == 1:  # BUY
-                    if low <= active_trade['stop_loss']:
-                        exit_price = active_trade['stop_loss']
-                        exit_signal = 'SL'
-                else:  # SELL
-                    if high >= active_trade['stop_loss']:
-                        exit_price = active_trade['stop_loss']
-                        exit_signal = 'SL'
-
-                # TP 확인 (우선순위 2)
-                if exit_signal is None:
-                    if active_trade['signal'] == 1:  # BUY
-                        if high >= active_trade['take_profit']:
-                            exit_price = active_trade['take_profit']
-                            exit_signal = 'TP'
-                    else:  # SELL
-                        if low <= active_trade['take_profit']:
-                            exit_price = active_trade['take_profit']
-                            exit_signal = 'TP'
-
-                # 최대 홀딩 바 초과 (우선순위 3)
-                if exit_signal is None and active_trade['bars_held'] >= self.max_bars_per_trade:
-                    exit_signal = 'TIMEOUT'
-
-                # 청산 실행
-                if exit_signal is not None:
-                    gross_pips, net_pips, _ = self.strategy.calculate_pnl(
-                        active_trade['entry_price'],
-                        exit_price,
-                        active_trade['signal'],
-                        active_trade['risk_pips']
-                    )
-
-                    trade_record = {
-                        'entry_time': active_trade['entry_time'],
-                        'exit_time': m1_time,
-                        'direction': 'BUY' if active_trade['signal'] == 1 else 'SELL',
-                        'entry_price': active_trade['entry_price'],
-                        'exit_price': exit_price,
-                        'stop_loss': active_trade['stop_loss'],
-                        'take_profit': active_trade['take_profit'],
-                        'risk_pips': active_trade['risk_pips'],
-                        'gross_pips': gross_pips,
-                        'net_pips': net_pips,
-                        'bars_held': active_trade['bars_held'],
-                        'exit_reason': exit_signal,
-                        'profit_loss': 'WIN' if net_pips > 0 else 'LOSS'
-                    }
-
-                    self.trades.append(trade_record)
-
-                    print(f"  EXIT  @ {m1_time.strftime('%Y-%m-%d %H:%M')} | "
-                          f"{exit_signal} @ {exit_price:.5f} | "
-                          f"P&L: {net_pips:+.2f}p (gross {gross_pips:+.2f}p)")
-
-                    active_trade = None
+            # 청산 바까지 컴파일된 커널로 고속 스캔 (진입 바 포함)
+            exit_i, exit_price, reason_code = scan_exit(
+                high, low, close, i,
+                float(signal['stop_loss']), float(signal['take_profit']), int(signal['signal']),
+                self.max_bars_per_trade,
+            )
 
-        print("\n" + "=" * 80)
-        print(f"✓ Backtest completed | Total trades: {len(self.trades)}")
+            if exit_i < 0:  # 데이터 끝까지 미청산
+                break
+
+            self._record_trade(data, signal, i, exit_i, exit_price, reason_code)
+
+            # 청산 바 다음부터 신호 탐지 재개
+            i = exit_i + 1
+
+    def run_backtest(self, m1_data, m15_df: pd.DataFrame = None) -> Dict:
+        """
+        백테스팅 실행
+
+        Args:
+            m1_data: M1 데이터 CSV 파일 경로 (str) 또는 DataFrame
+            m15_df: 미리 집계된 M15 DataFrame (생략 시 m1_data에서 집계).
+                    그리드 탐색처럼 동일 데이터를 반복 실행할 때 재집계 방지용
+
+        Returns:
+            성과 분석 결과
+        """
+        if self.strategy is None:
+            raise ValueError("전략이 설정되지 않았습니다. set_strategy()로 지정하세요.")
+
+        data = self._prepare_data(m1_data, m15_df)
+        self.m15_times = data['m15_times']
+        self.trade_log = TradeLog(EXIT_REASONS)
+
+        if self.verbose:
+            print(f"\nStarting backtest ({len(data['close']):,} bars)...")
+            print("=" * 80)
+
+        # compositor: numba 있으면 배치 API (컴파일된 composite 커널), 없으면 신호 계산 비용이 커서
+        # 보유 구간을 건너뛰는 지연 평가 / 단일 전략: 후보 사전 스캔 + 컴파일된 포지션 루프
+        batch_composite = NUMBA_AVAILABLE and hasattr(self.strategy, 'get_entry_signals')
+        if hasattr(self.strategy, 'get_composite_signal') and not batch_composite:
+            self._run_lazy(data)
+        else:
+            self._run_batch(data)
+        self._flush_trade_lines()
+
+        if self.verbose:
+            print("\n" + "=" * 80)
+            print(f"✓ Backtest completed | Total trades: {len(self.trade_log)}")
 
         # 성과 분석
         results = self.analyze_performance()
@@ -245,53 +737,59 @@ class BacktestEngine:
         return results
     
     def analyze_performance(self) -> Dict:
-        """성과 분석"""
-        if len(self.trades) == 0:
-            print("\n⚠️  No trades executed")
+        """성과 분석 (trade_log 필드 배열 직접 벡터 연산)"""
+        log = self.trade_log
+        if len(log) == 0:
+            if self.verbose:
+                print("\n⚠️  No trades executed")
             return {}
-        
-        df_trades = pd.DataFrame(self.trades)
-        
-        # 기본 지표
-        total_trades = len(df_trades)
-        wins = (df_trades['profit_loss'] == 'WIN').sum()
-        losses = (df_trades['profit_loss'] == 'LOSS').sum()
-        win_rate = wins / total_trades * 100 if total_trades > 0 else 0
-        
+
+        total_trades = len(log)
+        net_pips = log['net_pips']
+        bars_held = log['bars_held']
+        reason_code = log['reason_code'].astype(np.intp)
+
+        # 기본 지표 (WIN = net_pips > 0)
+        is_win = net_pips > 0
+        wins = int(is_win.sum())
+        losses = total_trades - wins
+        win_rate = wins / total_trades * 100
+
         # 수익성
-        total_net_pips = df_trades['net_pips'].sum()
-        cumulative_pips = df_trades['net_pips'].cumsum()
-        
-        # 손익비
-        tp_trades = df_trades[df_trades['exit_reason'] == 'TP']
-        sl_trades = df_trades[df_trades['exit_reason'] == 'SL']
-        
-        if len(tp_trades) > 0:
-            avg_win_pips = tp_trades['net_pips'].mean()
-        else:
-            avg_win_pips = 0
-        
-        if len(sl_trades) > 0:
-            avg_loss_pips = abs(sl_trades['net_pips'].mean())
-        else:
-            avg_loss_pips = 0
-        
+        total_net_pips = net_pips.sum()
+        cumulative_pips = np.cumsum(net_pips)
+
+        # 손익비 (청산 사유별 건수는 정수 코드 bincount 1회)
+        reason_count = np.bincount(reason_code, minlength=len(EXIT_REASONS))
+        tp_mask = reason_code == EXIT_TP
+        sl_mask = reason_code == EXIT_SL
+        tp_count = int(reason_count[EXIT_TP])
+        sl_count = int(reason_count[EXIT_SL])
+
+        avg_win_pips = net_pips[tp_mask].mean() if tp_count > 0 else 0
+        avg_loss_pips = abs(net_pips[sl_mask].mean()) if sl_count > 0 else 0
+
         rrr = avg_win_pips / avg_loss_pips if avg_loss_pips > 0 else (
             np.inf if avg_win_pips > 0 else 0
         )
-        
+
         # Drawdown
-        max_cumulative = cumulative_pips.cummax()
-        drawdown = cumulative_pips - max_cumulative
+        drawdown = cumulative_pips - np.maximum.accumulate(cumulative_pips)
         max_drawdown = drawdown.min()
-        
-        # 시간대별 분석
-        df_trades['entry_hour'] = df_trades['entry_time'].dt.hour
-        hourly_stats = df_trades.groupby('entry_hour').agg({
-            'net_pips': ['count', 'sum', 'mean'],
-            'profit_loss': lambda x: (x == 'WIN').sum() / len(x) * 100
-        }).round(2)
-        
+
+        # 시간대별 분석 (진입 시 기준 bincount, 거래가 있는 시간만)
+        entry_hour = log['entry_time'].astype('datetime64[h]').view(np.int64) % 24
+        hour_count = np.bincount(entry_hour, minlength=24)
+        hour_sum = np.bincount(entry_hour, weights=net_pips, minlength=24)
+        hour_wins = np.bincount(entry_hour, weights=is_win.astype(np.float64), minlength=24)
+        hours = np.flatnonzero(hour_count)
+        self.hourly_stats = pd.DataFrame({
+            'count': hour_count[hours],
+            'sum': hour_sum[hours],
+            'mean': hour_sum[hours] / hour_count[hours],
+            'win_rate_%': hour_wins[hours] / hour_count[hours] * 100,
+        }, index=pd.Index(hours, name='entry_hour')).round(2)
+
         results = {
             'total_trades': total_trades,
             'wins': wins,
@@ -302,18 +800,19 @@ class BacktestEngine:
             'avg_loss_pips': round(avg_loss_pips, 2),
             'risk_reward_ratio': round(rrr, 2),
             'max_drawdown_pips': round(max_drawdown, 2),
-            'tp_trades': len(tp_trades),
-            'sl_trades': len(sl_trades),
-            'timeout_trades': (df_trades['exit_reason'] == 'TIMEOUT').sum(),
-            'avg_bars_held': round(df_trades['bars_held'].mean(), 1)
+            'tp_trades': tp_count,
+            'sl_trades': sl_count,
+            'timeout_trades': int(reason_count[EXIT_TIMEOUT]),
+            'avg_bars_held': round(bars_held.mean(), 1)
         }
-        
+
         # 출력
-        self._print_results(results, df_trades)
-        
+        if self.verbose:
+            self._print_results(results)
+
         return results
-    
-    def _print_results(self, results: Dict, df_trades: pd.DataFrame):
+
+    def _print_results(self, results: Dict):
         """결과 출력"""
         print("\n" + "=" * 80)
         print("📈 PERFORMANCE SUMMARY")
@@ -332,7 +831,7 @@ class BacktestEngine:
     
     def save_trades_csv(self, output_file: str = None):
         """거래 결과 CSV로 저장"""
-        if len(self.trades) == 0:
+        if len(self.trade_log) == 0:
             print("⚠️  No trades to save")
             return
 
@@ -340,27 +839,28 @@ class BacktestEngine:
             symbol = self.strategy.symbol
             output_file = str(Path(BACKTEST_CONFIG["output_dir"]) / f"{symbol}_trades_result.csv")
 
-        df_trades = pd.DataFrame(self.trades)
+        df_trades = self.trade_log.to_frame()
         df_trades.to_csv(output_file, index=False)
         print(f"✓ Trades saved to {output_file}")
 
     def plot_equity_curve(self, output_file: str = None):
         """자산 곡선 플롯 (선택)"""
         try:
+            import matplotlib
+            matplotlib.use('Agg')  # 파일 저장 전용 (GUI 백엔드 탐색 생략)
             import matplotlib.pyplot as plt
 
-            if len(self.trades) == 0:
+            if len(self.trade_log) == 0:
                 return
 
             if output_file is None:
                 symbol = self.strategy.symbol
                 output_file = str(Path(BACKTEST_CONFIG["output_dir"]) / f"{symbol}_equity_curve.png")
 
-            df_trades = pd.DataFrame(self.trades)
-            df_trades['cumulative_pips'] = df_trades['net_pips'].cumsum()
+            cumulative_pips = self.trade_log.to_frame()['net_pips'].cumsum()
 
             plt.figure(figsize=(14, 6))
-            plt.plot(df_trades['cumulative_pips'], linewidth=2)
+            plt.plot(cumulative_pips, linewidth=2)
             plt.xlabel('Trade Number')
             plt.ylabel('Cumulative Pips')
             plt.title(f'Equity Curve - {self.strategy.symbol} (Cumulative Net Pips)')
@@ -372,6 +872,94 @@ class BacktestEngine:
             print("⚠️  Matplotlib not available for plotting")
 
 
+SYMBOL_CHOICES = ["EURUSD", "USDJPY", "EURJPY", "XAUUSD"]
+
+
+def run_single(
+    symbol: str,
+    source: str = "csv",
+    start: str = None,
+    end: str = None,
+    use_compositor: bool = False,
+    strategy_kwargs: Dict = None,
+    verbose: bool = True,
+    print_trades: bool = False,
+    plot: bool = False,
+) -> Optional[Dict]:
+    """
+    단일 심볼 백테스트 (데이터 로드 → 실행 → 결과 저장)
+
+    다중 심볼 병렬 실행 시 워커 프로세스에서 호출되므로 DB 연결도 이 안에서 생성
+
+    Args:
+        plot: 자산 곡선 PNG 저장 여부 (기본 생략, CSV만 저장)
+
+    Returns:
+        성과 분석 결과 (데이터 없음 시 None)
+    """
+    strategy_kwargs = strategy_kwargs or {}
+
+    # 전략 초기화 (compositor 또는 기본 전략)
+    if use_compositor:
+        from signal_compositor import SignalCompositor
+        strategy = SignalCompositor(symbol=symbol, **strategy_kwargs)
+        mode = f"SignalCompositor (threshold={strategy.threshold})"
+    else:
+        strategy = OrderBlockFVGStrategy(symbol=symbol, **strategy_kwargs)
+        mode = "OB+FVG only"
+
+    if verbose:
+        print(f"Mode: {mode}")
+        print(f"Symbol: {symbol} | RR: {strategy.strategy.risk_reward_ratio if hasattr(strategy, 'strategy') else strategy.risk_reward_ratio}"
+              f" | SL: {strategy.strategy.sl_timeframe if hasattr(strategy, 'strategy') else strategy.sl_timeframe}")
+
+    # 백테스팅 엔진
+    engine = BacktestEngine(strategy, verbose=verbose, print_trades=print_trades)
+
+    if source == "db":
+        # PostgreSQL에서 데이터 로드
+        from db import Database
+        db = Database()
+
+        start_dt = datetime.strptime(start, "%Y-%m-%d") if start else None
+        end_dt = datetime.strptime(end, "%Y-%m-%d") if end else None
+
+        if verbose:
+            print(f"Loading {symbol} from PostgreSQL...")
+            if start:
+                print(f"  Start: {start}")
+            if end:
+                print(f"  End: {end}")
+
+        m1_df = db.query_ohlcv(symbol, start=start_dt, end=end_dt)
+
+        if len(m1_df) == 0:
+            print(f"[{symbol}] No data found in DB. Run init_db.py --import-csv or fetch_histdata.py first.")
+            return None
+
+        # DB 데이터를 DataFrame으로 직접 전달 (CSV 중간 저장 불필요)
+        results = engine.run_backtest(m1_df)
+
+    else:
+        # CSV 파일에서 데이터 로드 (기존 동작)
+        data_file = str(Path(BACKTEST_CONFIG["data_dir"]) / f"{symbol}_M1_data.csv")
+
+        if not Path(data_file).exists():
+            print(f"Data file not found: {data_file}")
+            print(f"\nUse: python fetch_mt5_data.py --symbol {symbol} --months 3")
+            print(f"Or:  python backtest_ob_fvg.py --symbol {symbol} --source db")
+            return None
+
+        results = engine.run_backtest(data_file)
+
+    # 결과 저장
+    engine.save_trades_csv()
+    if plot:
+        engine.plot_equity_curve()
+
+    return results
+
+
 def main():
     """메인 실행 함수"""
 
@@ -380,9 +968,15 @@ def main():
         "--symbol",
         type=str,
         default="EURUSD",
-        choices=["EURUSD", "USDJPY", "EURJPY", "XAUUSD"],
+        choices=SYMBOL_CHOICES,
         help="거래 심볼 (기본: EURUSD)"
     )
+    parser.add_argument(
+        "--symbols",
+        type=str,
+        default=None,
+        help="다중 심볼 병렬 실행 (쉼표 구분, 예: EURUSD,USDJPY). 지정 시 --symbol 무시"
+    )
     parser.add_argument(
         "--source",
         type=str,
@@ -395,8 +989,9 @@ def main():
     parser.add_argument("--compositor", action="store_true", help="SignalCompositor 사용")
     parser.add_argument("--rr", type=float, default=None, help="손익비 오버라이드")
     parser.add_argument("--sl-tf", type=str, default=None, choices=["M1", "M15"], help="SL 타임프레임 오버라이드")
+    parser.add_argument("--verbose", action="store_true", help="거래별 ENTRY/EXIT 출력")
+    parser.add_argument("--plot", action="store_true", help="자산 곡선 PNG 저장")
     args = parser.parse_args()
-    SYMBOL = args.symbol
 
     # 전략 파라미터 오버라이드
     strategy_kwargs = {}
@@ -405,88 +1000,61 @@ def main():
     if args.sl_tf is not None:
         strategy_kwargs['sl_timeframe'] = args.sl_tf
 
-    # 전략 초기화 (compositor 또는 기본 전략)
-    if args.compositor:
-        from signal_compositor import SignalCompositor
-        strategy = SignalCompositor(symbol=SYMBOL, **strategy_kwargs)
-        print(f"Mode: SignalCompositor (threshold={strategy.threshold})")
-    else:
-        strategy = OrderBlockFVGStrategy(symbol=SYMBOL, **strategy_kwargs)
-        print(f"Mode: OB+FVG only")
-
-    print(f"Symbol: {SYMBOL} | RR: {strategy.strategy.risk_reward_ratio if hasattr(strategy, 'strategy') else strategy.risk_reward_ratio}"
-          f" | SL: {strategy.strategy.sl_timeframe if hasattr(strategy, 'strategy') else strategy.sl_timeframe}")
-
-    # 백테스팅 엔진
-    engine = BacktestEngine(strategy)
-
-    if args.source == "db":
-        # PostgreSQL에서 데이터 로드
-        from db import Database
-        db = Database()
+    symbols = [args.symbol]
+    if args.symbols:
+        symbols = list(dict.fromkeys(s.strip().upper() for s in args.symbols.split(',') if s.strip()))
+        invalid = [s for s in symbols if s not in SYMBOL_CHOICES]
+        if invalid or not symbols:
+            parser.error(f"--symbols: 지원하지 않는 심볼 {invalid} (선택: {', '.join(SYMBOL_CHOICES)})")
 
-        start = datetime.strptime(args.start, "%Y-%m-%d") if args.start else None
-        end = datetime.strptime(args.end, "%Y-%m-%d") if args.end else None
-
-        print(f"Loading {SYMBOL} from PostgreSQL...")
-        if start:
-            print(f"  Start: {args.start}")
-        if end:
-            print(f"  End: {args.end}")
-
-        m1_df = db.query_ohlcv(SYMBOL, start=start, end=end)
+    run_kwargs = dict(
+        source=args.source, start=args.start, end=args.end,
+        use_compositor=args.compositor, strategy_kwargs=strategy_kwargs, plot=args.plot,
+    )
 
-        if len(m1_df) == 0:
-            print("No data found in DB. Run init_db.py --import-csv or fetch_histdata.py first.")
+    if len(symbols) == 1:
+        if run_single(symbols[0], print_trades=args.verbose, **run_kwargs) is None:
             return
-
-        # DB 데이터를 DataFrame으로 직접 전달 (CSV 중간 저장 불필요)
-        results = engine.run_backtest(m1_df)
-
-    else:
-        # CSV 파일에서 데이터 로드 (기존 동작)
-        data_file = str(Path(BACKTEST_CONFIG["data_dir"]) / f"{SYMBOL}_M1_data.csv")
-
-        if not Path(data_file).exists():
-            print(f"Data file not found: {data_file}")
-            print(f"\nUse: python fetch_mt5_data.py --symbol {SYMBOL} --months 3")
-            print(f"Or:  python backtest_ob_fvg.py --symbol {SYMBOL} --source db")
-            return
-
-        results = engine.run_backtest(data_file)
-
-    # 결과 저장
-    engine.save_trades_csv()
-    engine.plot_equity_curve()
-
+        print("\n✓ Backtest completed!")
+        return
+
+    # 심볼별 독립 백테스트 → 프로세스 병렬 실행 (워커별 DB 연결, 거래별 출력 생략)
+    print(f"Running {len(symbols)} symbols in parallel: {', '.join(symbols)}")
+    summary = {}
+    with ProcessPoolExecutor(max_workers=min(len(symbols), os.cpu_count() or 1)) as ex:
+        futures = {ex.submit(run_single, s, verbose=False, **run_kwargs): s for s in symbols}
+        for future in as_completed(futures):
+            symbol = futures[future]
+            results = future.result()
+            summary[symbol] = results or {}
+            print(f"✓ {symbol} done | trades: {summary[symbol].get('total_trades', 0)}")
+
+    # 심볼별 요약 (요청 순서)
+    df_summary = pd.DataFrame.from_dict({s: summary[s] for s in symbols}, orient='index')
+    print("\n" + "=" * 80)
+    print("SUMMARY BY SYMBOL")
+    print("=" * 80)
+    print(df_summary.to_string() if not df_summary.empty else "⚠️  No trades executed")
     print("\n✓ Backtest completed!")
 
 
 def create_sample_data(bars: int = 1000) -> pd.DataFrame:
-    """테스트용 샘플 데이터 생성"""
-    times = pd.date_range('2024-01-01', periods=bars, freq='1min')
-    
-    np.random.seed(42)
-    prices = 1.0800 + np.cumsum(np.random.randn(bars) * 0.00005)
-    
-    data = []
-    for i, t in enumerate(times):
-        open_price = prices[i]
-        close_price = prices[i] + np.random.randn() * 0.00003
-        high_price = max(open_price, close_price) + abs(np.random.randn()) * 0.00005
-        low_price = min(open_price, close_price) - abs(np.random.randn()) * 0.00005
-        volume = np.random.randint(100, 1000)
-        
-        data.append({
-            'time': t,
-            'open': open_price,
-            'high': high_price,
-            'low': low_price,
-            'close': close_price,
-            'tick_volume': volume
-        })
-    
-    return pd.DataFrame(data)
+    """테스트용 샘플 데이터 생성 (컬럼 단위 벡터 생성)"""
+    rng = np.random.default_rng(42)
+
+    open_price = 1.0800 + np.cumsum(rng.standard_normal(bars) * 0.00005)
+    close_price = open_price + rng.standard_normal(bars) * 0.00003
+    high_price = np.maximum(open_price, close_price) + np.abs(rng.standard_normal(bars)) * 0.00005
+    low_price = np.minimum(open_price, close_price) - np.abs(rng.standard_normal(bars)) * 0.00005
+
+    return pd.DataFrame({
+        'time': pd.date_range('2024-01-01', periods=bars, freq='1min'),
+        'open': open_price,
+        'high': high_price,
+        'low': low_price,
+        'close': close_price,
+        'tick_volume': rng.integers(100, 1000, size=bars),
+    })
 
 
 if __name__ == '__main__':
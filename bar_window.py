@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+"""
+OHLC 바 윈도우 뷰 + M15 바 단위 신호 캐시
+
+백테스트 루프에서 매 바마다 DataFrame.iloc 슬라이스를 만드는 대신
+미리 추출한 컬럼 배열 위의 [start, stop) 구간만 가리키는 경량 뷰를 전달.
+
+전략/감지 모듈은 bars['col'] + len(bars) 만 사용하므로
+DataFrame (실시간 트레이더)과 BarWindow (백테스트) 모두 그대로 동작.
+"""
+
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+
+class BarWindow:
+    """컬럼 배열의 고정 구간 뷰 (복사 없음)"""
+
+    __slots__ = ('_columns', '_start', '_stop')
+
+    def __init__(self, columns: Dict[str, np.ndarray], start: int, stop: int):
+        """
+        Args:
+            columns: 컬럼명 → 전체 구간 numpy 배열 (time, open, high, low, close ...)
+            start: 윈도우 시작 인덱스 (포함)
+            stop: 윈도우 끝 인덱스 (제외)
+        """
+        self._columns = columns
+        self._start = start
+        self._stop = stop
+
+    def __len__(self) -> int:
+        return self._stop - self._start
+
+    def __getitem__(self, col: str) -> np.ndarray:
+        return self._columns[col][self._start:self._stop]
+
+    def span(self) -> Tuple[Dict[str, np.ndarray], int, int]:
+        """(원본 컬럼 dict, start, stop) — 같은 원본 위의 이전 윈도우와 겹침 판정용"""
+        return self._columns, self._start, self._stop
+
+
+# 전략 모듈 입력 타입 (DataFrame 또는 BarWindow)
+Bars = Union[pd.DataFrame, BarWindow]
+
+
+def frame_columns(df: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """
+    DataFrame → 컬럼별 읽기 전용 numpy 배열 (BarWindow 원본용, 1회 추출)
+
+    BarWindow는 복사 없이 원본 구간을 가리키므로 전략/감지 모듈이 윈도우를 수정하면
+    전체 데이터가 오염됨 → 쓰기 금지 뷰로 만들어 수정 시 즉시 ValueError 발생
+    """
+    columns = {}
+    for col in df.columns:
+        arr = df[col].to_numpy().view()  # 별도 뷰 객체 (DataFrame 내부 배열 플래그는 유지)
+        arr.setflags(write=False)
+        columns[col] = arr
+    return columns
+
+
+class IncrementalSignalCache:
+    """
+    M15 바 단위 신호 컨텍스트 캐시
+
+    OB/BOS/CHoCH/유동성 풀은 M15 윈도우에만 의존하므로 M15 바가 바뀔 때만 계산하고,
+    같은 M15 바 안의 M1 바들은 캐시된 결과에 M1 진입 조건만 다시 확인.
+    """
+
+    __slots__ = ('m15_idx', 'context')
+
+    def __init__(self):
+        self.m15_idx = -1
+        self.context: Dict[str, Any] = {}
+
+    def get(self, m15_idx: int) -> Dict[str, Any]:
+        """m15_idx의 컨텍스트 dict (M15 바가 바뀌면 비운 새 dict)"""
+        if m15_idx != self.m15_idx:
+            self.m15_idx = m15_idx
+            self.context = {}
+        return self.context
+
+
+def cache_lookup(context: Optional[Dict[str, Any]], key: str, compute: Callable[[], Any]) -> Any:
+    """컨텍스트에 key가 없을 때만 compute() 실행 (context=None이면 매번 계산)"""
+    if context is None:
+        return compute()
+    if key not in context:
+        context[key] = compute()
+    return context[key]
+
+
+def window_key(bars: Bars) -> Tuple[Any, ...]:
+    """
+    감지 결과 캐시용 윈도우 식별 키: (길이, 마지막 바 시각/high/low)
+
+    같은 시각이라도 미완성 바는 high/low가 계속 바뀌고 스윙/스윕 판정에 영향 → 키에 포함
+    """
+    n = len(bars)
+    if n == 0:
+        return (0,)
+    return (
+        n,
+        np.asarray(bars['time'])[-1],
+        float(np.asarray(bars['high'])[-1]),
+        float(np.asarray(bars['low'])[-1]),
+    )
@@ -58,6 +58,9 @@ STRATEGY_DEFAULTS = {
     },
 }
 
+# 거래 허용 시간 24비트 마스크 (bit h = h시 허용, (mask >> hour) & 1 로 판정)
+ALLOWED_HOURS_MASK = sum(1 << h for h in STRATEGY_DEFAULTS["allowed_hours"])
+
 # 백테스트 설정
 BACKTEST_CONFIG = {
     "data_dir": "./data",
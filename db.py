@@ -7,10 +7,12 @@ OHLCV 시계열 데이터 저장/조회, 거래 기록 관리
 
 import os
 import sys
-from io import StringIO
+from io import BytesIO
+from contextlib import contextmanager
 from datetime import datetime
 from typing import Optional, Tuple, List, Dict
 
+import numpy as np
 import pandas as pd
 import psycopg2
 from psycopg2 import extras
@@ -42,17 +44,20 @@ CREATE TABLE IF NOT EXISTS symbols (
 CREATE TABLE IF NOT EXISTS ohlcv_m1 (
     time            TIMESTAMPTZ NOT NULL,
     symbol_id       INTEGER NOT NULL REFERENCES symbols(id),
-    open            NUMERIC(12,6) NOT NULL,
-    high            NUMERIC(12,6) NOT NULL,
-    low             NUMERIC(12,6) NOT NULL,
-    close           NUMERIC(12,6) NOT NULL,
+    open            DOUBLE PRECISION NOT NULL,
+    high            DOUBLE PRECISION NOT NULL,
+    low             DOUBLE PRECISION NOT NULL,
+    close           DOUBLE PRECISION NOT NULL,
     tick_volume     INTEGER DEFAULT 0,
     source          VARCHAR(20) DEFAULT 'mt5',
     PRIMARY KEY (symbol_id, time)
 );
 
-CREATE INDEX IF NOT EXISTS idx_ohlcv_m1_time
-    ON ohlcv_m1 (time);
+-- 시간순 적재 테이블: B-tree 대신 BRIN (블록 범위별 min/max만 저장 → 인덱스 크기/COPY 유지 비용 최소)
+-- 심볼별 구간 조회는 PK (symbol_id, time)가 담당
+DROP INDEX IF EXISTS idx_ohlcv_m1_time;
+CREATE INDEX IF NOT EXISTS idx_ohlcv_m1_time_brin
+    ON ohlcv_m1 USING BRIN (time) WITH (pages_per_range = 32);
 
 CREATE TABLE IF NOT EXISTS trades (
     id              SERIAL PRIMARY KEY,
@@ -60,13 +65,13 @@ CREATE TABLE IF NOT EXISTS trades (
     session_id      VARCHAR(50) NOT NULL,
     session_type    VARCHAR(10) NOT NULL,
     entry_time      TIMESTAMPTZ NOT NULL,
-    entry_price     NUMERIC(12,6) NOT NULL,
+    entry_price     DOUBLE PRECISION NOT NULL,
     direction       VARCHAR(4) NOT NULL,
-    stop_loss       NUMERIC(12,6) NOT NULL,
-    take_profit     NUMERIC(12,6) NOT NULL,
+    stop_loss       DOUBLE PRECISION NOT NULL,
+    take_profit     DOUBLE PRECISION NOT NULL,
     risk_pips       NUMERIC(10,2) NOT NULL,
     exit_time       TIMESTAMPTZ,
-    exit_price      NUMERIC(12,6),
+    exit_price      DOUBLE PRECISION,
     exit_reason     VARCHAR(10),
     bars_held       INTEGER,
     gross_pips      NUMERIC(10,2),
@@ -97,9 +102,129 @@ CREATE TABLE IF NOT EXISTS backtest_sessions (
 );
 """
 
+# 기존 DB 마이그레이션: NUMERIC(12,6) 가격 컬럼 → DOUBLE PRECISION (고정 8바이트, 빠른 디코딩)
+PRICE_COLUMNS = {
+    "ohlcv_m1": ["open", "high", "low", "close"],
+    "trades": ["entry_price", "stop_loss", "take_profit", "exit_price"],
+}
+
+# bulk_insert_ohlcv 중복 제거용 staging 테이블 (UNLOGGED: WAL 기록 없음, 청크 간 재사용,
+# 청크마다 TRUNCATE되므로 autovacuum 불필요)
+STAGE_OHLCV_SQL = """
+CREATE UNLOGGED TABLE IF NOT EXISTS _stage_ohlcv (
+    time            TIMESTAMPTZ,
+    open            DOUBLE PRECISION,
+    high            DOUBLE PRECISION,
+    low             DOUBLE PRECISION,
+    close           DOUBLE PRECISION,
+    tick_volume     INTEGER,
+    source          VARCHAR(20)
+) WITH (autovacuum_enabled = false)
+"""
+
+# TimescaleDB (설치된 서버에서만 적용): ohlcv_m1을 7일 청크 hypertable로 변환
+OHLCV_CHUNK_INTERVAL = "7 days"
+
+
+# ──────────────────────────────────────────────
+# COPY BINARY 직렬화
+# ──────────────────────────────────────────────
+
+PGCOPY_HEADER = b"PGCOPY\n\xff\r\n\x00" + np.zeros(2, ">i4").tobytes()  # 시그니처 + flags + 확장 길이
+PGCOPY_TRAILER = np.array(-1, ">i2").tobytes()
+PG_EPOCH = np.datetime64("2000-01-01T00:00:00", "us")  # TIMESTAMPTZ 바이너리 기준 시각 (UTC)
+
+
+def ohlcv_copy_binary(df: pd.DataFrame, source: str, symbol_id: int = None) -> BytesIO:
+    """
+    OHLCV DataFrame → COPY ... (FORMAT BINARY) 스트림
+
+    행마다 필드 길이가 고정 (time int64 µs, OHLC float8, tick_volume int4, source 고정 문자열)
+    이므로 big-endian 구조화 배열 한 번으로 전체 행을 직렬화 (서버 측 텍스트→숫자 파싱 없음).
+    naive time은 UTC로 간주 (query_ohlcv 조회 시 UTC 기준으로 되돌림).
+
+    Args:
+        symbol_id: 지정 시 time 다음에 symbol_id (int4) 필드 포함 (ohlcv_m1 직접 COPY용)
+    """
+    source_bytes = source.encode("utf-8")
+    columns = [("time", ">i8")]
+    if symbol_id is not None:
+        columns.append(("symbol_id", ">i4"))
+    columns += [("open", ">f8"), ("high", ">f8"), ("low", ">f8"), ("close", ">f8"),
+                ("tick_volume", ">i4"), ("source", f"S{len(source_bytes)}")]
+
+    fields = [("n_fields", ">i2")]
+    for name, fmt in columns:
+        fields += [(f"{name}_len", ">i4"), (name, fmt)]
+    rows = np.empty(len(df), dtype=np.dtype(fields))
+
+    rows["n_fields"] = len(columns)
+    for name in rows.dtype.names:
+        if name.endswith("_len"):
+            rows[name] = rows.dtype[name[:-4]].itemsize
+
+    times = pd.to_datetime(df["time"])
+    if times.dt.tz is not None:
+        times = times.dt.tz_convert("UTC").dt.tz_localize(None)
+    rows["time"] = (times.to_numpy().astype("datetime64[us]") - PG_EPOCH).astype(np.int64)
+    for col in ["open", "high", "low", "close"]:
+        rows[col] = df[col].to_numpy(dtype=np.float64)
+    if "tick_volume" in df.columns:
+        rows["tick_volume"] = df["tick_volume"].fillna(0).to_numpy(dtype=np.int64)
+    else:
+        rows["tick_volume"] = 0
+    rows["source"] = source_bytes
+    if symbol_id is not None:
+        rows["symbol_id"] = symbol_id
+
+    return BytesIO(PGCOPY_HEADER + rows.tobytes() + PGCOPY_TRAILER)
+
+
+# 이 행 수 미만 청크는 COPY 대신 multi-VALUES INSERT (COPY/staging 고정 비용이 더 큼)
+SMALL_INSERT_ROWS = 5000
+
+
+def ohlcv_rows(df: pd.DataFrame, symbol_id: int, source: str) -> List[tuple]:
+    """OHLCV DataFrame → ohlcv_m1 INSERT 행 튜플 (naive time은 UTC로 간주, COPY 경로와 동일)"""
+    times = pd.to_datetime(df["time"])
+    times = times.dt.tz_convert("UTC") if times.dt.tz is not None else times.dt.tz_localize("UTC")
+    if "tick_volume" in df.columns:
+        volume = df["tick_volume"].fillna(0).astype("int64").tolist()
+    else:
+        volume = [0] * len(df)
+    return list(zip(
+        list(times.dt.to_pydatetime()), [symbol_id] * len(df),
+        df["open"].astype(np.float64).tolist(), df["high"].astype(np.float64).tolist(),
+        df["low"].astype(np.float64).tolist(), df["close"].astype(np.float64).tolist(),
+        volume, [source] * len(df),
+    ))
+
+
+OHLCV_COLUMNS = ["time", "open", "high", "low", "close", "tick_volume"]
+OHLCV_FETCH_SIZE = 50_000  # query_ohlcv 서버 측 cursor 1회 fetch 행 수
+
+
+def _ohlcv_frame(rows: List[tuple]) -> pd.DataFrame:
+    """
+    조회 행 → 타입 보정된 OHLCV DataFrame
+
+    time은 UTC 기준 naive datetime, OHLC는 float64 (미마이그레이션 DB의 Decimal도 변환),
+    tick_volume은 int
+    """
+    df = pd.DataFrame(rows, columns=OHLCV_COLUMNS)
+    df["time"] = pd.to_datetime(df["time"], utc=True).dt.tz_localize(None)
+    df = df.astype({col: np.float64 for col in ["open", "high", "low", "close"]})
+    df["tick_volume"] = df["tick_volume"].astype(int)
+    return df
+
 
 class Database:
-    """PostgreSQL 데이터베이스 연결 및 CRUD"""
+    """
+    PostgreSQL 데이터베이스 연결 및 CRUD
+
+    기본은 메서드 호출마다 연결을 열고 닫음. 여러 번 호출하는 배치 작업은
+    `with db.get_conn():` (또는 `with Database() as db:`) 블록 안에서 한 연결을 공유.
+    """
 
     def __init__(self):
         self.host = os.getenv("DB_HOST", "localhost")
@@ -107,6 +232,8 @@ class Database:
         self.dbname = os.getenv("DB_NAME", "ict_trading")
         self.user = os.getenv("DB_USER", "postgres")
         self.password = os.getenv("DB_PASSWORD", "")
+        self._conn = None  # get_conn 블록 동안 공유하는 연결
+        self._symbol_ids: Dict[str, int] = {}  # 심볼명 → id 캐시
 
     # ── 연결 ──
 
@@ -122,6 +249,46 @@ class Database:
             params["password"] = self.password
         return psycopg2.connect(**params)
 
+    @contextmanager
+    def get_conn(self):
+        """블록 동안 모든 메서드가 공유하는 연결 (중첩 시 바깥 연결 재사용, 종료 시 close)"""
+        if self._conn is not None:
+            yield self._conn
+            return
+        self._conn = self.connect()
+        try:
+            yield self._conn
+        finally:
+            self._conn.close()
+            self._conn = None
+
+    def __enter__(self):
+        self._session = self.get_conn()
+        self._session.__enter__()
+        return self
+
+    def __exit__(self, *exc):
+        return self._session.__exit__(*exc)
+
+    @contextmanager
+    def _connection(self, conn=None):
+        """
+        메서드용 연결 선택: 인자 conn > 공유 연결 > 새 연결 (사용 후 close)
+
+        `with conn:` 블록은 트랜잭션 단위 (정상 종료 시 commit, 예외 시 rollback, 연결은 유지)
+        """
+        conn = conn if conn is not None else self._conn
+        if conn is not None:
+            with conn:
+                yield conn
+            return
+        conn = self.connect()
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
     # ── 스키마 초기화 ──
 
     def create_database(self):
@@ -141,105 +308,177 @@ class Database:
         conn.close()
 
     def init_schema(self):
-        """테이블 생성"""
+        """테이블 생성 (기존 NUMERIC 가격 컬럼은 DOUBLE PRECISION으로 변환)"""
         with self.connect() as conn:
             with conn.cursor() as cur:
                 cur.execute(SCHEMA_SQL)
+                migrated = self._migrate_price_columns(cur)
+                hypertable = self._enable_hypertable(cur)
             conn.commit()
         print("Schema initialized (4 tables).")
+        if migrated:
+            print(f"Price columns migrated to DOUBLE PRECISION: {migrated}")
+        if hypertable:
+            print(f"ohlcv_m1: TimescaleDB hypertable (chunk {OHLCV_CHUNK_INTERVAL})")
+        else:
+            print("ohlcv_m1: TimescaleDB not available, using a plain table")
+
+    @staticmethod
+    def _enable_hypertable(cur) -> bool:
+        """
+        TimescaleDB가 서버에 설치되어 있으면 ohlcv_m1을 hypertable로 변환 (없으면 일반 테이블 유지)
+
+        시간 청크 단위로 인덱스/힙이 나뉘어 테이블이 커져도 삽입·구간 조회 속도가 유지됨.
+        """
+        cur.execute("SELECT 1 FROM pg_available_extensions WHERE name = 'timescaledb'")
+        if cur.fetchone() is None:
+            return False
+
+        cur.execute("CREATE EXTENSION IF NOT EXISTS timescaledb")
+        cur.execute(
+            """
+            SELECT create_hypertable(
+                'ohlcv_m1', 'time',
+                chunk_time_interval => %s::interval,
+                if_not_exists => TRUE,
+                migrate_data => TRUE
+            )
+            """,
+            (OHLCV_CHUNK_INTERVAL,),
+        )
+        cur.execute("SELECT set_chunk_time_interval('ohlcv_m1', %s::interval)", (OHLCV_CHUNK_INTERVAL,))
+        return True
+
+    @staticmethod
+    def _migrate_price_columns(cur) -> List[str]:
+        """아직 NUMERIC인 가격 컬럼만 ALTER (이미 변환된 테이블은 재작성하지 않음)"""
+        migrated = []
+        for table, columns in PRICE_COLUMNS.items():
+            cur.execute(
+                """
+                SELECT column_name FROM information_schema.columns
+                WHERE table_schema = current_schema() AND table_name = %s
+                  AND column_name = ANY(%s) AND data_type = 'numeric'
+                """,
+                (table, columns),
+            )
+            numeric_cols = [row[0] for row in cur.fetchall()]
+            if not numeric_cols:
+                continue
+            # 테이블당 ALTER 1회 (컬럼 여러 개를 한 번의 재작성으로 변환)
+            alters = ", ".join(
+                f"ALTER COLUMN {col} TYPE DOUBLE PRECISION USING {col}::double precision"
+                for col in numeric_cols
+            )
+            cur.execute(f"ALTER TABLE {table} {alters}")
+            migrated += [f"{table}.{col}" for col in numeric_cols]
+        return migrated
 
     def seed_symbols(self):
         """config.py의 SYMBOLS를 DB에 삽입"""
         with self.connect() as conn:
             with conn.cursor() as cur:
-                for name, cfg in SYMBOLS.items():
-                    cur.execute(
-                        """
-                        INSERT INTO symbols (name, pip_size, spread_pips, commission_pips, sl_buffer)
-                        VALUES (%s, %s, %s, %s, %s)
-                        ON CONFLICT (name) DO UPDATE SET
-                            pip_size = EXCLUDED.pip_size,
-                            spread_pips = EXCLUDED.spread_pips,
-                            commission_pips = EXCLUDED.commission_pips,
-                            sl_buffer = EXCLUDED.sl_buffer
-                        """,
-                        (
-                            name,
-                            cfg["pip_size"],
-                            cfg["spread_pips"],
-                            cfg["commission_pips"],
-                            cfg["sl_buffer_pips"],
-                        ),
+                rows = [
+                    (
+                        name,
+                        cfg["pip_size"],
+                        cfg["spread_pips"],
+                        cfg["commission_pips"],
+                        cfg["sl_buffer_pips"],
                     )
+                    for name, cfg in SYMBOLS.items()
+                ]
+                extras.execute_values(
+                    cur,
+                    """
+                    INSERT INTO symbols (name, pip_size, spread_pips, commission_pips, sl_buffer)
+                    VALUES %s
+                    ON CONFLICT (name) DO UPDATE SET
+                        pip_size = EXCLUDED.pip_size,
+                        spread_pips = EXCLUDED.spread_pips,
+                        commission_pips = EXCLUDED.commission_pips,
+                        sl_buffer = EXCLUDED.sl_buffer
+                    """,
+                    rows,
+                )
             conn.commit()
         print(f"Symbols seeded: {list(SYMBOLS.keys())}")
 
     # ── 심볼 조회 ──
 
-    def get_symbol_id(self, symbol: str) -> int:
-        with self.connect() as conn:
-            with conn.cursor() as cur:
-                cur.execute("SELECT id FROM symbols WHERE name = %s", (symbol,))
-                row = cur.fetchone()
-                if row is None:
-                    raise ValueError(f"Symbol '{symbol}' not found in DB")
-                return row[0]
+    def get_symbol_id(self, symbol: str, conn=None) -> int:
+        """심볼 id (인스턴스 캐시, 첫 조회 시 전체 심볼을 한 번에 로드)"""
+        if symbol not in self._symbol_ids:
+            with self._connection(conn) as conn:
+                with conn.cursor() as cur:
+                    cur.execute("SELECT name, id FROM symbols")
+                    self._symbol_ids.update(cur.fetchall())
+        if symbol not in self._symbol_ids:
+            raise ValueError(f"Symbol '{symbol}' not found in DB")
+        return self._symbol_ids[symbol]
 
     # ── OHLCV 데이터 ──
 
     def bulk_insert_ohlcv(
-        self, df: pd.DataFrame, symbol: str, source: str = "mt5"
+        self, df: pd.DataFrame, symbol: str, source: str = "mt5", dedup: bool = True, conn=None
     ) -> int:
         """
-        COPY 프로토콜로 OHLCV 대량 삽입.
-        중복 키는 무시 (ON CONFLICT DO NOTHING via temp table).
+        COPY 프로토콜 (FORMAT BINARY)로 OHLCV 대량 삽입.
+        SMALL_INSERT_ROWS 미만 청크는 multi-VALUES INSERT ... ON CONFLICT DO NOTHING 한 문장으로 삽입.
+
+        Args:
+            dedup: True면 중복 키 무시 (staging 테이블 COPY → INSERT ... ON CONFLICT DO NOTHING),
+                   False면 ohlcv_m1에 바로 COPY (중복 없는 빈 구간 백필용, 중복 시 전체 청크 실패)
 
         Returns: 삽입된 행 수
         """
-        symbol_id = self.get_symbol_id(symbol)
+        symbol_id = self.get_symbol_id(symbol, conn)
 
-        # 임시 테이블 → COPY → INSERT ... ON CONFLICT
-        with self.connect() as conn:
+        with self._connection(conn) as conn:
             with conn.cursor() as cur:
-                cur.execute(
-                    """
-                    CREATE TEMP TABLE _tmp_ohlcv (
-                        time TIMESTAMPTZ,
-                        open NUMERIC(12,6),
-                        high NUMERIC(12,6),
-                        low  NUMERIC(12,6),
-                        close NUMERIC(12,6),
-                        tick_volume INTEGER,
-                        source VARCHAR(20)
-                    ) ON COMMIT DROP
-                    """
-                )
-
-                # DataFrame → TSV buffer
-                buf = StringIO()
-                for _, row in df.iterrows():
-                    buf.write(
-                        f"{row['time']}\t{row['open']}\t{row['high']}\t"
-                        f"{row['low']}\t{row['close']}\t"
-                        f"{int(row.get('tick_volume', 0))}\t{source}\n"
+                # 이 트랜잭션만 WAL fsync를 기다리지 않고 커밋 (재실행해도 같은 결과인 적재라
+                # 장애 시 마지막 몇 청크 유실 위험만 감수, 다른 쓰기의 내구성은 그대로)
+                cur.execute("SET LOCAL synchronous_commit = off")
+                if len(df) < SMALL_INSERT_ROWS:
+                    # 소량: staging/COPY 없이 한 문장 (page_size ≥ 행 수 → rowcount가 전체 삽입 수)
+                    extras.execute_values(
+                        cur,
+                        """
+                        INSERT INTO ohlcv_m1 (time, symbol_id, open, high, low, close, tick_volume, source)
+                        VALUES %s
+                        ON CONFLICT (symbol_id, time) DO NOTHING
+                        """,
+                        ohlcv_rows(df, symbol_id, source),
+                        page_size=SMALL_INSERT_ROWS,
                     )
-                buf.seek(0)
-
-                cur.copy_expert(
-                    "COPY _tmp_ohlcv (time, open, high, low, close, tick_volume, source) "
-                    "FROM STDIN WITH (FORMAT text)",
-                    buf,
-                )
-
-                cur.execute(
-                    f"""
-                    INSERT INTO ohlcv_m1 (time, symbol_id, open, high, low, close, tick_volume, source)
-                    SELECT time, {symbol_id}, open, high, low, close, tick_volume, source
-                    FROM _tmp_ohlcv
-                    ON CONFLICT (symbol_id, time) DO NOTHING
-                    """
-                )
-                inserted = cur.rowcount
+                    inserted = cur.rowcount
+                elif not dedup:
+                    # staging 없이 1회 COPY (행 복사 1패스)
+                    cur.copy_expert(
+                        "COPY ohlcv_m1 (time, symbol_id, open, high, low, close, tick_volume, source) "
+                        "FROM STDIN WITH (FORMAT BINARY)",
+                        ohlcv_copy_binary(df, source, symbol_id),
+                    )
+                    inserted = cur.rowcount
+                else:
+                    # UNLOGGED staging 테이블 재사용 (청크마다 CREATE/DROP 없이 TRUNCATE, WAL 없음)
+                    # TRUNCATE 잠금은 커밋까지 유지되므로 동시 import는 청크 단위로 직렬화됨
+                    cur.execute(STAGE_OHLCV_SQL)
+                    cur.execute("TRUNCATE _stage_ohlcv")
+                    cur.copy_expert(
+                        "COPY _stage_ohlcv (time, open, high, low, close, tick_volume, source) "
+                        "FROM STDIN WITH (FORMAT BINARY)",
+                        ohlcv_copy_binary(df, source),
+                    )
+                    cur.execute(
+                        f"""
+                        INSERT INTO ohlcv_m1 (time, symbol_id, open, high, low, close, tick_volume, source)
+                        SELECT time, {symbol_id}, open, high, low, close, tick_volume, source
+                        FROM _stage_ohlcv
+                        ON CONFLICT (symbol_id, time) DO NOTHING
+                        """
+                    )
+                    inserted = cur.rowcount
 
             conn.commit()
         return inserted
@@ -249,9 +488,10 @@ class Database:
         symbol: str,
         start: Optional[datetime] = None,
         end: Optional[datetime] = None,
+        conn=None,
     ) -> pd.DataFrame:
         """OHLCV 데이터 조회 → DataFrame"""
-        symbol_id = self.get_symbol_id(symbol)
+        symbol_id = self.get_symbol_id(symbol, conn)
 
         query = """
             SELECT time, open, high, low, close, tick_volume
@@ -269,21 +509,26 @@ class Database:
 
         query += " ORDER BY time"
 
-        with self.connect() as conn:
-            df = pd.read_sql(query, conn, params=params)
-
-        # 컬럼 타입 보정
-        df["time"] = pd.to_datetime(df["time"], utc=True).dt.tz_localize(None)
-        for col in ["open", "high", "low", "close"]:
-            df[col] = df[col].astype(float)
-        df["tick_volume"] = df["tick_volume"].astype(int)
-
-        return df
-
-    def get_ohlcv_date_range(self, symbol: str) -> Tuple[Optional[datetime], Optional[datetime]]:
+        # 서버 측 cursor로 OHLCV_FETCH_SIZE행씩 받아 청크별로 타입 변환 (드라이버 전체 버퍼링 없음)
+        chunks = []
+        with self._connection(conn) as conn:
+            with conn.cursor(name="ohlcv_stream") as cur:
+                cur.itersize = OHLCV_FETCH_SIZE
+                cur.execute(query, params)
+                while True:
+                    rows = cur.fetchmany(OHLCV_FETCH_SIZE)
+                    if not rows:
+                        break
+                    chunks.append(_ohlcv_frame(rows))
+
+        if not chunks:
+            return _ohlcv_frame([])
+        return pd.concat(chunks, ignore_index=True)
+
+    def get_ohlcv_date_range(self, symbol: str, conn=None) -> Tuple[Optional[datetime], Optional[datetime]]:
         """심볼의 데이터 시작/종료 시간"""
-        symbol_id = self.get_symbol_id(symbol)
-        with self.connect() as conn:
+        symbol_id = self.get_symbol_id(symbol, conn)
+        with self._connection(conn) as conn:
             with conn.cursor() as cur:
                 cur.execute(
                     "SELECT MIN(time), MAX(time) FROM ohlcv_m1 WHERE symbol_id = %s",
@@ -291,9 +536,9 @@ class Database:
                 )
                 return cur.fetchone()
 
-    def count_ohlcv(self, symbol: str) -> int:
-        symbol_id = self.get_symbol_id(symbol)
-        with self.connect() as conn:
+    def count_ohlcv(self, symbol: str, conn=None) -> int:
+        symbol_id = self.get_symbol_id(symbol, conn)
+        with self._connection(conn) as conn:
             with conn.cursor() as cur:
                 cur.execute(
                     "SELECT COUNT(*) FROM ohlcv_m1 WHERE symbol_id = %s",
@@ -310,43 +555,42 @@ class Database:
         symbol: str,
         session_type: str = "backtest",
         strategy_params: Optional[Dict] = None,
+        conn=None,
     ):
-        """거래 목록을 DB에 저장"""
-        symbol_id = self.get_symbol_id(symbol)
+        """거래 목록을 DB에 저장 (multi-VALUES INSERT, 1000건당 1회 왕복)"""
+        symbol_id = self.get_symbol_id(symbol, conn)
         import json
 
         params_json = json.dumps(strategy_params) if strategy_params else None
 
-        with self.connect() as conn:
+        with self._connection(conn) as conn:
             with conn.cursor() as cur:
-                for t in trades:
-                    cur.execute(
-                        """
-                        INSERT INTO trades (
-                            symbol_id, session_id, session_type,
-                            entry_time, entry_price, direction,
-                            stop_loss, take_profit, risk_pips,
-                            exit_time, exit_price, exit_reason,
-                            bars_held, gross_pips, net_pips,
-                            profit_loss, strategy_params
-                        ) VALUES (
-                            %s, %s, %s,
-                            %s, %s, %s,
-                            %s, %s, %s,
-                            %s, %s, %s,
-                            %s, %s, %s,
-                            %s, %s
-                        )
-                        """,
-                        (
-                            symbol_id, session_id, session_type,
-                            t.get("entry_time"), t.get("entry_price"), t.get("direction"),
-                            t.get("stop_loss"), t.get("take_profit"), t.get("risk_pips"),
-                            t.get("exit_time"), t.get("exit_price"), t.get("exit_reason"),
-                            t.get("bars_held"), t.get("gross_pips"), t.get("net_pips"),
-                            t.get("profit_loss"), params_json,
-                        ),
+                rows = [
+                    (
+                        symbol_id, session_id, session_type,
+                        t.get("entry_time"), t.get("entry_price"), t.get("direction"),
+                        t.get("stop_loss"), t.get("take_profit"), t.get("risk_pips"),
+                        t.get("exit_time"), t.get("exit_price"), t.get("exit_reason"),
+                        t.get("bars_held"), t.get("gross_pips"), t.get("net_pips"),
+                        t.get("profit_loss"), params_json,
                     )
+                    for t in trades
+                ]
+                extras.execute_values(
+                    cur,
+                    """
+                    INSERT INTO trades (
+                        symbol_id, session_id, session_type,
+                        entry_time, entry_price, direction,
+                        stop_loss, take_profit, risk_pips,
+                        exit_time, exit_price, exit_reason,
+                        bars_held, gross_pips, net_pips,
+                        profit_loss, strategy_params
+                    ) VALUES %s
+                    """,
+                    rows,
+                    page_size=1000,
+                )
             conn.commit()
 
     def save_backtest_session(
@@ -358,13 +602,14 @@ class Database:
         start_time: datetime,
         end_time: datetime,
         data_source: str = "mt5",
+        conn=None,
     ):
         """백테스트 세션 요약 저장"""
         import json
 
-        symbol_id = self.get_symbol_id(symbol)
+        symbol_id = self.get_symbol_id(symbol, conn)
 
-        with self.connect() as conn:
+        with self._connection(conn) as conn:
             with conn.cursor() as cur:
                 cur.execute(
                     """
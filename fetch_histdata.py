@@ -2,16 +2,16 @@
 """
 HistData.com M1 데이터 파이프라인
 
-HistData ZIP → 압축 해제 → EST→UTC 변환 → CSV 정규화 → PostgreSQL import
+HistData ZIP → 압축 해제 → EST→UTC 변환 → Parquet 정규화 → PostgreSQL import
 
 사용법:
-    python fetch_histdata.py --symbol EURUSD --convert      # ZIP → CSV 변환
-    python fetch_histdata.py --symbol EURUSD --import-db    # CSV → PostgreSQL
+    python fetch_histdata.py --symbol EURUSD --convert      # ZIP → Parquet 변환
+    python fetch_histdata.py --symbol EURUSD --import-db    # Parquet → PostgreSQL
     python fetch_histdata.py --symbol EURUSD --all          # 전체 파이프라인
 
 데이터 디렉토리:
     data/histdata_raw/EURUSD/   ← ZIP 파일 (수동 다운로드)
-    data/histdata_csv/          ← 변환된 CSV
+    data/histdata_csv/          ← 변환 결과 (Parquet, pyarrow 없으면 CSV)
 
 HistData.com 포맷:
     구분자: 세미콜론 (;)
@@ -19,11 +19,15 @@ HistData.com 포맷:
     타임존: EST (UTC-5, DST 없음)
 """
 
+import os
 import sys
 import argparse
 import zipfile
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from typing import Optional, Tuple
 
+import numpy as np
 import pandas as pd
 
 if sys.platform == 'win32':
@@ -64,32 +68,119 @@ def parse_histdata_csv(filepath: str) -> pd.DataFrame:
     else:
         return pd.DataFrame(columns=['time', 'open', 'high', 'low', 'close', 'tick_volume'])
 
-    # 비데이터 행 제거 (저작권 행 등)
-    df = df[df['datetime'].str.strip().str.match(r'^\d{8}\s+\d{6}$', na=False)]
-
-    # datetime 파싱: "20120201 000000" → datetime
-    df['time'] = pd.to_datetime(df['datetime'].str.strip(), format='%Y%m%d %H%M%S')
-
-    # 숫자 컬럼 변환
-    for col in ['open', 'high', 'low', 'close']:
-        df[col] = pd.to_numeric(df[col], errors='coerce')
-    df['volume'] = pd.to_numeric(df['volume'], errors='coerce').fillna(0).astype(int)
+    # 비데이터 행 제거 (저작권 행 등) + 날짜/시각 정수 분리를 한 번에 (행별 정규식 없음)
+    ymd, hms, valid = _split_stamp(df['datetime'].str.strip())
+    df = df[valid]
 
+    # datetime 파싱: "20120201 000000" → datetime64 (문자열 포맷 파싱 대신 정수 산술)
     # EST → UTC 변환 (EST = UTC-5, HistData는 DST 없음)
-    df['time'] = df['time'] + pd.Timedelta(hours=5)
-
-    # 컬럼 정리
-    df.rename(columns={'volume': 'tick_volume'}, inplace=True)
-    df = df[['time', 'open', 'high', 'low', 'close', 'tick_volume']]
+    time = _stamp_to_datetime(ymd[valid], hms[valid]) + np.timedelta64(5, 'h')
+
+    # 숫자 컬럼 변환 (정상 파일은 astype 한 번, 깨진 값이 있으면 NaN 처리)
+    prices = df[['open', 'high', 'low', 'close']]
+    try:
+        prices = prices.astype(np.float64)
+    except ValueError:
+        prices = prices.apply(pd.to_numeric, errors='coerce')
+    volume = pd.to_numeric(df['volume'], errors='coerce').fillna(0).astype(int)
+
+    out = pd.DataFrame({
+        'time': time,
+        'open': prices['open'].to_numpy(),
+        'high': prices['high'].to_numpy(),
+        'low': prices['low'].to_numpy(),
+        'close': prices['close'].to_numpy(),
+        'tick_volume': volume.to_numpy(),
+    })
+
+    # HistData 파일은 보통 시간순 → 정렬 필요할 때만, 파일 내 중복 시간은 첫 행 유지
+    return _sorted_unique(out)
+
+
+def _sorted_unique(df: pd.DataFrame) -> pd.DataFrame:
+    """time 오름차순 + 중복 time 제거 (이미 정렬된 경우 정렬/해시 없이 인접 비교만)"""
+    if not df['time'].is_monotonic_increasing:
+        df = df.sort_values('time', kind='stable')
+    times = df['time'].to_numpy()
+    keep = np.empty(len(times), dtype=bool)
+    keep[:1] = True
+    np.not_equal(times[1:], times[:-1], out=keep[1:])
+    if not keep.all():
+        df = df[keep]
+    return df.reset_index(drop=True)
+
+
+def _split_stamp(stamp: pd.Series) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    'YYYYMMDD HHMMSS' 문자열 → (날짜 정수, 시각 정수, 유효 행 마스크)
 
-    return df.sort_values('time').reset_index(drop=True)
+    정상 행(15자, 공백 1개)은 고정폭 코드포인트 배열에서 숫자 검사와 자릿값 합산을 한 번에 처리.
+    나머지 소수 행만 정규식으로 확인 (탭/다중 공백 구분자 허용, 저작권 행 등은 제외).
+    """
+    n = len(stamp)
+    ymd = np.zeros(n, dtype=np.int64)
+    hms = np.zeros(n, dtype=np.int64)
+    valid = np.zeros(n, dtype=bool)
+
+    fixed = (stamp.str.len() == 15).to_numpy(dtype=bool, na_value=False)
+    if fixed.any():
+        codes = stamp[fixed].to_numpy().astype('U15').view(np.uint32).reshape(-1, 15)
+        digits = codes - np.uint32(ord('0'))  # 숫자가 아니면 언더플로 → 10 이상
+        ok = (digits[:, :8] < 10).all(axis=1) & (codes[:, 8] == ord(' ')) & (digits[:, 9:] < 10).all(axis=1)
+        place = 10 ** np.arange(7, -1, -1, dtype=np.int64)
+        idx = np.flatnonzero(fixed)
+        ymd[idx] = digits[:, :8].astype(np.int64) @ place
+        hms[idx] = digits[:, 9:].astype(np.int64) @ place[2:]
+        valid[idx] = ok
+
+    rest = np.flatnonzero(~valid)
+    if len(rest):
+        other = stamp.iloc[rest]
+        matched = other.str.match(r'^\d{8}\s+\d{6}$', na=False).to_numpy(dtype=bool)
+        if matched.any():
+            other = other[matched]
+            idx = rest[matched]
+            ymd[idx] = other.str[:8].astype(np.int64).to_numpy()
+            hms[idx] = other.str[-6:].astype(np.int64).to_numpy()
+            valid[idx] = True
+
+    # 필드 범위 검사: 월 1~12, 일은 해당 월 일수 이내, 시 < 24, 분/초 < 60
+    # (범위 밖 값이 날짜 연산에서 다음 달/날로 넘어가 가짜 바가 되지 않도록 무효 처리)
+    month = ymd // 100 % 100
+    day = ymd % 100
+    month_ok = (month >= 1) & (month <= 12)
+    months = (ymd // 10000 - 1970) * 12 + (np.where(month_ok, month, 1) - 1)
+    month_start = months.astype('datetime64[M]')
+    days_in_month = ((month_start + 1).astype('datetime64[D]') - month_start.astype('datetime64[D]')).astype(np.int64)
+    valid &= month_ok & (day >= 1) & (day <= days_in_month)
+    valid &= (hms // 10000 < 24) & (hms // 100 % 100 < 60) & (hms % 100 < 60)
+
+    return ymd, hms, valid
+
+
+def _stamp_to_datetime(ymd: np.ndarray, hms: np.ndarray) -> np.ndarray:
+    """YYYYMMDD / HHMMSS 정수 → datetime64[ns]"""
+    months = (ymd // 10000 - 1970) * 12 + (ymd // 100 % 100 - 1)
+    days = months.astype('datetime64[M]').astype('datetime64[D]') + (ymd % 100 - 1)
+    seconds = hms // 10000 * 3600 + hms // 100 % 100 * 60 + hms % 100
+    return (days + seconds.astype('timedelta64[s]')).astype('datetime64[ns]')
+
+
+def _parse_source(source: Tuple[str, Optional[str]]) -> pd.DataFrame:
+    """(ZIP 경로, 멤버명) 또는 (CSV 경로, None) 하나를 파싱 (프로세스 풀 워커용)"""
+    path, member = source
+    if member is None:
+        return parse_histdata_csv(path)
+    with zipfile.ZipFile(path, 'r') as zf:
+        with zf.open(member) as f:
+            return parse_histdata_csv(f)
 
 
 def extract_and_convert(symbol: str) -> str:
     """
-    심볼의 histdata_raw ZIP 파일들을 추출/변환/병합하여 단일 CSV로 저장
+    심볼의 histdata_raw ZIP 파일들을 추출/변환/병합하여 단일 Parquet 파일로 저장
 
-    Returns: 출력 CSV 경로
+    Returns: 출력 파일 경로 (.parquet, pyarrow 없으면 .csv)
     """
     symbol_dir = RAW_DIR / symbol
     if not symbol_dir.exists():
@@ -105,38 +196,47 @@ def extract_and_convert(symbol: str) -> str:
         print(f"No ZIP or CSV files found in {symbol_dir}")
         return None
 
-    all_dfs = []
-
-    # ZIP 파일 처리
+    # 파싱 대상: (ZIP 경로, 멤버명) 또는 (CSV 경로, None)
+    sources = []
     for zf_path in zip_files:
-        print(f"  Extracting: {zf_path.name}")
         with zipfile.ZipFile(zf_path, 'r') as zf:
-            for name in zf.namelist():
-                if name.lower().endswith('.csv') or name.lower().endswith('.txt'):
-                    with zf.open(name) as f:
-                        df = parse_histdata_csv(f)
-                        all_dfs.append(df)
-                        print(f"    {name}: {len(df):,} bars")
-
-    # 이미 추출된 CSV 파일 처리
-    for csv_path in csv_files:
-        print(f"  Parsing: {csv_path.name}")
-        df = parse_histdata_csv(str(csv_path))
-        all_dfs.append(df)
-        print(f"    {csv_path.name}: {len(df):,} bars")
+            sources += [(str(zf_path), name) for name in zf.namelist()
+                        if name.lower().endswith('.csv') or name.lower().endswith('.txt')]
+    sources += [(str(csv_path), None) for csv_path in csv_files]
+
+    # 파일별 파싱은 서로 독립인 CPU 작업 → 프로세스 풀로 병렬 처리 (결과 순서는 입력 순서 유지)
+    workers = min(len(sources), os.cpu_count() or 1)
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as ex:
+            all_dfs = list(ex.map(_parse_source, sources))
+    else:
+        all_dfs = [_parse_source(src) for src in sources]
+
+    for (path, member), df in zip(sources, all_dfs):
+        print(f"  {Path(path).name}{f' / {member}' if member else ''}: {len(df):,} bars")
 
+    # 병합: 파일별 결과는 이미 정렬/중복 제거됨 → 시간 구간이 겹치지 않으면 시작 시각 순으로
+    # 이어 붙이기만 하고 전체 정렬/중복 제거 생략 (겹칠 때만 안정 정렬 + 인접 비교, 먼저 나온 파일의 행 유지)
+    all_dfs = [df for df in all_dfs if len(df)]
     if not all_dfs:
         print("No data extracted")
         return None
-
-    # 병합 + 정렬 + 중복 제거
-    merged = pd.concat(all_dfs, ignore_index=True)
-    merged = merged.sort_values('time').drop_duplicates(subset=['time']).reset_index(drop=True)
-
-    # 저장
+    by_start = sorted(all_dfs, key=lambda df: df['time'].iat[0])
+    disjoint = all(prev['time'].iat[-1] < nxt['time'].iat[0] for prev, nxt in zip(by_start, by_start[1:]))
+    merged = pd.concat(by_start if disjoint else all_dfs, ignore_index=True)
+    all_dfs.clear()  # 파일별 프레임 해제 (병합본과 동시에 유지하지 않음)
+    by_start.clear()
+    if not disjoint:
+        merged = _sorted_unique(merged)
+
+    # 저장: Parquet (타입 보존, import 시 재파싱 없음), pyarrow 없으면 CSV
     CSV_DIR.mkdir(parents=True, exist_ok=True)
-    output_path = CSV_DIR / f"{symbol}_M1_histdata.csv"
-    merged.to_csv(output_path, index=False)
+    output_path = CSV_DIR / f"{symbol}_M1_histdata.parquet"
+    try:
+        merged.to_parquet(output_path, compression='zstd', index=False)
+    except ImportError:
+        output_path = output_path.with_suffix('.csv')
+        merged.to_csv(output_path, index=False)
 
     print(f"\nMerged: {len(merged):,} bars")
     print(f"Range: {merged['time'].iloc[0]} ~ {merged['time'].iloc[-1]}")
@@ -145,40 +245,74 @@ def extract_and_convert(symbol: str) -> str:
     return str(output_path)
 
 
-def import_to_db(symbol: str, csv_path: str = None):
-    """변환된 HistData CSV를 PostgreSQL에 import"""
+def _default_import_path(symbol: str) -> Path:
+    """변환 결과 경로 (.parquet / 레거시 .csv 중 최근 파일, 둘 다 없으면 .parquet)"""
+    candidates = [p for p in (CSV_DIR / f"{symbol}_M1_histdata.parquet",
+                              CSV_DIR / f"{symbol}_M1_histdata.csv") if p.exists()]
+    if not candidates:
+        return CSV_DIR / f"{symbol}_M1_histdata.parquet"
+    return max(candidates, key=lambda p: p.stat().st_mtime)
+
+
+def _read_times(path: Path) -> pd.Series:
+    """time 컬럼만 로드 (중복 검사용)"""
+    if path.suffix == '.parquet':
+        return pd.read_parquet(path, columns=['time'])['time']
+    return pd.read_csv(path, usecols=['time'])['time']
+
+
+def _iter_chunks(path: Path, chunk_size: int):
+    """변환 결과를 chunk_size 행씩 스트리밍 (전체 프레임을 메모리에 올리지 않음)"""
+    if path.suffix == '.parquet':
+        import pyarrow.parquet as pq
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, parse_dates=['time'], chunksize=chunk_size)
+
+
+def import_to_db(symbol: str, data_path: str = None):
+    """변환된 HistData 파일 (Parquet 또는 CSV)을 PostgreSQL에 import"""
     from db import Database
 
-    if csv_path is None:
-        csv_path = str(CSV_DIR / f"{symbol}_M1_histdata.csv")
+    path = Path(data_path) if data_path else _default_import_path(symbol)
 
-    if not Path(csv_path).exists():
-        print(f"CSV not found: {csv_path}")
+    if not path.exists():
+        print(f"File not found: {path}")
         print("Run --convert first.")
         return
 
     db = Database()
 
-    print(f"\nLoading {csv_path}...")
-    df = pd.read_csv(csv_path, parse_dates=['time'])
-    print(f"CSV rows: {len(df):,}")
-
-    # 청크 단위로 삽입 (메모리 효율)
-    chunk_size = 100_000
-    total_inserted = 0
-
-    for i in range(0, len(df), chunk_size):
-        chunk = df.iloc[i:i + chunk_size]
-        inserted = db.bulk_insert_ohlcv(chunk, symbol, source='histdata')
-        total_inserted += inserted
-        print(f"  Chunk {i // chunk_size + 1}: {inserted:,} inserted "
-              f"({i + len(chunk):,}/{len(df):,})")
-
-    total = db.count_ohlcv(symbol)
-    date_range = db.get_ohlcv_date_range(symbol)
-    print(f"\nTotal inserted: {total_inserted:,}")
-    print(f"Total in DB: {total:,}")
-    print(f"Range: {date_range[0]} ~ {date_range[1]}")
+    print(f"\nLoading {path}...")
+    times = _read_times(path)
+    n_rows = len(times)
+    print(f"Rows: {n_rows:,}")
+
+    # 전체 청크가 한 연결을 공유 (청크마다 연결/인증 반복 없음)
+    with db.get_conn():
+        # 심볼 데이터가 없고 파일 시간 중복도 없으면 중복 제거 단계 생략 (ohlcv_m1에 바로 COPY)
+        dedup = db.count_ohlcv(symbol) > 0 or not times.is_unique
+        del times
+        if not dedup:
+            print("Empty symbol table: direct COPY (no dedup)")
+
+        # 청크 단위로 읽으며 삽입 (메모리 효율)
+        chunk_size = 100_000
+        total_inserted = 0
+        done = 0
+
+        for k, chunk in enumerate(_iter_chunks(path, chunk_size), 1):
+            inserted = db.bulk_insert_ohlcv(chunk, symbol, source='histdata', dedup=dedup)
+            total_inserted += inserted
+            done += len(chunk)
+            print(f"  Chunk {k}: {inserted:,} inserted ({done:,}/{n_rows:,})")
+
+        total = db.count_ohlcv(symbol)
+        date_range = db.get_ohlcv_date_range(symbol)
+        print(f"\nTotal inserted: {total_inserted:,}")
+        print(f"Total in DB: {total:,}")
+        print(f"Range: {date_range[0]} ~ {date_range[1]}")
 
 
 def main():
@@ -189,8 +323,8 @@ def main():
         choices=["EURUSD", "USDJPY", "EURJPY", "XAUUSD"],
         help="거래 심볼",
     )
-    parser.add_argument("--convert", action="store_true", help="ZIP → CSV 변환")
-    parser.add_argument("--import-db", action="store_true", help="CSV → PostgreSQL")
+    parser.add_argument("--convert", action="store_true", help="ZIP → Parquet 변환")
+    parser.add_argument("--import-db", action="store_true", help="Parquet(CSV) → PostgreSQL")
     parser.add_argument("--all", action="store_true", help="전체 파이프라인 (convert + import)")
     args = parser.parse_args()
 
@@ -202,18 +336,18 @@ def main():
     print(f"HistData Pipeline: {args.symbol}")
     print("=" * 60)
 
-    csv_path = None
+    data_path = None
 
     if args.convert or args.all:
         print(f"\n[Step 1] Converting HistData ZIPs for {args.symbol}...")
-        csv_path = extract_and_convert(args.symbol)
-        if csv_path is None and args.all:
+        data_path = extract_and_convert(args.symbol)
+        if data_path is None and args.all:
             print("Convert failed. Skipping DB import.")
             return
 
     if args.import_db or args.all:
         print(f"\n[Step 2] Importing to PostgreSQL...")
-        import_to_db(args.symbol, csv_path)
+        import_to_db(args.symbol, data_path)
 
     print("\nDone!")
 
@@ -2,11 +2,12 @@
 """
 MT5 시장 데이터 수집 스크립트
 
-MT5에 연결하여 지정 심볼/기간의 M1 데이터를 CSV로 저장합니다.
+MT5에 연결하여 지정 심볼/기간의 M1 데이터를 CSV (또는 PostgreSQL)로 저장합니다.
 
 사용법:
     python fetch_mt5_data.py --symbol EURUSD --months 3
     python fetch_mt5_data.py --symbol USDJPY --months 6
+    python fetch_mt5_data.py --symbol EURUSD --to-db   # CSV 없이 DB에 바로 저장
     python fetch_mt5_data.py  # 기본값: EURUSD 3개월
 
 주의사항:
@@ -17,9 +18,11 @@ MT5에 연결하여 지정 심볼/기간의 M1 데이터를 CSV로 저장합니
 
 import argparse
 import sys
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
+from typing import Optional
 
+import numpy as np
 import pandas as pd
 
 # Windows 콘솔 UTF-8 출력 설정
@@ -60,13 +63,52 @@ def load_mt5_credentials():
         return None, None, None
 
 
-def fetch_data(symbol: str, months: int = 3) -> bool:
+def fetch_rates_by_pos(mt5, symbol: str, months: int, cutoff: datetime) -> Optional[np.ndarray]:
+    """
+    위치 기반 배치 수집 (copy_rates_range 실패 시 대체 경로, 한 번에 최대 50,000개씩)
+
+    Returns:
+        cutoff 이후 rates 구조화 배열 (현재 미완성 바 포함), 수집 실패 시 None
+    """
+    # forex M1: 주 5일 × 24h × 60min ≈ 7,200 바/주
+    total_needed = int(months * 4.3 * 7200 * 1.2)
+    batch_size = 50000
+
+    batches = []
+    start_pos = 0
+    total_collected = 0
+
+    while start_pos < total_needed + batch_size:
+        batch = mt5.copy_rates_from_pos(symbol, mt5.TIMEFRAME_M1, start_pos, batch_size)
+        if batch is None or len(batch) == 0:
+            break  # 더 이상 데이터 없음
+
+        batches.append(batch)
+        total_collected += len(batch)
+        print(f"   수집: {total_collected:,}개 바...", end='\r')
+
+        if len(batch) < batch_size:
+            break  # 마지막 배치
+        start_pos += batch_size
+
+    print()  # 줄바꿈
+
+    if not batches:
+        return None
+
+    # 최신 구간부터 받았으므로 역순 결합 → 시간 오름차순
+    rates = np.concatenate(batches[::-1])
+    return rates[rates['time'] >= int(cutoff.timestamp())]
+
+
+def fetch_data(symbol: str, months: int = 3, to_db: bool = False) -> bool:
     """
     MT5에서 M1 데이터를 수집하여 CSV로 저장
 
     Args:
         symbol: 거래 심볼 (EURUSD / USDJPY / EURJPY)
         months: 수집 기간 (개월 수)
+        to_db: True면 CSV 대신 PostgreSQL에 바로 삽입 (CSV 쓰기/재파싱 생략)
 
     Returns:
         성공 여부
@@ -115,72 +157,61 @@ def fetch_data(symbol: str, months: int = 3) -> bool:
             return False
         print(f"✓ 심볼 {symbol} 활성화됨")
 
-        # 진단: 소량(10개) 먼저 요청해서 API 연결 확인
-        test = mt5.copy_rates_from_pos(symbol, mt5.TIMEFRAME_M1, 1, 10)
+        # 진단: 소량(10개) 먼저 요청해서 API 연결 확인 (마지막 바 = 현재 미완성 바)
+        test = mt5.copy_rates_from_pos(symbol, mt5.TIMEFRAME_M1, 0, 10)
         if test is None or len(test) == 0:
             print(f"❌ API 진단 실패 (10개 요청): {mt5.last_error()}")
             print("   MT5 Tools → Options → Charts → Max bars in chart 확인 필요")
             return False
         print(f"✓ API 진단 통과 ({len(test)}개 바 수신)")
-
-        # 배치 방식으로 데이터 수집 (한 번에 최대 50,000개씩)
-        # forex M1: 주 5일 × 24h × 60min ≈ 7,200 바/주
-        total_needed = int(months * 4.3 * 7200 * 1.2)
-        batch_size = 50000
-        all_rates = []
-
-        print(f"📅 수집 기간: 최근 {months}개월 (~{total_needed:,}개 바 예상)")
-        print(f"📊 {symbol} M1 데이터 수집 중 (배치 크기: {batch_size:,})...")
-
-        batch_dfs = []  # 배치마다 DataFrame으로 변환하여 저장
-        start_pos = 1   # 현재 미완성 바(0) 제외
-        total_collected = 0
-
-        while start_pos < total_needed + batch_size:
-            batch = mt5.copy_rates_from_pos(
-                symbol,
-                mt5.TIMEFRAME_M1,
-                start_pos,
-                batch_size
-            )
-            if batch is None or len(batch) == 0:
-                break  # 더 이상 데이터 없음
-
-            # numpy structured array → DataFrame (컬럼명 보존)
-            df_batch = pd.DataFrame(batch)
-            batch_dfs.append(df_batch)
-            total_collected += len(batch)
-            print(f"   수집: {total_collected:,}개 바...", end='\r')
-
-            if len(batch) < batch_size:
-                break  # 마지막 배치
-            start_pos += batch_size
-
-        print()  # 줄바꿈
-
-        if not batch_dfs:
+        forming_time = test['time'][-1]
+
+        # 기간 지정 1회 요청 (필요 구간만 수신, 배치 반복/후처리 필터 없음)
+        now = datetime.now(timezone.utc)
+        cutoff = now - timedelta(days=months * 30)
+        print(f"📅 수집 기간: 최근 {months}개월 ({cutoff.strftime('%Y-%m-%d')} ~)")
+        print(f"📊 {symbol} M1 데이터 수집 중...")
+
+        # 바 time은 브로커 서버 시간(보통 UTC+2/+3) 기준 → 상한을 now로 두면 최근 몇 시간이 잘림.
+        # 어떤 오프셋보다 넉넉한 상한으로 요청하고, 미완성 바는 아래 forming_time 필터로만 제외
+        rates = mt5.copy_rates_range(symbol, mt5.TIMEFRAME_M1, cutoff, now + timedelta(days=1))
+        if rates is None or len(rates) == 0:
+            print(f"⚠️  copy_rates_range 실패 ({mt5.last_error()}) → 위치 기반 배치 수집")
+            rates = fetch_rates_by_pos(mt5, symbol, months, cutoff)
+
+        if rates is None or len(rates) == 0:
             print(f"❌ 데이터 수집 실패: {mt5.last_error()}")
             return False
 
-        # 배치 합치기 및 기간 필터링
-        df_raw = pd.concat(batch_dfs, ignore_index=True)
-        df_raw['time'] = pd.to_datetime(df_raw['time'], unit='s')
-        cutoff = datetime.utcnow() - timedelta(days=months * 30)
-        df_raw = df_raw[df_raw['time'] >= cutoff]
-
-        if len(df_raw) == 0:
+        rates = rates[rates['time'] < forming_time]  # 현재 미완성 바 제외
+        if len(rates) == 0:
             print(f"❌ 필터링 후 데이터 없음 (기준일: {cutoff.strftime('%Y-%m-%d')})")
             return False
+        if rates['time'][-1] != forming_time - 60:
+            print(f"⚠️  최신 완성 바가 미완성 바 직전이 아님: "
+                  f"{pd.Timestamp(int(rates['time'][-1]), unit='s')} "
+                  f"(미완성 바 {pd.Timestamp(int(forming_time), unit='s')})")
 
-        # DataFrame 정리
-        df = df_raw[['time', 'open', 'high', 'low', 'close', 'tick_volume']].copy()
-        df = df.sort_values('time').reset_index(drop=True)
+        df_raw = pd.DataFrame(rates)
+        df_raw['time'] = pd.to_datetime(df_raw['time'], unit='s')
 
-        # CSV 저장
-        output_path = Path(BACKTEST_CONFIG["data_dir"]) / f"{symbol}_M1_data.csv"
-        df.to_csv(output_path, index=False)
+        # DataFrame 정리 (MT5 rates는 시간 오름차순 → 정렬은 필요할 때만)
+        df = df_raw[['time', 'open', 'high', 'low', 'close', 'tick_volume']]
+        if not df['time'].is_monotonic_increasing:
+            df = df.sort_values('time').reset_index(drop=True)
 
-        print(f"✓ 데이터 저장 완료: {output_path}")
+        if to_db:
+            # 메모리의 DataFrame을 바로 COPY (MT5 time은 UTC → TIMESTAMPTZ에 명시적으로 UTC 지정)
+            from db import Database
+            inserted = Database().bulk_insert_ohlcv(
+                df.assign(time=df['time'].dt.tz_localize('UTC')), symbol, source='mt5'
+            )
+            print(f"✓ DB 저장 완료: {inserted:,}개 신규 바 (중복 제외)")
+        else:
+            # CSV 저장
+            output_path = Path(BACKTEST_CONFIG["data_dir"]) / f"{symbol}_M1_data.csv"
+            df.to_csv(output_path, index=False)
+            print(f"✓ 데이터 저장 완료: {output_path}")
         print(f"   총 {len(df):,}개 M1 바 ({months}개월)")
         print(f"   기간: {df['time'].iloc[0]} ~ {df['time'].iloc[-1]}")
 
@@ -209,6 +240,11 @@ def main():
         choices=[1, 3, 6, 12],
         help="수집 기간 개월 수 (기본: 3)"
     )
+    parser.add_argument(
+        "--to-db",
+        action="store_true",
+        help="CSV 대신 PostgreSQL에 바로 저장",
+    )
 
     args = parser.parse_args()
 
@@ -217,11 +253,14 @@ def main():
     print(f"  심볼: {args.symbol} | 기간: {args.months}개월")
     print("=" * 60)
 
-    success = fetch_data(args.symbol, args.months)
+    success = fetch_data(args.symbol, args.months, to_db=args.to_db)
 
     if success:
         print("\n✅ 데이터 수집 완료!")
-        print(f"   백테스트 실행: python backtest_ob_fvg.py")
+        if args.to_db:
+            print(f"   백테스트 실행: python backtest_ob_fvg.py --symbol {args.symbol} --source db")
+        else:
+            print(f"   백테스트 실행: python backtest_ob_fvg.py")
     else:
         print("\n❌ 데이터 수집 실패")
         sys.exit(1)
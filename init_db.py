@@ -67,23 +67,25 @@ def import_existing_csv():
     print("Importing existing MT5 CSV data to PostgreSQL...")
     print("=" * 60)
 
-    for symbol in SYMBOLS:
-        csv_path = data_dir / f"{symbol}_M1_data.csv"
-        if not csv_path.exists():
-            print(f"\n[SKIP] {csv_path} not found")
-            continue
-
-        print(f"\n[{symbol}] Loading {csv_path}...")
-        df = pd.read_csv(csv_path, parse_dates=["time"])
-        print(f"  CSV rows: {len(df):,}")
-
-        inserted = db.bulk_insert_ohlcv(df, symbol, source="mt5")
-        total = db.count_ohlcv(symbol)
-        date_range = db.get_ohlcv_date_range(symbol)
-
-        print(f"  Inserted: {inserted:,} rows")
-        print(f"  Total in DB: {total:,} rows")
-        print(f"  Range: {date_range[0]} ~ {date_range[1]}")
+    # 심볼 전체가 한 연결을 공유
+    with db.get_conn():
+        for symbol in SYMBOLS:
+            csv_path = data_dir / f"{symbol}_M1_data.csv"
+            if not csv_path.exists():
+                print(f"\n[SKIP] {csv_path} not found")
+                continue
+
+            print(f"\n[{symbol}] Loading {csv_path}...")
+            df = pd.read_csv(csv_path, parse_dates=["time"])
+            print(f"  CSV rows: {len(df):,}")
+
+            inserted = db.bulk_insert_ohlcv(df, symbol, source="mt5")
+            total = db.count_ohlcv(symbol)
+            date_range = db.get_ohlcv_date_range(symbol)
+
+            print(f"  Inserted: {inserted:,} rows")
+            print(f"  Total in DB: {total:,} rows")
+            print(f"  Range: {date_range[0]} ~ {date_range[1]}")
 
     print("\nCSV import complete!")
     print("=" * 60)
@@ -8,12 +8,15 @@ ICT Liquidity Pool 감지 모듈
 - 유동성 스윕(sweep) 감지: 기관이 유동성을 흡수한 후 반전하는 패턴
 """
 
-import pandas as pd
 import numpy as np
-from typing import Optional, Dict, List
+from typing import Any, Optional, Dict, List, Tuple
 
 from config import STRATEGY_DEFAULTS, SYMBOLS
-from structure_detector import SwingDetector
+from structure_detector import SwingDetector, resolve_swing_detector
+from bar_window import Bars, window_key
+
+# find_liquidity_pools 결과 캐시 최대 항목 수 (같은 바 재호출 대비, 오래된 것부터 제거)
+POOL_CACHE_SIZE = 4
 
 
 class LiquidityDetector:
@@ -29,24 +32,30 @@ class LiquidityDetector:
         lookback: int = None,
         tolerance_pips: float = None,
         swing_strength: int = None,
+        swing_detector: Optional[SwingDetector] = None,
     ):
         """
         Args:
             symbol: 거래 심볼 (pip_size 결정)
             lookback: 유동성 탐색 범위 (M15 바)
             tolerance_pips: Equal High/Low 허용 오차 (핍)
-            swing_strength: 스윙 포인트 강도
+            swing_strength: 스윙 포인트 강도 (swing_detector 주입 시 생략 가능)
+            swing_detector: BOS/CHoCH와 공유할 SwingDetector (스윙 캐시 공유, 생략 시 새로 생성)
         """
         sym_cfg = SYMBOLS.get(symbol, SYMBOLS["EURUSD"])
         self.pip_size = sym_cfg["pip_size"]
         self.lookback = lookback or STRATEGY_DEFAULTS.get("liquidity_lookback", 50)
         self.tolerance = (tolerance_pips or STRATEGY_DEFAULTS.get("liquidity_tolerance_pips", 3.0)) * self.pip_size
-        self.swing_strength = swing_strength or STRATEGY_DEFAULTS.get("bos_swing_strength", 5)
-        self.swing_detector = SwingDetector(self.swing_strength)
+        self.swing_detector, self.swing_strength = resolve_swing_detector(swing_detector, swing_strength)
+        self._pool_cache: Dict[Tuple[Any, ...], List[Dict]] = {}
 
-    def find_liquidity_pools(self, m15_bars: pd.DataFrame) -> List[Dict]:
+    def find_liquidity_pools(self, m15_bars: Bars, swings: Optional[List[Dict]] = None) -> List[Dict]:
         """
-        유동성 풀 식별
+        유동성 풀 식별 (같은 윈도우 재호출 시 캐시된 결과 반환)
+
+        Args:
+            m15_bars: M15 OHLC DataFrame 또는 BarWindow
+            swings: 같은 윈도우로 미리 계산한 스윙 리스트 (swing_strength 동일해야 함, 생략 시 계산)
 
         Returns:
             [{
@@ -57,20 +66,45 @@ class LiquidityDetector:
                 'swept': bool,           # 최근 바에 의해 스윕 여부
             }]
         """
-        swings = self.swing_detector.find_swings(m15_bars)
+        key = window_key(m15_bars)
+        cached = self._pool_cache.get(key)
+        if cached is not None:
+            return cached
+
+        pools = self._find_pools(m15_bars, swings)
+        if len(self._pool_cache) >= POOL_CACHE_SIZE:
+            del self._pool_cache[next(iter(self._pool_cache))]
+        self._pool_cache[key] = pools
+        return pools
+
+    def _find_pools(self, m15_bars: Bars, swings: Optional[List[Dict]] = None) -> List[Dict]:
+        """스윙 탐지 + 고점/저점 클러스터링 (캐시 미스 시)"""
+        if swings is None:
+            swings = self.swing_detector.find_swings(m15_bars)
         if not swings:
             return []
 
         pools: List[Dict] = []
 
+        # 스윕 판정용 최근 바 high/low (풀마다 컬럼 접근하지 않도록 1회 추출)
+        last_high = float(np.asarray(m15_bars['high'])[-1])
+        last_low = float(np.asarray(m15_bars['low'])[-1])
+
+        # 스윙 고점/저점 분리 (한 번의 순회)
+        swing_highs: List[Dict] = []
+        swing_lows: List[Dict] = []
+        for s in swings:
+            if s['swing_type'] == 'high':
+                swing_highs.append(s)
+            elif s['swing_type'] == 'low':
+                swing_lows.append(s)
+
         # 스윙 고점 클러스터 → BSL
-        swing_highs = [s for s in swings if s['swing_type'] == 'high']
-        bsl_pools = self._cluster_prices(swing_highs, 'BSL', m15_bars)
+        bsl_pools = self._cluster_prices(swing_highs, 'BSL', last_high)
         pools.extend(bsl_pools)
 
         # 스윙 저점 클러스터 → SSL
-        swing_lows = [s for s in swings if s['swing_type'] == 'low']
-        ssl_pools = self._cluster_prices(swing_lows, 'SSL', m15_bars)
+        ssl_pools = self._cluster_prices(swing_lows, 'SSL', last_low)
         pools.extend(ssl_pools)
 
         return pools
@@ -79,9 +113,9 @@ class LiquidityDetector:
         self,
         swing_points: List[Dict],
         pool_type: str,
-        m15_bars: pd.DataFrame,
+        last_price: float,
     ) -> List[Dict]:
-        """가격이 유사한 스윙 포인트를 클러스터링"""
+        """가격이 유사한 스윙 포인트를 클러스터링 (last_price: BSL은 최근 바 high, SSL은 low)"""
         if len(swing_points) < 2:
             return []
 
@@ -95,11 +129,11 @@ class LiquidityDetector:
                 cluster.append(sorted_swings[i])
             else:
                 if len(cluster) >= 2:
-                    pools.append(self._make_pool(cluster, pool_type, m15_bars))
+                    pools.append(self._make_pool(cluster, pool_type, last_price))
                 cluster = [sorted_swings[i]]
 
         if len(cluster) >= 2:
-            pools.append(self._make_pool(cluster, pool_type, m15_bars))
+            pools.append(self._make_pool(cluster, pool_type, last_price))
 
         return pools
 
@@ -107,21 +141,20 @@ class LiquidityDetector:
         self,
         cluster: List[Dict],
         pool_type: str,
-        m15_bars: pd.DataFrame,
+        last_price: float,
     ) -> Dict:
         """클러스터로부터 유동성 풀 생성"""
-        avg_price = np.mean([s['price'] for s in cluster])
+        avg_price = float(np.mean([s['price'] for s in cluster]))  # 1회 변환 → 이후 비교는 파이썬 float
         last_idx = max(s['index'] for s in cluster)
 
         # 스윕 확인: 최근 바의 high/low가 풀을 관통했는지
-        last_bar = m15_bars.iloc[-1]
         if pool_type == 'BSL':
-            swept = float(last_bar['high']) > avg_price
+            swept = last_price > avg_price
         else:  # SSL
-            swept = float(last_bar['low']) < avg_price
+            swept = last_price < avg_price
 
         return {
-            'price': float(avg_price),
+            'price': avg_price,
             'type': pool_type,
             'strength': len(cluster),
             'last_touch_idx': last_idx,
@@ -130,17 +163,19 @@ class LiquidityDetector:
 
     def check_liquidity_context(
         self,
-        m15_bars: pd.DataFrame,
+        m15_bars: Bars,
         entry_price: float,
         direction: int,
+        pools: Optional[List[Dict]] = None,
     ) -> Dict:
         """
         진입 시점의 유동성 컨텍스트 분석
 
         Args:
-            m15_bars: M15 OHLC DataFrame
+            m15_bars: M15 OHLC DataFrame 또는 BarWindow
             entry_price: 진입 가격
             direction: 1 (BUY) 또는 -1 (SELL)
+            pools: 같은 M15 윈도우로 미리 계산한 find_liquidity_pools 결과 (생략 시 계산)
 
         Returns:
             {
@@ -152,54 +187,64 @@ class LiquidityDetector:
                 'sweep_occurred': bool,      # 최근 유동성 스윕 발생
             }
         """
-        pools = self.find_liquidity_pools(m15_bars)
-
-        pools_above = [p for p in pools if p['price'] > entry_price]
-        pools_below = [p for p in pools if p['price'] <= entry_price]
-
-        nearest_bsl = min(pools_above, key=lambda p: p['price'] - entry_price) if pools_above else None
-        nearest_ssl = min(pools_below, key=lambda p: entry_price - p['price']) if pools_below else None
+        if pools is None:
+            pools = self.find_liquidity_pools(m15_bars)
+
+        # 풀 없음 (저변동 구간) → 조정 없음
+        if not pools:
+            return {
+                'score_adjustment': 0.0,
+                'pools_above': [],
+                'pools_below': [],
+                'nearest_bsl': None,
+                'nearest_ssl': None,
+                'sweep_occurred': False,
+            }
 
-        sweep_occurred = any(p['swept'] for p in pools)
+        # 위/아래 분할 + 최근접 풀 + 스윕 여부를 한 번의 순회로 (풀은 수 개 → 정렬/배열 변환 불필요)
+        pools_above: List[Dict] = []
+        pools_below: List[Dict] = []
+        nearest_bsl = nearest_ssl = None
+        bsl_dist = ssl_dist = 0.0
+        sweep_occurred = bsl_swept = ssl_swept = False
+
+        for p in pools:
+            price = p['price']
+            swept = p['swept']
+            if price > entry_price:
+                pools_above.append(p)
+                dist = price - entry_price
+                if nearest_bsl is None or dist < bsl_dist:
+                    nearest_bsl, bsl_dist = p, dist
+                if swept and p['type'] == 'BSL':
+                    bsl_swept = True
+            else:
+                pools_below.append(p)
+                dist = entry_price - price
+                if nearest_ssl is None or dist < ssl_dist:
+                    nearest_ssl, ssl_dist = p, dist
+                if swept and p['type'] == 'SSL':
+                    ssl_swept = True
+            if swept:
+                sweep_occurred = True
+
+        # 방향별 기준 풀 (BUY: 아래 SSL 스윕 + 위 BSL 타겟, SELL: 위 BSL 스윕 + 아래 SSL 타겟)
+        if direction == 1:
+            opposite_swept, target, target_dist = ssl_swept, nearest_bsl, bsl_dist
+        else:
+            opposite_swept, target, target_dist = bsl_swept, nearest_ssl, ssl_dist
 
         # 스코어 조정 로직
-        score = 0.0
-
-        if direction == 1:  # BUY
-            # 아래쪽 SSL 스윕 발생 → 매수 유리 (기관 매집 후 상승)
-            ssl_swept = any(p['swept'] for p in pools_below if p['type'] == 'SSL')
-            if ssl_swept:
-                score += 0.5
-
-            # 가까운 BSL 있으면 → TP 타겟으로 유리
-            if nearest_bsl and not nearest_bsl['swept']:
-                dist_pips = (nearest_bsl['price'] - entry_price) / self.pip_size
-                if dist_pips > 5:
-                    score += 0.3
-
-            # BSL 바로 앞에서 매수 진입 → 불리 (유동성 함정)
-            if nearest_bsl and not nearest_bsl['swept']:
-                dist_pips = (nearest_bsl['price'] - entry_price) / self.pip_size
-                if dist_pips < 3:
-                    score -= 0.5
-
-        else:  # SELL
-            # 위쪽 BSL 스윕 발생 → 매도 유리
-            bsl_swept = any(p['swept'] for p in pools_above if p['type'] == 'BSL')
-            if bsl_swept:
-                score += 0.5
-
-            # 가까운 SSL 있으면 → TP 타겟으로 유리
-            if nearest_ssl and not nearest_ssl['swept']:
-                dist_pips = (entry_price - nearest_ssl['price']) / self.pip_size
-                if dist_pips > 5:
-                    score += 0.3
-
-            # SSL 바로 앞에서 매도 진입 → 불리
-            if nearest_ssl and not nearest_ssl['swept']:
-                dist_pips = (entry_price - nearest_ssl['price']) / self.pip_size
-                if dist_pips < 3:
-                    score -= 0.5
+        # 반대편 유동성 스윕 발생 → 진입 방향 유리 (기관이 유동성 흡수 후 반전)
+        score = 0.5 if opposite_swept else 0.0
+
+        # 진입 방향 최근접 풀 거리: 5핍 초과 → TP 타겟으로 유리, 3핍 미만 → 유동성 함정 (불리)
+        if target and not target['swept']:
+            dist_pips = target_dist / self.pip_size
+            if dist_pips > 5:
+                score += 0.3
+            elif dist_pips < 3:
+                score -= 0.5
 
         # 클램프
         score = max(-1.0, min(1.0, score))
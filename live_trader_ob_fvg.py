@@ -20,7 +20,7 @@ import time
 import pandas as pd
 import numpy as np
 from datetime import datetime, timezone
-from typing import Optional, Dict, List
+from typing import Any, Optional, Dict, List
 import logging
 
 # Windows 콘솔 UTF-8 출력 설정
@@ -203,11 +203,15 @@ class MT5LiveTrader:
             if rates is None or len(rates) == 0:
                 return None
             
-            # DataFrame 변환
-            df = pd.DataFrame(rates)
-            df['time'] = pd.to_datetime(df['time'], unit='s')
+            # MT5 rates는 시간 오름차순 구조화 배열 → 역전이 있을 때만 정렬
+            times = rates['time']
+            if np.any(times[1:] < times[:-1]):
+                rates = rates[np.argsort(times, kind='stable')]
             
-            return df.sort_values('time').reset_index(drop=True)
+            # DataFrame 변환 (컬럼 배열 직접 전달, epoch 초 → datetime64 numpy 변환)
+            columns = {name: rates[name] for name in rates.dtype.names}
+            columns['time'] = rates['time'].astype('datetime64[s]')
+            return pd.DataFrame(columns)
         
         except Exception as e:
             logger.error(f"데이터 수신 실패: {e}")
@@ -261,42 +265,39 @@ class MT5LiveTrader:
             logger.error(f"주문 발주 실패: {e}")
             return False
     
-    def get_open_position(self) -> Optional[Dict]:
+    def get_open_position(self) -> Optional[Any]:
         """
         현재 포지션 조회
         
         Returns:
-            포지션 정보 또는 None
+            MT5 TradePosition (namedtuple, 속성으로 접근) 또는 None
         """
         try:
-            pos_total = self.mt5.positions_total()
-            
-            if pos_total <= 0:
+            # positions_get 1회 호출 (없으면 빈 튜플, 실패 시 None → 별도 positions_total 조회 불필요)
+            positions = self.mt5.positions_get(symbol=self.symbol)
+            if not positions:
                 return None
             
-            for pos in self.mt5.positions_get(symbol=self.symbol):
-                return pos._asdict()
-            
-            return None
+            return positions[0]  # dict 변환 없이 namedtuple 그대로
         
         except Exception as e:
             logger.error(f"포지션 조회 실패: {e}")
             return None
     
-    def close_position(self, pos: Dict) -> bool:
+    def close_position(self, pos: Any) -> bool:
         """
         포지션 청산
         
         Args:
-            pos: 포지션 정보
+            pos: get_open_position 결과 (TradePosition)
         
         Returns:
             성공 여부
         """
         try:
-            ticket = pos['ticket']
-            volume = pos['volume']
-            pos_type = pos['type']
+            ticket = pos.ticket
+            volume = pos.volume
+            pos_type = pos.type
             
             # 현재 틱 정보 조회
             tick = self.mt5.symbol_info_tick(self.symbol)
@@ -326,28 +327,28 @@ class MT5LiveTrader:
                 logger.error(f"청산 실패: {getattr(result, 'comment', 'Unknown error')}")
                 return False
             
-            logger.info(f"✓ 포지션 청산 (Profit: {pos['profit']:.2f})")
+            logger.info(f"✓ 포지션 청산 (Profit: {pos.profit:.2f})")
             return True
         
         except Exception as e:
             logger.error(f"포지션 청산 실패: {e}")
             return False
     
-    def update_active_trade(self, pos: Dict) -> bool:
-        """활성 포지션 상태 업데이트"""
+    def update_active_trade(self, pos: Any) -> bool:
+        """활성 포지션 상태 업데이트 (pos: get_open_position 결과 TradePosition 또는 None)"""
         if pos is None:
             self.active_trade = None
             return False
         
         self.active_trade = {
-            'ticket': pos['ticket'],
-            'direction': 1 if pos['type'] == self.mt5.POSITION_TYPE_BUY else -1,
-            'entry_price': pos['price_open'],
-            'entry_time': datetime.fromtimestamp(pos['time']),
-            'current_price': pos['price_current'],
-            'profit': pos['profit'],
-            'sl': pos['sl'],
-            'tp': pos['tp']
+            'ticket': pos.ticket,
+            'direction': 1 if pos.type == self.mt5.POSITION_TYPE_BUY else -1,
+            'entry_price': pos.price_open,
+            'entry_time': datetime.fromtimestamp(pos.time),
+            'current_price': pos.price_current,
+            'profit': pos.profit,
+            'sl': pos.sl,
+            'tp': pos.tp
         }
         return True
     
@@ -367,26 +368,35 @@ class MT5LiveTrader:
             
             while True:
                 try:
-                    # M1, M15 데이터 수신
+                    # M1 데이터 수신
                     m1_df = self.get_rates('M1', 100)
-                    m15_df = self.get_rates('M15', 10)
                     
-                    if m1_df is None or m15_df is None or len(m1_df) < 2 or len(m15_df) < 2:
+                    if m1_df is None or len(m1_df) < 2:
                         time.sleep(self.poll_interval)
                         continue
                     
-                    # 최신 M1 바 시간
-                    m1_current_time = m1_df.iloc[-1]['time']
+                    # 최신 M1 바 시간/종가 (행 Series 생성 없이 컬럼 스칼라 접근)
+                    m1_current_time = m1_df['time'].iat[-1]
                     
                     # 새로운 M1 바가 완성되었는지 확인
                     if self.last_m1_bar_time is not None and self.last_m1_bar_time == m1_current_time:
                         time.sleep(self.poll_interval)
                         continue
                     
+                    # M15 데이터는 새 M1 바에서만 수신 (같은 바 안의 폴링에서는 쓰이지 않음)
+                    m15_df = self.get_rates('M15', 10)
+                    
+                    if m15_df is None or len(m15_df) < 2:
+                        time.sleep(self.poll_interval)
+                        continue
+                    
                     self.last_m1_bar_time = m1_current_time
+                    self.last_m15_bar_time = m15_df['time'].iat[-1]
                     
-                    logger.info(f"\n📊 Bar @ {m1_current_time.strftime('%Y-%m-%d %H:%M')} | "
-                              f"M1: {m1_df.iloc[-1]['close']:.5f}")
+                    # INFO 로그가 꺼져 있으면 strftime/포맷 생략
+                    if logger.isEnabledFor(logging.INFO):
+                        logger.info(f"\n📊 Bar @ {m1_current_time.strftime('%Y-%m-%d %H:%M')} | "
+                                  f"M1: {m1_df['close'].iat[-1]:.5f}")
                     
                     # 1. 활성 포지션 확인
                     pos = self.get_open_position()
@@ -416,13 +426,9 @@ class MT5LiveTrader:
                                 }
                     
                     else:
-                        # 포지션 모니터링
-                        tick = self.mt5.symbol_info_tick(self.symbol)
-                        if tick is None:
-                            time.sleep(self.poll_interval)
-                            continue
-                        
-                        price = tick.bid if self.active_trade['direction'] == 1 else tick.ask
+                        # 포지션 모니터링 (방금 조회한 포지션의 현재가 사용 → 별도 틱 조회 IPC 생략)
+                        # MT5 price_current: 매수 포지션은 bid, 매도 포지션은 ask
+                        price = self.active_trade['current_price']
                         
                         # 프로피트 모니터링 (정보용)
                         current_pips = (
@@ -431,7 +437,7 @@ class MT5LiveTrader:
                             else (self.active_trade['entry_price'] - price) / self.strategy.pip_size
                         )
                         
-                        logger.info(f"📍 포지션 모니터링 | 현재 P&L: {current_pips:+.2f}p")
+                        logger.info("📍 포지션 모니터링 | 현재 P&L: %+.2fp", current_pips)
                     
                     time.sleep(self.poll_interval)
                 
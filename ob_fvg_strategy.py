@@ -11,7 +11,8 @@ import pandas as pd
 import numpy as np
 from typing import Optional, Tuple, Dict, List
 
-from config import SYMBOLS, STRATEGY_DEFAULTS
+from config import SYMBOLS, STRATEGY_DEFAULTS, ALLOWED_HOURS_MASK
+from bar_window import Bars, cache_lookup
 
 
 class OrderBlockFVGStrategy:
@@ -51,12 +52,25 @@ class OrderBlockFVGStrategy:
         self.total_cost_pips = self.spread_pips + self.commission_pips  # 왕복 비용 (스프레드 + 커미션)
         self.sl_buffer_pips = sl_buffer_pips if sl_buffer_pips is not None else sym_cfg["sl_buffer_pips"]
         self.allowed_hours = allowed_hours if allowed_hours is not None else STRATEGY_DEFAULTS["allowed_hours"]
+        self.allowed_hours_mask = (
+            sum(1 << h for h in set(allowed_hours)) if allowed_hours is not None else ALLOWED_HOURS_MASK
+        )
         self.require_fvg_confirm = require_fvg_confirm if require_fvg_confirm is not None else STRATEGY_DEFAULTS["require_fvg_confirm"]
         self.sl_timeframe = sl_timeframe if sl_timeframe is not None else STRATEGY_DEFAULTS.get("sl_timeframe", "M1")
     
-    def is_trading_hour(self, timestamp: pd.Timestamp) -> bool:
-        """거래 허용 시간인지 확인"""
-        return timestamp.hour in self.allowed_hours
+    def is_trading_hour(self, timestamp) -> bool:
+        """거래 허용 시간인지 확인 (pd.Timestamp 또는 np.datetime64)"""
+        if isinstance(timestamp, np.datetime64):
+            # 정수 연산으로 시(hour) 추출 (Timestamp 객체 생성 없음)
+            hour = int(timestamp.astype('datetime64[h]').view(np.int64) % 24)
+        else:
+            hour = timestamp.hour
+        return bool((self.allowed_hours_mask >> hour) & 1)
+
+    def trading_hour_mask(self, times: np.ndarray) -> np.ndarray:
+        """시간 배열 전체의 거래 허용 여부 (bool 배열, 비트마스크 벡터 판정)"""
+        hours = np.asarray(times).astype('datetime64[h]').view(np.int64) % 24
+        return ((self.allowed_hours_mask >> hours) & 1).astype(bool)
     
     def detect_order_block(
         self, 
@@ -95,9 +109,39 @@ class OrderBlockFVGStrategy:
         
         return None
     
+    def order_block_signals(self, cols: Dict[str, np.ndarray]) -> np.ndarray:
+        """
+        전체 봉 배열의 Order Block 신호 (detect_order_block(봉 k-1, 봉 k)를 배열 연산으로)
+
+        Args:
+            cols: 컬럼명 → numpy 배열 (open, high, low, close)
+
+        Returns:
+            int64 배열 (1: BUY, -1: SELL, 0: 신호 없음), 첫 봉은 직전 봉이 없어 0
+        """
+        opens = np.asarray(cols['open'], dtype=np.float64)
+        highs = np.asarray(cols['high'], dtype=np.float64)
+        lows = np.asarray(cols['low'], dtype=np.float64)
+        closes = np.asarray(cols['close'], dtype=np.float64)
+
+        out = np.zeros(len(opens), dtype=np.int64)
+        if len(opens) < 2:
+            return out
+
+        prev_down = closes[:-1] < opens[:-1]
+        prev_up = closes[:-1] > opens[:-1]
+        curr_up = closes[1:] > opens[1:]
+        curr_down = closes[1:] < opens[1:]
+
+        # 직전 봉 하강 → 현재 봉 상승 + 저가 돌파: BUY / 직전 봉 상승 → 현재 봉 하강 + 고가 돌파: SELL
+        buy = prev_down & curr_up & (lows[1:] < lows[:-1])
+        sell = prev_up & curr_down & (highs[1:] > highs[:-1])
+        out[1:] = np.where(buy, 1, np.where(sell, -1, 0))
+        return out
+
     def detect_fvg(
         self, 
-        bars: pd.DataFrame, 
+        bars: Bars, 
         index: int
     ) -> Optional[int]:
         """
@@ -108,7 +152,7 @@ class OrderBlockFVGStrategy:
         - N+1에서 갭이 생김
         
         Args:
-            bars: OHLC 데이터프레임
+            bars: OHLC 데이터프레임 또는 BarWindow
             index: 현재 봉 인덱스
         
         Returns:
@@ -117,16 +161,16 @@ class OrderBlockFVGStrategy:
         if index < 2 or index >= len(bars):
             return None
         
-        n = bars.iloc[index - 2]      # N
-        n1 = bars.iloc[index - 1]     # N+1
-        n2 = bars.iloc[index]         # N+2
-        
-        n_close = n['close']
-        n_open = n['open']
-        n1_close = n1['close']
-        n1_open = n1['open']
-        n2_close = n2['close']
-        n2_open = n2['open']
+        opens = np.asarray(bars['open'])
+        closes = np.asarray(bars['close'])
+
+        # N, N+1, N+2 = index-2, index-1, index
+        n_close = closes[index - 2]
+        n_open = opens[index - 2]
+        n1_close = closes[index - 1]
+        n1_open = opens[index - 1]
+        n2_close = closes[index]
+        n2_open = opens[index]
 
         # 각 봉의 방향
         n_is_up = n_close > n_open
@@ -135,20 +179,76 @@ class OrderBlockFVGStrategy:
 
         # DOWN FVG (매도 기회): N(상승), N+1(하락), N+2(상승) + N.high < N+2.low (상방 갭)
         if n_is_up and (not n1_is_up) and n2_is_up:
-            if n['high'] < n2['low']:
+            if np.asarray(bars['high'])[index - 2] < np.asarray(bars['low'])[index]:
                 return -1  # DOWN FVG
 
         # UP FVG (매수 기회): N(하락), N+1(상승), N+2(하락) + N.low > N+2.high (하방 갭)
         elif (not n_is_up) and n1_is_up and (not n2_is_up):
-            if n['low'] > n2['high']:
+            if np.asarray(bars['low'])[index - 2] > np.asarray(bars['high'])[index]:
                 return 1  # UP FVG
 
         return None
     
+    def fvg_signals(self, cols: Dict[str, np.ndarray]) -> np.ndarray:
+        """
+        전체 봉 배열의 FVG 신호 (detect_fvg(bars, i)를 모든 i에 대해 배열 연산으로)
+
+        Args:
+            cols: 컬럼명 → numpy 배열 (open, high, low, close)
+
+        Returns:
+            int64 배열 (1: UP FVG, -1: DOWN FVG, 0: 없음), 앞의 두 봉은 0
+        """
+        opens = np.asarray(cols['open'], dtype=np.float64)
+        highs = np.asarray(cols['high'], dtype=np.float64)
+        lows = np.asarray(cols['low'], dtype=np.float64)
+        closes = np.asarray(cols['close'], dtype=np.float64)
+
+        out = np.zeros(len(opens), dtype=np.int64)
+        if len(opens) < 3:
+            return out
+
+        # N, N+1, N+2 = i-2, i-1, i
+        is_up = closes > opens
+        n_up, n1_up, n2_up = is_up[:-2], is_up[1:-1], is_up[2:]
+        down_fvg = n_up & ~n1_up & n2_up & (highs[:-2] < lows[2:])
+        up_fvg = ~n_up & n1_up & ~n2_up & (lows[:-2] > highs[2:])
+        out[2:] = np.where(down_fvg, -1, np.where(up_fvg, 1, 0))
+        return out
+
+    def get_m15_setup(self, m15_bars: Bars) -> Optional[int]:
+        """
+        M15 단계 진입 조건 (거래 허용 시간 + Order Block)
+
+        M15 윈도우에만 의존하므로 같은 M15 바 안의 M1 바들은 결과가 동일.
+        백테스트 엔진은 M15 바가 바뀔 때만 호출하여 결과를 재사용
+        (get_entry_signal의 m15_context['m15_setup']).
+
+        Returns:
+            1 (BUY OB), -1 (SELL OB), None (진입 불가)
+        """
+        if len(m15_bars) < 2:
+            return None
+
+        # M15 최신 봉
+        m15_time = np.asarray(m15_bars['time'])[-1]
+
+        # 거래 허용 시간 확인
+        if not self.is_trading_hour(m15_time):
+            return None
+
+        # Order Block 감지 (M15)
+        m15_ohlc = {col: np.asarray(m15_bars[col]) for col in ('open', 'high', 'low', 'close')}
+        return self.detect_order_block(
+            {col: arr[-2] for col, arr in m15_ohlc.items()},
+            {col: arr[-1] for col, arr in m15_ohlc.items()}
+        )
+
     def get_entry_signal(
         self, 
-        m15_bars: pd.DataFrame, 
-        m1_bars: pd.DataFrame
+        m15_bars: Bars, 
+        m1_bars: Bars,
+        m15_context: Optional[Dict] = None,
     ) -> Optional[Dict]:
         """
         진입 신호 생성
@@ -156,8 +256,9 @@ class OrderBlockFVGStrategy:
         M15에서 방향 결정 → M1에서 타이밍 확인
         
         Args:
-            m15_bars: 15분봉 OHLC 데이터
-            m1_bars: 1분봉 OHLC 데이터
+            m15_bars: 15분봉 OHLC 데이터 (DataFrame 또는 BarWindow)
+            m1_bars: 1분봉 OHLC 데이터 (DataFrame 또는 BarWindow)
+            m15_context: 같은 M15 바의 계산 결과 캐시 (IncrementalSignalCache, 생략 시 매번 계산)
         
         Returns:
             {
@@ -172,20 +273,8 @@ class OrderBlockFVGStrategy:
         if len(m15_bars) < 2 or len(m1_bars) < 2:
             return None
         
-        # M15 최신 봉
-        m15_curr = m15_bars.iloc[-1]
-        m15_prev = m15_bars.iloc[-2]
-        m15_time = m15_curr['time']
-        
-        # 거래 허용 시간 확인
-        if not self.is_trading_hour(m15_time):
-            return None
-        
-        # Order Block 감지 (M15)
-        ob_signal = self.detect_order_block(
-            m15_prev.to_dict(),
-            m15_curr.to_dict()
-        )
+        # M15 조건 (거래 시간 + Order Block)
+        ob_signal = cache_lookup(m15_context, 'm15_setup', lambda: self.get_m15_setup(m15_bars))
         
         if ob_signal is None:
             return None
@@ -202,20 +291,20 @@ class OrderBlockFVGStrategy:
         else:
             # FVG 확인 불필요: OB 신호만으로 진입 (허위 신호 증가 주의)
             signal = ob_signal
-        entry_time = m1_bars.iloc[-1]['time']
-        entry_price = m1_bars.iloc[-1]['close']
+        entry_time = pd.Timestamp(np.asarray(m1_bars['time'])[-1])
+        entry_price = np.asarray(m1_bars['close'])[-1]
         
         # SL 계산: sl_timeframe에 따라 M1 또는 M15 직전 봉 기준
         if self.sl_timeframe == "M15" and len(m15_bars) >= 2:
-            sl_ref_bar = m15_bars.iloc[-2]  # M15 직전 봉 (넓은 SL, 노이즈 방지)
+            sl_ref_bars = m15_bars  # M15 직전 봉 (넓은 SL, 노이즈 방지)
         else:
-            sl_ref_bar = m1_bars.iloc[-2]   # M1 직전 봉 (기존 동작)
+            sl_ref_bars = m1_bars   # M1 직전 봉 (기존 동작)
 
         if signal == 1:  # BUY
-            stop_loss = sl_ref_bar['low'] - self.sl_buffer_pips
+            stop_loss = np.asarray(sl_ref_bars['low'])[-2] - self.sl_buffer_pips
             risk_pips = (entry_price - stop_loss) / self.pip_size
         else:  # SELL
-            stop_loss = sl_ref_bar['high'] + self.sl_buffer_pips
+            stop_loss = np.asarray(sl_ref_bars['high'])[-2] + self.sl_buffer_pips
             risk_pips = (stop_loss - entry_price) / self.pip_size
 
         # SL이 진입가 반대편에 있는 invalid 설정 거부
@@ -239,7 +328,98 @@ class OrderBlockFVGStrategy:
             'risk_pips': risk_pips,
             'profit_pips': profit_pips
         }
-    
+
+    def get_entry_signals(
+        self,
+        m1_cols: Dict[str, np.ndarray],
+        m15_cols: Dict[str, np.ndarray],
+        m15_idx_per_m1: np.ndarray,
+        m1_lookback: int,
+        m15_lookback: int,
+    ) -> Dict[str, np.ndarray]:
+        """
+        전체 M1 구간 진입 신호 일괄 생성 (백테스트 배치 API)
+
+        M1 바 i (i >= m1_lookback - 1)의 결과는 get_entry_signal(M15 윈도우 [.., m15_idx_per_m1[i]],
+        M1 윈도우 [i - m1_lookback + 1, i])과 동일 (그 이전 구간은 신호 없음).
+        M15 조건(거래 시간 + Order Block)과 M1 FVG/SL/TP 모두 전체 배열 연산으로 계산 (바별 Python 호출 없음).
+
+        Args:
+            m1_cols / m15_cols: 컬럼명 → 전체 구간 numpy 배열
+            m15_idx_per_m1: M1 바별 소속 M15 인덱스
+            m1_lookback / m15_lookback: 윈도우 크기
+
+        Returns:
+            {'signal': int64 (1/-1, 0 = 신호 없음), 'entry_price', 'stop_loss',
+             'take_profit', 'risk_pips': float64} (길이 = M1 바 수)
+        """
+        n = len(m15_idx_per_m1)
+
+        # 윈도우 길이 2 미만이면 get_entry_signal과 같이 신호 없음
+        if n == 0 or m1_lookback < 2 or m15_lookback < 2:
+            nan = np.full(n, np.nan)
+            return {
+                'signal': np.zeros(n, dtype=np.int64), 'entry_price': nan, 'stop_loss': nan,
+                'take_profit': nan, 'risk_pips': nan,
+            }
+
+        # M15 조건 (거래 허용 시간 + Order Block, 전체 M15 배열에서 직전/현재 봉 비교)
+        m15_setup = self.order_block_signals(m15_cols)
+        in_session = self.trading_hour_mask(m15_cols['time'])
+        m15_setup[~in_session] = 0
+
+        m15_idx = np.maximum(m15_idx_per_m1, 0)
+        ob_signal = np.where(m15_idx_per_m1 >= 1, m15_setup[m15_idx], 0)
+
+        m1_high = np.asarray(m1_cols['high'], dtype=np.float64)
+        m1_low = np.asarray(m1_cols['low'], dtype=np.float64)
+        m1_close = np.asarray(m1_cols['close'], dtype=np.float64)
+
+        # M1 최신 봉 FVG (N, N+1, N+2 = i-2, i-1, i), 윈도우 3개 미만 구간은 FVG 없음
+        if self.require_fvg_confirm:
+            if m1_lookback >= 3:
+                fvg = self.fvg_signals(m1_cols)
+            else:
+                fvg = np.zeros(n, dtype=np.int64)
+            ob_signal = np.where(ob_signal == fvg, ob_signal, 0)
+
+        # M1 윈도우가 다 차지 않은 초기 구간 제외
+        ob_signal[:m1_lookback - 1] = 0
+
+        # SL 기준 직전 봉: M15 또는 M1
+        if self.sl_timeframe == "M15":
+            prev = np.maximum(m15_idx - 1, 0)
+            ref_low = np.asarray(m15_cols['low'], dtype=np.float64)[prev]
+            ref_high = np.asarray(m15_cols['high'], dtype=np.float64)[prev]
+        else:
+            ref_low = np.r_[np.nan, m1_low[:-1]]
+            ref_high = np.r_[np.nan, m1_high[:-1]]
+
+        is_buy = ob_signal == 1
+        entry_price = m1_close
+        stop_loss = np.where(is_buy, ref_low - self.sl_buffer_pips, ref_high + self.sl_buffer_pips)
+        risk_pips = np.where(is_buy, entry_price - stop_loss, stop_loss - entry_price) / self.pip_size
+
+        # SL이 진입가 반대편에 있는 invalid 설정 거부
+        ob_signal = np.where(risk_pips > 0, ob_signal, 0)
+
+        # TP 계산: 손익비 기반
+        profit_pips = risk_pips * self.risk_reward_ratio
+        take_profit = np.where(
+            is_buy,
+            entry_price + (profit_pips * self.pip_size),
+            entry_price - (profit_pips * self.pip_size),
+        )
+
+        has_signal = ob_signal != 0
+        return {
+            'signal': ob_signal,
+            'entry_price': np.where(has_signal, entry_price, np.nan),
+            'stop_loss': np.where(has_signal, stop_loss, np.nan),
+            'take_profit': np.where(has_signal, take_profit, np.nan),
+            'risk_pips': np.where(has_signal, risk_pips, np.nan),
+        }
+
     def calculate_pnl(
         self,
         entry_price: float,
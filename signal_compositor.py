@@ -10,14 +10,281 @@ OB+FVG 기본 신호에 BOS/CHoCH/Liquidity 분석을 조합하여
     signal = compositor.get_composite_signal(m15_bars, m1_bars)
 """
 
-import pandas as pd
-from typing import Optional, Dict
+from typing import Optional, Dict, List, Tuple
+
+import numpy as np
 
 from config import STRATEGY_DEFAULTS
 from ob_fvg_strategy import OrderBlockFVGStrategy
-from structure_detector import BOSDetector, CHoCHDetector
+from structure_detector import SwingDetector, BOSDetector, CHoCHDetector, analyze_structure
 from liquidity_detector import LiquidityDetector
+from bar_window import Bars, cache_lookup
+from _njit import njit
+
+# 컴포넌트별 점수 범위 (남은 컴포넌트로 얻을 수 있는 최대 점수 계산용)
+COMPONENT_RANGES = {
+    'bos': (-0.5, 1.0),
+    'choch': (-0.3, 1.0),
+    'liquidity': (-1.0, 1.0),   # check_liquidity_context 클램프 범위
+}
+DEFAULT_WEIGHTS = {"ob_fvg": 0.4, "bos": 0.3, "choch": 0.2, "liquidity": 0.1}
+
+# 조기 종료 여유 (상한 합산과 실제 누적 합산의 부동소수 순서 차이로 결과가 바뀌지 않도록)
+PRUNE_EPSILON = 1e-9
+
+
+@njit(cache=True)
+def _pairwise_sum(a, lo, n):
+    """a[lo:lo + n] 합계 (np.mean과 같은 numpy pairwise 합산 순서 → 비트 단위 동일 결과)"""
+    if n < 8:
+        res = -0.0
+        for i in range(lo, lo + n):
+            res += a[i]
+        return res
+    if n <= 128:
+        r0, r1, r2, r3 = a[lo], a[lo + 1], a[lo + 2], a[lo + 3]
+        r4, r5, r6, r7 = a[lo + 4], a[lo + 5], a[lo + 6], a[lo + 7]
+        i = 8
+        while i < n - n % 8:
+            r0 += a[lo + i]
+            r1 += a[lo + i + 1]
+            r2 += a[lo + i + 2]
+            r3 += a[lo + i + 3]
+            r4 += a[lo + i + 4]
+            r5 += a[lo + i + 5]
+            r6 += a[lo + i + 6]
+            r7 += a[lo + i + 7]
+            i += 8
+        res = ((r0 + r1) + (r2 + r3)) + ((r4 + r5) + (r6 + r7))
+        while i < n:
+            res += a[lo + i]
+            i += 1
+        return res
+    n2 = n // 2
+    n2 -= n2 % 8
+    return _pairwise_sum(a, lo, n2) + _pairwise_sum(a, lo + n2, n - n2)
+
+
+@njit(cache=True)
+def _window_swings(high, low, start, stop, n, sw_price, sw_is_high):
+    """
+    M15 윈도우 [start, stop)의 스윙 (SwingDetector.find_swings와 동일 판정, 같은 봉이면 고점 먼저)
+
+    sw_price / sw_is_high에 시간순으로 채우고 스윙 개수 반환
+    """
+    count = 0
+    for c in range(start + n, stop - n):
+        h = high[c]
+        is_high = True
+        for j in range(c - n, c + n + 1):
+            if j != c and not (high[j] < h):  # 양쪽 N개보다 엄격히 높아야 함 (NaN 포함 시 불가)
+                is_high = False
+                break
+        if is_high:
+            sw_price[count] = h
+            sw_is_high[count] = True
+            count += 1
+
+        lo = low[c]
+        is_low = True
+        for j in range(c - n, c + n + 1):
+            if j != c and not (low[j] > lo):
+                is_low = False
+                break
+        if is_low:
+            sw_price[count] = lo
+            sw_is_high[count] = False
+            count += 1
+    return count
+
+
+@njit(cache=True)
+def _window_structure(high, low, close, start, stop, n):
+    """M15 윈도우 [start, stop)의 (BOS, CHoCH) — analyze_structure와 동일 (0 = 신호 없음)"""
+    if stop - start < 2 * n + 1:
+        return 0, 0
+    sw_price = np.empty(stop - start)
+    sw_is_high = np.empty(stop - start, dtype=np.bool_)
+    count = _window_swings(high, low, start, stop, n, sw_price, sw_is_high)
+    if count < 3:
+        return 0, 0
+
+    # 타입별 최근 스윙 가격 + 라벨 (1 = HH/HL, -1 = LH/LL, 0 = 라벨 없음: 타입별 첫 스윙)
+    last_high = last_low = 0.0
+    has_high = has_low = False
+    high_label = low_label = 0
+    for k in range(count):
+        price = sw_price[k]
+        if sw_is_high[k]:
+            if has_high:
+                high_label = 1 if price > last_high else -1
+            last_high, has_high = price, True
+        else:
+            if has_low:
+                low_label = 1 if price > last_low else -1
+            last_low, has_low = price, True
+
+    current_close = close[stop - 1]
+    bos = choch = 0
+    if high_label == 1 and low_label == 1:
+        # 상승추세: 스윙 고점 돌파 → 매수 BOS, 스윙 저점 돌파 → 매도 전환
+        if current_close > last_high:
+            bos = 1
+        if current_close < last_low:
+            choch = -1
+    elif high_label == -1 and low_label == -1:
+        # 하락추세: 스윙 저점 돌파 → 매도 BOS, 스윙 고점 돌파 → 매수 전환
+        if current_close < last_low:
+            bos = -1
+        if current_close > last_high:
+            choch = 1
+    return bos, choch
+
+
+@njit(cache=True)
+def _cluster_pools(prices, tolerance, is_bsl, last_price, pool_price, pool_is_bsl, pool_swept, count):
+    """
+    스윙 가격 클러스터 → 유동성 풀 (LiquidityDetector._cluster_prices/_make_pool과 동일)
+
+    pool_* 배열의 count 위치부터 추가하고 새 풀 개수 반환
+    """
+    if len(prices) < 2:
+        return count
+    sorted_prices = prices[np.argsort(prices, kind='mergesort')]  # 안정 정렬 (sorted()와 같은 순서)
+
+    head = 0
+    for i in range(1, len(sorted_prices) + 1):
+        if i < len(sorted_prices) and sorted_prices[i] - sorted_prices[head] <= tolerance:
+            continue
+        size = i - head
+        if size >= 2:
+            avg = _pairwise_sum(sorted_prices, head, size) / size
+            pool_price[count] = avg
+            pool_is_bsl[count] = is_bsl
+            pool_swept[count] = last_price > avg if is_bsl else last_price < avg
+            count += 1
+        head = i
+    return count
+
+
+@njit(cache=True)
+def _liquidity_score(pool_price, pool_is_bsl, pool_swept, n_pools, entry_price, direction, pip_size):
+    """LiquidityDetector.check_liquidity_context의 score_adjustment와 동일"""
+    if n_pools == 0:
+        return 0.0
+
+    nearest_bsl = nearest_ssl = -1
+    bsl_dist = ssl_dist = 0.0
+    bsl_swept = ssl_swept = False
+    for k in range(n_pools):
+        price = pool_price[k]
+        if price > entry_price:
+            dist = price - entry_price
+            if nearest_bsl < 0 or dist < bsl_dist:
+                nearest_bsl, bsl_dist = k, dist
+            if pool_swept[k] and pool_is_bsl[k]:
+                bsl_swept = True
+        else:
+            dist = entry_price - price
+            if nearest_ssl < 0 or dist < ssl_dist:
+                nearest_ssl, ssl_dist = k, dist
+            if pool_swept[k] and not pool_is_bsl[k]:
+                ssl_swept = True
+
+    if direction == 1:
+        opposite_swept, target, target_dist = ssl_swept, nearest_bsl, bsl_dist
+    else:
+        opposite_swept, target, target_dist = bsl_swept, nearest_ssl, ssl_dist
+
+    score = 0.5 if opposite_swept else 0.0
+    if target >= 0 and not pool_swept[target]:
+        dist_pips = target_dist / pip_size
+        if dist_pips > 5:
+            score += 0.3
+        elif dist_pips < 3:
+            score -= 0.5
+    return max(-1.0, min(1.0, score))
+
+
+@njit(cache=True)
+def _composite_kernel(m15_high, m15_low, m15_close, m15_lookback, cand_m15, cand_sig, cand_entry,
+                      weights, threshold, bos_n, choch_n, liq_n, tolerance, pip_size):
+    """
+    OB+FVG 후보 전체의 composite score 일괄 계산 (get_composite_signal과 동일 판정)
+
+    후보는 M1 순서(= M15 인덱스 비내림차순)로 주어지며, BOS/CHoCH/유동성 풀은
+    M15 바가 바뀔 때만 계산하고 같은 M15 바의 후보들이 재사용.
+
+    Args:
+        cand_m15 / cand_sig / cand_entry: 후보별 M15 인덱스, 방향, 진입가
+        weights: (ob_fvg, bos, choch, liquidity) 가중치
+        bos_n / choch_n / liq_n: 감지기별 스윙 강도
+
+    Returns:
+        (score, passed): 후보별 composite score, threshold 통과 여부
+    """
+    n_cand = len(cand_m15)
+    score_out = np.empty(n_cand)
+    passed = np.zeros(n_cand, dtype=np.bool_)
 
+    pool_price = np.empty(m15_lookback)
+    pool_is_bsl = np.empty(m15_lookback, dtype=np.bool_)
+    pool_swept = np.empty(m15_lookback, dtype=np.bool_)
+    sw_price = np.empty(m15_lookback)
+    sw_is_high = np.empty(m15_lookback, dtype=np.bool_)
+
+    cur_m15 = -1
+    bos = choch = 0
+    n_pools = 0
+    for k in range(n_cand):
+        m = cand_m15[k]
+        if m != cur_m15:
+            # M15 바가 바뀔 때만 구조/유동성 풀 재계산
+            cur_m15 = m
+            start = max(0, m - m15_lookback + 1)
+            stop = m + 1
+
+            bos, choch = _window_structure(m15_high, m15_low, m15_close, start, stop, bos_n)
+            if choch_n != bos_n:
+                _, choch = _window_structure(m15_high, m15_low, m15_close, start, stop, choch_n)
+
+            n_pools = 0
+            if stop - start >= 2 * liq_n + 1:
+                count = _window_swings(m15_high, m15_low, start, stop, liq_n, sw_price, sw_is_high)
+                highs = sw_price[:count][sw_is_high[:count]]
+                lows = sw_price[:count][~sw_is_high[:count]]
+                n_pools = _cluster_pools(highs, tolerance, True, m15_high[stop - 1],
+                                         pool_price, pool_is_bsl, pool_swept, n_pools)
+                n_pools = _cluster_pools(lows, tolerance, False, m15_low[stop - 1],
+                                         pool_price, pool_is_bsl, pool_swept, n_pools)
+
+        direction = cand_sig[k]
+        score = 0.0
+        score += weights[0] * 1.0
+
+        if bos != 0 and bos == direction:
+            c_bos = 1.0
+        elif bos != 0:
+            c_bos = -0.5
+        else:
+            c_bos = 0.0
+        score += weights[1] * c_bos
+
+        if choch != 0 and choch == direction:
+            c_choch = 1.0
+        elif choch != 0:
+            c_choch = -0.3
+        else:
+            c_choch = 0.0
+        score += weights[2] * c_choch
+
+        c_liquidity = _liquidity_score(pool_price, pool_is_bsl, pool_swept, n_pools,
+                                       cand_entry[k], direction, pip_size)
+        score += weights[3] * c_liquidity
+
+        score_out[k] = score
+        passed[k] = not (score < threshold)
+    return score_out, passed
 
 class SignalCompositor:
     """
@@ -43,75 +310,94 @@ class SignalCompositor:
         """
         self.symbol = symbol
         self.threshold = threshold if threshold is not None else STRATEGY_DEFAULTS.get("compositor_threshold", 0.6)
-        self.weights = weights if weights is not None else STRATEGY_DEFAULTS.get("compositor_weights", {
-            "ob_fvg": 0.4, "bos": 0.3, "choch": 0.2, "liquidity": 0.1,
-        })
+        self.weights = weights if weights is not None else STRATEGY_DEFAULTS.get("compositor_weights", DEFAULT_WEIGHTS)
 
         # 하위 모듈 초기화
         self.strategy = OrderBlockFVGStrategy(symbol=symbol, **strategy_kwargs)
-        self.bos_detector = BOSDetector()
-        self.choch_detector = CHoCHDetector()
-        self.liquidity_detector = LiquidityDetector(symbol=symbol)
+        # BOS/CHoCH/유동성 감지가 하나의 SwingDetector를 공유 (스윙 캐시 공유, M15 바당 1회 탐색)
+        self.swing_detector = SwingDetector(STRATEGY_DEFAULTS.get("bos_swing_strength", 5))
+        self.bos_detector = BOSDetector(swing_detector=self.swing_detector)
+        self.choch_detector = CHoCHDetector(swing_detector=self.swing_detector)
+        self.liquidity_detector = LiquidityDetector(symbol=symbol, swing_detector=self.swing_detector)
 
         # 하위 호환: strategy의 공개 속성 노출
         self.pip_size = self.strategy.pip_size
+        self.total_cost_pips = self.strategy.total_cost_pips
 
     def get_composite_signal(
         self,
-        m15_bars: pd.DataFrame,
-        m1_bars: pd.DataFrame,
+        m15_bars: Bars,
+        m1_bars: Bars,
+        m15_context: Optional[Dict] = None,
     ) -> Optional[Dict]:
         """
         복합 신호 생성
 
         OB+FVG 기본 신호가 있을 때만 BOS/CHoCH/Liquidity를 추가 평가.
+        남은 컴포넌트가 모두 최대로 기여해도 threshold에 못 미치면 나머지 감지를 생략하고 None.
+        BOS/CHoCH/유동성 풀은 M15 윈도우에만 의존하므로 m15_context에 M15 바당 1회만 계산.
 
         Args:
-            m15_bars: M15 OHLC DataFrame
-            m1_bars: M1 OHLC DataFrame
+            m15_bars: M15 OHLC DataFrame 또는 BarWindow
+            m1_bars: M1 OHLC DataFrame 또는 BarWindow
+            m15_context: 같은 M15 바의 계산 결과 캐시 (IncrementalSignalCache, 생략 시 매번 계산)
 
         Returns:
             기존 get_entry_signal 포맷 + composite 부가 정보, 또는 None
         """
         # 1. 기본 OB+FVG 신호 (필수 조건)
-        base_signal = self.strategy.get_entry_signal(m15_bars, m1_bars)
+        base_signal = self.strategy.get_entry_signal(m15_bars, m1_bars, m15_context)
         if base_signal is None:
             return None
 
         direction = base_signal['signal']
-        components: Dict[str, float] = {}
         score = 0.0
 
+        # 컴포넌트 점수는 지역 변수로 누적 → components dict는 threshold 통과 시에만 생성
         # 2. OB+FVG (항상 1.0)
-        components['ob_fvg'] = 1.0
-        score += self.weights.get('ob_fvg', 0.4) * 1.0
+        c_ob_fvg = 1.0
+        score += self.weights.get('ob_fvg', 0.4) * c_ob_fvg
+        if self._cannot_pass(score, ('bos', 'choch', 'liquidity')):
+            return None
 
-        # 3. BOS 방향 일치
-        bos = self.bos_detector.detect(m15_bars)
+        if m15_context is None:
+            m15_context = {}  # 스윙 공유용 (이번 호출 안에서만 유효)
+
+        # 3. BOS 방향 일치 (BOS/CHoCH는 한 번의 구조 진단으로 함께 판정)
+        bos, choch = cache_lookup(m15_context, 'structure', lambda: self._detect_structure(m15_bars, m15_context))
         if bos is not None and bos == direction:
-            components['bos'] = 1.0   # BOS 방향 일치
+            c_bos = 1.0   # BOS 방향 일치
         elif bos is not None and bos != direction:
-            components['bos'] = -0.5  # BOS 반대 방향 (강한 감점)
+            c_bos = -0.5  # BOS 반대 방향 (강한 감점)
         else:
-            components['bos'] = 0.0   # BOS 없음
-        score += self.weights.get('bos', 0.3) * components['bos']
+            c_bos = 0.0   # BOS 없음
+        score += self.weights.get('bos', 0.3) * c_bos
+        if self._cannot_pass(score, ('choch', 'liquidity')):
+            return None
 
         # 4. CHoCH 전환 확인
-        choch = self.choch_detector.detect(m15_bars)
         if choch is not None and choch == direction:
-            components['choch'] = 1.0   # 추세 전환이 진입 방향과 일치
+            c_choch = 1.0   # 추세 전환이 진입 방향과 일치
         elif choch is not None and choch != direction:
-            components['choch'] = -0.3  # 반대 방향 전환 (약한 감점)
+            c_choch = -0.3  # 반대 방향 전환 (약한 감점)
         else:
-            components['choch'] = 0.0
-        score += self.weights.get('choch', 0.2) * components['choch']
+            c_choch = 0.0
+        score += self.weights.get('choch', 0.2) * c_choch
+        if self._cannot_pass(score, ('liquidity',)):
+            return None
 
         # 5. Liquidity 컨텍스트
+        pools = cache_lookup(
+            m15_context, 'liquidity_pools',
+            lambda: self.liquidity_detector.find_liquidity_pools(
+                m15_bars, self._shared_swings(self.liquidity_detector, m15_bars, m15_context)
+            ),
+        )
         liq = self.liquidity_detector.check_liquidity_context(
-            m15_bars, base_signal['entry_price'], direction,
+            m15_bars, base_signal['entry_price'], direction, pools,
         )
-        components['liquidity'] = liq['score_adjustment']
-        score += self.weights.get('liquidity', 0.1) * liq['score_adjustment']
+        c_liquidity = liq['score_adjustment']
+        score += self.weights.get('liquidity', 0.1) * c_liquidity
 
         # 6. 임계값 체크
         if score < self.threshold:
@@ -119,17 +405,109 @@ class SignalCompositor:
 
         # 7. 신호에 composite 정보 추가
         base_signal['composite_score'] = round(score, 4)
-        base_signal['components'] = components
+        base_signal['components'] = {
+            'ob_fvg': c_ob_fvg,
+            'bos': c_bos,
+            'choch': c_choch,
+            'liquidity': c_liquidity,
+        }
         base_signal['bos_direction'] = bos
         base_signal['choch_signal'] = choch
         base_signal['liquidity_context'] = {
-            'score': liq['score_adjustment'],
+            'score': c_liquidity,
             'sweep': liq['sweep_occurred'],
         }
 
         return base_signal
 
+    def get_entry_signals(
+        self,
+        m1_cols: Dict[str, np.ndarray],
+        m15_cols: Dict[str, np.ndarray],
+        m15_idx_per_m1: np.ndarray,
+        m1_lookback: int,
+        m15_lookback: int,
+    ) -> Dict[str, np.ndarray]:
+        """
+        전체 M1 구간 composite 진입 신호 일괄 생성 (백테스트 배치 API)
+
+        OB+FVG 기본 신호는 strategy.get_entry_signals 배열 연산, BOS/CHoCH/유동성 점수와
+        threshold 판정은 numba 커널 1회 호출 (후보 바만, M15 바당 1회 구조 분석).
+        M1 바 i의 결과는 get_composite_signal(M15 윈도우, M1 윈도우)과 동일.
+
+        Returns:
+            strategy.get_entry_signals 포맷 + 'composite_score' (float64, 신호 없음 = NaN)
+        """
+        entries = self.strategy.get_entry_signals(
+            m1_cols, m15_cols, m15_idx_per_m1, m1_lookback, m15_lookback,
+        )
+        cand = np.flatnonzero(entries['signal'])
+        weights = np.array([
+            self.weights.get('ob_fvg', 0.4), self.weights.get('bos', 0.3),
+            self.weights.get('choch', 0.2), self.weights.get('liquidity', 0.1),
+        ], dtype=np.float64)
+
+        score, passed = _composite_kernel(
+            np.asarray(m15_cols['high'], dtype=np.float64),
+            np.asarray(m15_cols['low'], dtype=np.float64),
+            np.asarray(m15_cols['close'], dtype=np.float64),
+            int(m15_lookback),
+            np.asarray(m15_idx_per_m1, dtype=np.int64)[cand],
+            entries['signal'][cand].astype(np.int64),
+            entries['entry_price'][cand].astype(np.float64),
+            weights, float(self.threshold),
+            int(self.bos_detector.swing_strength), int(self.choch_detector.swing_strength),
+            int(self.liquidity_detector.swing_strength),
+            float(self.liquidity_detector.tolerance), float(self.liquidity_detector.pip_size),
+        )
+
+        # threshold 미달 후보 제거
+        keep = np.zeros(len(entries['signal']), dtype=bool)
+        keep[cand[passed]] = True
+        result = {
+            key: (np.where(keep, arr, 0) if key == 'signal' else np.where(keep, arr, np.nan))
+            for key, arr in entries.items()
+        }
+        composite_score = np.full(len(keep), np.nan)
+        composite_score[cand[passed]] = np.round(score[passed], 4)
+        result['composite_score'] = composite_score
+        return result
+
+    def _cannot_pass(self, score: float, remaining: Tuple[str, ...]) -> bool:
+        """남은 컴포넌트가 모두 최대로 기여해도 threshold 미달이면 True (나머지 감지 생략)"""
+        best = score
+        for key in remaining:
+            weight = self.weights.get(key, DEFAULT_WEIGHTS[key])
+            low, high = COMPONENT_RANGES[key]
+            best += max(weight * low, weight * high)
+        return best < self.threshold - PRUNE_EPSILON
+
+    def _shared_swings(self, detector, m15_bars: Bars, m15_context: Dict) -> Optional[List[Dict]]:
+        """공유 SwingDetector를 쓰는 감지기면 M15 바당 1회 계산한 스윙, 아니면 None (감지기가 직접 계산)"""
+        if detector.swing_detector is not self.swing_detector:
+            return None
+        return cache_lookup(m15_context, 'swings', lambda: self.swing_detector.find_swings(m15_bars))
+
+    def _detect_structure(self, m15_bars: Bars, m15_context: Dict) -> Tuple[Optional[int], Optional[int]]:
+        """(BOS, CHoCH) 감지 (둘 다 공유 스윙이면 analyze_structure 1회, 아니면 감지기별 detect)"""
+        if (
+            self.bos_detector.swing_detector is not self.swing_detector
+            or self.choch_detector.swing_detector is not self.swing_detector
+        ):
+            return self.bos_detector.detect(m15_bars), self.choch_detector.detect(m15_bars)
+        if len(m15_bars) < 2 * self.swing_detector.swing_strength + 1:
+            return None, None
+        swings = self._shared_swings(self.bos_detector, m15_bars, m15_context)
+        return analyze_structure(swings, float(np.asarray(m15_bars['close'])[-1]))
+
     # 하위 호환 메서드
+    def get_m15_setup(self, m15_bars: Bars) -> Optional[int]:
+        """M15 단계 진입 조건 (OB+FVG 기본 신호의 필수 조건과 동일)"""
+        return self.strategy.get_m15_setup(m15_bars)
+
+    def trading_hour_mask(self, times):
+        return self.strategy.trading_hour_mask(times)
+
     def calculate_pnl(self, *args, **kwargs):
         return self.strategy.calculate_pnl(*args, **kwargs)
 
@@ -7,11 +7,15 @@ ICT Market Structure 감지 모듈
 - CHoCHDetector: Change of Character (추세 전환 감지)
 """
 
-import pandas as pd
 import numpy as np
-from typing import Optional, Dict, List
+from numpy.lib.stride_tricks import sliding_window_view
+from typing import Any, Optional, Dict, List, Tuple
 
 from config import STRATEGY_DEFAULTS
+from bar_window import BarWindow, Bars, window_key
+
+# find_swings 결과 캐시 최대 항목 수 (같은 윈도우 재호출 대비, 오래된 것부터 제거)
+SWING_CACHE_SIZE = 8
 
 
 class SwingDetector:
@@ -28,63 +32,257 @@ class SwingDetector:
             swing_strength: 스윙 포인트 판별 시 양쪽에 필요한 최소 봉 수
         """
         self.swing_strength = swing_strength
+        self._swing_cache: Dict[Tuple[Any, ...], List[Dict]] = {}
+        # 직전 BarWindow 계산 결과 (원본 컬럼, start, stop, 스윙) → 다음 윈도우 증분 갱신용
+        self._prior: Optional[Tuple[Dict[str, np.ndarray], int, int, List[Dict]]] = None
 
-    def find_swings(self, bars: pd.DataFrame) -> List[Dict]:
+    def find_swings(self, bars: Bars) -> List[Dict]:
         """
-        스윙 고점/저점 리스트 반환
+        스윙 고점/저점 리스트 반환 (같은 윈도우 재호출 시 캐시된 결과 반환)
+
+        같은 원본·같은 시작 위치에서 뒤로 확장된 BarWindow (append-only)는 이전 결과를 재사용하고
+        새로 판정 가능해진 끝부분만 계산 (find_swings_incremental). 시작 위치가 이동하는
+        고정 길이 윈도우는 index 보정용 dict 복사 비용이 전체 재계산보다 커서 제외.
 
         Returns:
             [{'index': int, 'time': Timestamp, 'price': float,
               'swing_type': 'high'|'low', 'label': 'HH'|'LH'|'HL'|'LL'|None}]
         """
+        key = window_key(bars)
+        cached = self._swing_cache.get(key)
+        if cached is not None:
+            return cached
+
+        span = bars.span() if isinstance(bars, BarWindow) else None
+        prior = self._prior
+        if (
+            span is not None and prior is not None and span[0] is prior[0]
+            and span[1] == prior[1] and span[2] >= prior[2]
+        ):
+            swings = self.find_swings_incremental(bars, prior[3], prior[2] - prior[1])
+        else:
+            swings = self._find_swings(bars)
+        if span is not None:
+            self._prior = (span[0], span[1], span[2], swings)
+
+        if len(self._swing_cache) >= SWING_CACHE_SIZE:
+            del self._swing_cache[next(iter(self._swing_cache))]
+        self._swing_cache[key] = swings
+        return swings
+
+    def find_swings_incremental(
+        self,
+        bars: Bars,
+        prior_result: List[Dict],
+        prior_len: int,
+        offset: int = 0,
+    ) -> List[Dict]:
+        """
+        이전 윈도우 결과를 이어받아 스윙 갱신 (결과는 find_swings(bars)와 동일)
+
+        이전 윈도우에서 양쪽 N개 봉이 모두 있던 중심 봉 (index < prior_len - N)은 판정이 확정
+        → 그대로 재사용하고, 그 이후 중심 봉만 다시 판정. 라벨은 같은 타입 직전 스윙에만
+        의존하므로 앞에서 잘린 스윙이 있으면 타입별 첫 스윙 라벨만 None으로 바뀜.
+
+        Args:
+            bars: 새 윈도우 (이전 윈도우의 앞 offset개를 버리고 뒤에 바를 덧붙인 구간)
+            prior_result: 이전 윈도우의 find_swings 결과 (수정하지 않음)
+            prior_len: 이전 윈도우 길이
+            offset: 이전 윈도우 대비 시작 위치 이동량 (append-only 확장이면 0)
+        """
         n = self.swing_strength
         if len(bars) < 2 * n + 1:
             return []
+        if offset < 0 or offset >= prior_len or len(bars) + offset < prior_len:
+            raise ValueError(
+                f"겹치지 않는 윈도우: prior_len={prior_len}, offset={offset}, len={len(bars)}"
+            )
 
-        highs = bars['high'].values
-        lows = bars['low'].values
-        times = bars['time'].values
-
+        settled = prior_len - n  # 이전 윈도우에서 판정이 확정된 중심 봉 상한 (제외)
         swings: List[Dict] = []
         last_swing_high_price = None
         last_swing_low_price = None
 
-        for i in range(n, len(bars) - n):
-            # 스윙 고점: 양쪽 N개 봉보다 high가 높음
-            window_highs = highs[i - n:i + n + 1]
-            if highs[i] == window_highs.max() and np.sum(window_highs == highs[i]) == 1:
+        for s in prior_result:
+            i = s['index']
+            if i >= settled:
+                break
+            if i - offset < n:
+                continue  # 새 윈도우에서는 왼쪽 N개 봉이 부족 → 스윙 아님
+            if offset:
+                is_first = (last_swing_high_price if s['swing_type'] == 'high' else last_swing_low_price) is None
+                s = dict(s, index=i - offset, label=None if is_first else s['label'])
+            swings.append(s)
+            if s['swing_type'] == 'high':
+                last_swing_high_price = s['price']
+            else:
+                last_swing_low_price = s['price']
+
+        return self._scan(
+            bars, max(n, settled - offset), swings, last_swing_high_price, last_swing_low_price
+        )
+
+    def _find_swings(self, bars: Bars) -> List[Dict]:
+        """스윙 탐지 (캐시 미스 + 증분 불가 시 전체 구간)"""
+        n = self.swing_strength
+        if len(bars) < 2 * n + 1:
+            return []
+        return self._scan(bars, n, [], None, None)
+
+    def _scan(
+        self,
+        bars: Bars,
+        first_center: int,
+        swings: List[Dict],
+        last_swing_high_price: Optional[float],
+        last_swing_low_price: Optional[float],
+    ) -> List[Dict]:
+        """중심 봉 first_center ~ len - N - 1 구간을 판정해 swings 뒤에 추가 (라벨은 직전 가격 이어받음)"""
+        n = self.swing_strength
+        highs = np.asarray(bars['high'])
+        lows = np.asarray(bars['low'])
+        times = np.asarray(bars['time'])
+        stop = len(highs) - n
+        if first_center >= stop:
+            return swings
+
+        # 중심 봉 i (first_center <= i < len - n)의 양쪽 N개 포함 윈도우 → 구간 한 번에 판정
+        width = 2 * n + 1
+        window_highs = sliding_window_view(highs[first_center - n:], width)
+        window_lows = sliding_window_view(lows[first_center - n:], width)
+        center_highs = highs[first_center:stop]
+        center_lows = lows[first_center:stop]
+
+        # 스윙 고점: 양쪽 N개 봉보다 high가 높음 (윈도우 최대값이면서 유일)
+        is_high = (center_highs == window_highs.max(axis=1)) & \
+            ((window_highs == center_highs[:, None]).sum(axis=1) == 1)
+        # 스윙 저점: 양쪽 N개 봉보다 low가 낮음
+        is_low = (center_lows == window_lows.min(axis=1)) & \
+            ((window_lows == center_lows[:, None]).sum(axis=1) == 1)
+
+        # 스윙 봉만 순회하며 dict 생성 + HH/LH/HL/LL 라벨 (같은 봉이면 고점 먼저)
+        for k in np.flatnonzero(is_high | is_low):
+            i = int(k) + first_center
+            if is_high[k]:
+                price = float(highs[i])
                 label = None
                 if last_swing_high_price is not None:
-                    label = 'HH' if highs[i] > last_swing_high_price else 'LH'
+                    label = 'HH' if price > last_swing_high_price else 'LH'
                 swings.append({
                     'index': i,
                     'time': times[i],
-                    'price': float(highs[i]),
+                    'price': price,
                     'swing_type': 'high',
                     'label': label,
                 })
-                last_swing_high_price = float(highs[i])
+                last_swing_high_price = price
 
-            # 스윙 저점: 양쪽 N개 봉보다 low가 낮음
-            window_lows = lows[i - n:i + n + 1]
-            if lows[i] == window_lows.min() and np.sum(window_lows == lows[i]) == 1:
+            if is_low[k]:
+                price = float(lows[i])
                 label = None
                 if last_swing_low_price is not None:
-                    label = 'HL' if lows[i] > last_swing_low_price else 'LL'
+                    label = 'HL' if price > last_swing_low_price else 'LL'
                 swings.append({
                     'index': i,
                     'time': times[i],
-                    'price': float(lows[i]),
+                    'price': price,
                     'swing_type': 'low',
                     'label': label,
                 })
-                last_swing_low_price = float(lows[i])
+                last_swing_low_price = price
 
-        # 시간순 정렬
-        swings.sort(key=lambda s: s['index'])
+        # flatnonzero 오름차순 + 기존 swings는 first_center 이전 → 별도 정렬 없이 시간순
         return swings
 
 
+def resolve_swing_detector(
+    swing_detector: Optional[SwingDetector],
+    swing_strength: Optional[int],
+) -> Tuple[SwingDetector, int]:
+    """주입된 SwingDetector 검증 또는 새로 생성 → (detector, swing_strength)"""
+    if swing_detector is None:
+        strength = swing_strength or STRATEGY_DEFAULTS.get("bos_swing_strength", 5)
+        return SwingDetector(strength), strength
+    if swing_strength and swing_strength != swing_detector.swing_strength:
+        raise ValueError(
+            f"swing_strength({swing_strength})가 주입한 SwingDetector"
+            f"({swing_detector.swing_strength})와 다릅니다"
+        )
+    return swing_detector, swing_detector.swing_strength
+
+
+def _last_swing_points(swings: List[Dict]) -> Tuple[Optional[Dict], Optional[Dict], Optional[str], Optional[str]]:
+    """
+    스윙 리스트 역순 1회 스캔 (타입별 필터 리스트 생성 없음)
+
+    Returns:
+        (최근 스윙 고점, 최근 스윙 저점, 라벨 있는 최근 고점의 라벨, 라벨 있는 최근 저점의 라벨)
+    """
+    last_high = last_low = None
+    high_label = low_label = None
+
+    for s in reversed(swings):
+        if s['swing_type'] == 'high':
+            if last_high is None:
+                last_high = s
+            if high_label is None:
+                high_label = s['label']
+        elif s['swing_type'] == 'low':
+            if last_low is None:
+                last_low = s
+            if low_label is None:
+                low_label = s['label']
+        if high_label is not None and low_label is not None:
+            break  # 라벨이 있으면 같은 타입의 최근 스윙도 이미 찾음
+
+    return last_high, last_low, high_label, low_label
+
+
+def _trend_from_labels(high_label: Optional[str], low_label: Optional[str]) -> Optional[int]:
+    """최근 고점/저점 라벨로 추세 판별: 1 (HH+HL 상승), -1 (LH+LL 하락), None"""
+    # 상승: HH + HL
+    if high_label == 'HH' and low_label == 'HL':
+        return 1
+    # 하락: LH + LL
+    if high_label == 'LH' and low_label == 'LL':
+        return -1
+    return None
+
+
+def analyze_structure(swings: List[Dict], current_close: float) -> Tuple[Optional[int], Optional[int]]:
+    """
+    스윙 리스트 1회 진단으로 BOS/CHoCH 동시 판정 (역순 스캔·추세 판별을 한 번만)
+
+    Args:
+        swings: SwingDetector.find_swings(m15_bars) 결과
+        current_close: M15 최신 봉 종가
+
+    Returns:
+        (bos, choch): 각각 1 / -1 / None (BOSDetector/CHoCHDetector.detect_from_swings와 동일)
+    """
+    if len(swings) < 3:
+        return None, None
+
+    last_high, last_low, high_label, low_label = _last_swing_points(swings)
+    trend = _trend_from_labels(high_label, low_label)
+    bos = choch = None
+
+    if trend == 1:
+        # 상승추세: 스윙 고점 돌파 → 매수 BOS, 스윙 저점 돌파 → 매도 전환
+        if last_high is not None and current_close > last_high['price']:
+            bos = 1
+        if last_low is not None and current_close < last_low['price']:
+            choch = -1
+    elif trend == -1:
+        # 하락추세: 스윙 저점 돌파 → 매도 BOS, 스윙 고점 돌파 → 매수 전환
+        if last_low is not None and current_close < last_low['price']:
+            bos = -1
+        if last_high is not None and current_close > last_high['price']:
+            choch = 1
+
+    return bos, choch
+
+
 class BOSDetector:
     """
     Break of Structure (BOS) 감지
@@ -98,10 +296,16 @@ class BOSDetector:
         self,
         swing_lookback: int = None,
         swing_strength: int = None,
+        swing_detector: Optional[SwingDetector] = None,
     ):
+        """
+        Args:
+            swing_lookback: 스윙 탐색 범위 (M15 바)
+            swing_strength: 스윙 포인트 강도 (swing_detector 주입 시 생략 가능)
+            swing_detector: 다른 감지기와 공유할 SwingDetector (스윙 캐시 공유, 생략 시 새로 생성)
+        """
         self.swing_lookback = swing_lookback or STRATEGY_DEFAULTS.get("bos_swing_lookback", 20)
-        self.swing_strength = swing_strength or STRATEGY_DEFAULTS.get("bos_swing_strength", 5)
-        self.swing_detector = SwingDetector(self.swing_strength)
+        self.swing_detector, self.swing_strength = resolve_swing_detector(swing_detector, swing_strength)
 
     def _get_trend(self, swings: List[Dict]) -> Optional[int]:
         """
@@ -109,31 +313,15 @@ class BOSDetector:
 
         Returns: 1 (상승), -1 (하락), None (판별 불가)
         """
-        # 최근 스윙 고점과 저점 라벨 추출
-        recent_highs = [s for s in swings if s['swing_type'] == 'high' and s['label'] is not None]
-        recent_lows = [s for s in swings if s['swing_type'] == 'low' and s['label'] is not None]
-
-        if not recent_highs or not recent_lows:
-            return None
-
-        last_high_label = recent_highs[-1]['label']
-        last_low_label = recent_lows[-1]['label']
-
-        # 상승: HH + HL
-        if last_high_label == 'HH' and last_low_label == 'HL':
-            return 1
-        # 하락: LH + LL
-        if last_high_label == 'LH' and last_low_label == 'LL':
-            return -1
-
-        return None
+        _, _, high_label, low_label = _last_swing_points(swings)
+        return _trend_from_labels(high_label, low_label)
 
-    def detect(self, m15_bars: pd.DataFrame) -> Optional[int]:
+    def detect(self, m15_bars: Bars) -> Optional[int]:
         """
         BOS 감지
 
         Args:
-            m15_bars: M15 OHLC DataFrame (최소 m15_lookback 개)
+            m15_bars: M15 OHLC DataFrame 또는 BarWindow (최소 m15_lookback 개)
 
         Returns: 1 (매수 BOS), -1 (매도 BOS), None
         """
@@ -141,32 +329,19 @@ class BOSDetector:
             return None
 
         swings = self.swing_detector.find_swings(m15_bars)
-        if len(swings) < 3:
-            return None
-
-        trend = self._get_trend(swings)
-        if trend is None:
-            return None
-
-        current_close = float(m15_bars.iloc[-1]['close'])
+        return self.detect_from_swings(swings, float(np.asarray(m15_bars['close'])[-1]))
 
-        # 최근 스윙 고점/저점
-        swing_highs = [s for s in swings if s['swing_type'] == 'high']
-        swing_lows = [s for s in swings if s['swing_type'] == 'low']
-
-        if trend == 1 and swing_highs:
-            # 상승추세: 최근 스윙 고점 돌파 → 매수 BOS
-            last_high = swing_highs[-1]['price']
-            if current_close > last_high:
-                return 1
+    def detect_from_swings(self, swings: List[Dict], current_close: float) -> Optional[int]:
+        """
+        이미 계산한 스윙 리스트로 BOS 감지 (CHoCH/유동성 감지와 스윙 공유용)
 
-        elif trend == -1 and swing_lows:
-            # 하락추세: 최근 스윙 저점 돌파 → 매도 BOS
-            last_low = swing_lows[-1]['price']
-            if current_close < last_low:
-                return -1
+        Args:
+            swings: self.swing_detector.find_swings(m15_bars) 결과
+            current_close: M15 최신 봉 종가
 
-        return None
+        Returns: 1 (매수 BOS), -1 (매도 BOS), None
+        """
+        return analyze_structure(swings, current_close)[0]
 
 
 class CHoCHDetector:
@@ -182,17 +357,23 @@ class CHoCHDetector:
         self,
         swing_lookback: int = None,
         swing_strength: int = None,
+        swing_detector: Optional[SwingDetector] = None,
     ):
+        """
+        Args:
+            swing_lookback: 스윙 탐색 범위 (M15 바)
+            swing_strength: 스윙 포인트 강도 (swing_detector 주입 시 생략 가능)
+            swing_detector: 다른 감지기와 공유할 SwingDetector (스윙 캐시 공유, 생략 시 새로 생성)
+        """
         self.swing_lookback = swing_lookback or STRATEGY_DEFAULTS.get("bos_swing_lookback", 20)
-        self.swing_strength = swing_strength or STRATEGY_DEFAULTS.get("bos_swing_strength", 5)
-        self.swing_detector = SwingDetector(self.swing_strength)
+        self.swing_detector, self.swing_strength = resolve_swing_detector(swing_detector, swing_strength)
 
-    def detect(self, m15_bars: pd.DataFrame) -> Optional[int]:
+    def detect(self, m15_bars: Bars) -> Optional[int]:
         """
         CHoCH 감지
 
         Args:
-            m15_bars: M15 OHLC DataFrame
+            m15_bars: M15 OHLC DataFrame 또는 BarWindow
 
         Returns: 1 (매수 전환), -1 (매도 전환), None
         """
@@ -200,36 +381,16 @@ class CHoCHDetector:
             return None
 
         swings = self.swing_detector.find_swings(m15_bars)
-        if len(swings) < 3:
-            return None
-
-        # BOS의 _get_trend과 동일한 로직으로 추세 판별
-        recent_highs = [s for s in swings if s['swing_type'] == 'high' and s['label'] is not None]
-        recent_lows = [s for s in swings if s['swing_type'] == 'low' and s['label'] is not None]
-
-        if not recent_highs or not recent_lows:
-            return None
+        return self.detect_from_swings(swings, float(np.asarray(m15_bars['close'])[-1]))
 
-        last_high_label = recent_highs[-1]['label']
-        last_low_label = recent_lows[-1]['label']
-
-        current_close = float(m15_bars.iloc[-1]['close'])
-
-        swing_highs = [s for s in swings if s['swing_type'] == 'high']
-        swing_lows = [s for s in swings if s['swing_type'] == 'low']
-
-        # 상승추세(HH+HL)에서 스윙 저점 돌파 → 매도 전환
-        if last_high_label == 'HH' and last_low_label == 'HL':
-            if swing_lows:
-                last_low = swing_lows[-1]['price']
-                if current_close < last_low:
-                    return -1
+    def detect_from_swings(self, swings: List[Dict], current_close: float) -> Optional[int]:
+        """
+        이미 계산한 스윙 리스트로 CHoCH 감지 (BOS/유동성 감지와 스윙 공유용)
 
-        # 하락추세(LH+LL)에서 스윙 고점 돌파 → 매수 전환
-        elif last_high_label == 'LH' and last_low_label == 'LL':
-            if swing_highs:
-                last_high = swing_highs[-1]['price']
-                if current_close > last_high:
-                    return 1
+        Args:
+            swings: self.swing_detector.find_swings(m15_bars) 결과
+            current_close: M15 최신 봉 종가
 
-        return None
+        Returns: 1 (매수 전환), -1 (매도 전환), None
+        """
+        return analyze_structure(swings, current_close)[1]
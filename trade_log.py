@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+"""
+거래 기록 SoA (Structure of Arrays) 저장소
+
+거래마다 dict를 만들어 리스트에 쌓는 대신 필드별 numpy 배열에 기록.
+성과 분석은 배열을 그대로 사용하고, DataFrame/레코드는 필요할 때만 생성 (1회 생성 후 캐시).
+"""
+
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+
+# 필드명 → dtype (direction/profit_loss 문자열은 기록하지 않고 to_frame에서 파생)
+TRADE_FIELDS = {
+    'entry_time': 'datetime64[ns]',
+    'exit_time': 'datetime64[ns]',
+    'signal': np.int8,         # 1 (BUY) / -1 (SELL)
+    'entry_price': np.float64,
+    'exit_price': np.float64,
+    'stop_loss': np.float64,
+    'take_profit': np.float64,
+    'risk_pips': np.float64,
+    'gross_pips': np.float64,
+    'net_pips': np.float64,
+    'bars_held': np.int64,
+    'reason_code': np.int8,    # EXIT_REASONS 인덱스
+}
+
+
+class TradeLog:
+    """필드별 numpy 배열 거래 기록 (용량 부족 시 2배 확장)"""
+
+    def __init__(self, reasons: tuple, capacity: int = 256):
+        """
+        Args:
+            reasons: 청산 사유 코드 → 문자열 매핑 (예: ('SL', 'TP', 'TIMEOUT'))
+            capacity: 초기 배열 크기
+        """
+        self.reasons = reasons
+        self.count = 0
+        self._columns = {name: np.empty(capacity, dtype=dtype) for name, dtype in TRADE_FIELDS.items()}
+        self._frame: Optional[pd.DataFrame] = None  # to_frame 결과 캐시 (기록 추가 시 무효화)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        """기록된 구간의 필드 배열 (복사 없는 뷰)"""
+        return self._columns[name][:self.count]
+
+    def _reserve(self, size: int):
+        capacity = len(self._columns['signal'])
+        if size <= capacity:
+            return
+        capacity = max(size, capacity * 2)
+        for name, arr in self._columns.items():
+            grown = np.empty(capacity, dtype=arr.dtype)
+            grown[:self.count] = arr[:self.count]
+            self._columns[name] = grown
+
+    def append(self, **values):
+        """거래 1건 기록 (TRADE_FIELDS 전체 키워드 필요)"""
+        k = self.count
+        self._reserve(k + 1)
+        for name in TRADE_FIELDS:
+            self._columns[name][k] = values[name]
+        self.count = k + 1
+        self._frame = None
+
+    def extend(self, **arrays):
+        """거래 여러 건을 배열 단위로 기록 (배치 백테스트 경로)"""
+        n = len(arrays['signal'])
+        start = self.count
+        self._reserve(start + n)
+        for name in TRADE_FIELDS:
+            self._columns[name][start:start + n] = arrays[name]
+        self.count = start + n
+        self._frame = None
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        거래 DataFrame (기존 거래 dict 리스트와 같은 컬럼 구성)
+
+        CSV 저장/자산 곡선/레코드 변환이 같은 프레임을 공유하므로 반환값은 수정하지 말 것
+        """
+        if self._frame is None:
+            self._frame = self._build_frame()
+        return self._frame
+
+    def _build_frame(self) -> pd.DataFrame:
+        signal = self['signal']
+        net_pips = self['net_pips']
+        return pd.DataFrame({
+            'entry_time': self['entry_time'],
+            'exit_time': self['exit_time'],
+            'direction': np.where(signal == 1, 'BUY', 'SELL'),
+            'entry_price': self['entry_price'],
+            'exit_price': self['exit_price'],
+            'stop_loss': self['stop_loss'],
+            'take_profit': self['take_profit'],
+            'risk_pips': self['risk_pips'],
+            'gross_pips': self['gross_pips'],
+            'net_pips': net_pips,
+            'bars_held': self['bars_held'],
+            'exit_reason': np.asarray(self.reasons, dtype=object)[self['reason_code']],
+            'profit_loss': np.where(net_pips > 0, 'WIN', 'LOSS'),
+        })
+
+    def to_records(self) -> List[Dict]:
+        """거래 dict 리스트 (하위 호환용)"""
+        return self.to_frame().to_dict('records')